@@ -94,7 +94,19 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",  # All views require authentication
     ],
     "DEFAULT_RENDERER_CLASSES": (
-        "rest_framework.renderers.JSONRenderer",  # Default to JSON responses
+        "renderers.ORJSONRenderer",  # Default to JSON responses
+        "renderers.MessagePackRenderer",  # With `Accept: application/msgpack`
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "parsers.ORJSONParser",
+        "parsers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+    "TEST_REQUEST_RENDERER_CLASSES": (
+        "rest_framework.renderers.MultiPartRenderer",
+        "renderers.ORJSONRenderer",
+        "renderers.MessagePackRenderer",
     ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,  # Default page size for paginated responses
@@ -155,6 +167,29 @@ DEFAULT_FROM_EMAIL = env(
 CELERY_BROKER_URL = "redis://localhost:6379/0"
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
+CELERY_BEAT_SCHEDULE = {
+    "deactivate-expired-job-postings": {
+        "task": "job_listings.tasks.deactivate_expired_postings",
+        "schedule": timedelta(minutes=5),
+    },
+    "build-job-posting-documents": {
+        "task": "job_listings.tasks.build_job_documents",
+        "schedule": timedelta(minutes=10),
+    },
+    "refresh-job-recommendations": {
+        "task": "job_listings.tasks.refresh_recommendations",
+        "schedule": timedelta(hours=1),
+    },
+    "build-similar-job-postings": {
+        "task": "job_listings.tasks.build_similar_postings",
+        "schedule": timedelta(minutes=15),
+    },
+    "rebuild-all-similar-job-postings": {
+        "task": "job_listings.tasks.build_similar_postings",
+        "schedule": timedelta(days=1),
+        "kwargs": {"full": True},
+    },
+}
 
 # # Heroku Redis SSL setup
 # redis_url = env.str("REDIS_URL", "")
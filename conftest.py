@@ -1,5 +1,7 @@
 import pytest
 from django.utils import timezone
+from django.core.cache import cache
+from job_listings.taxonomy import registry
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
 from job_listings.tests.factories import (
@@ -10,6 +12,23 @@ from job_listings.tests.factories import (
 )
 
 
+def clear_all_caches():
+    cache.clear()
+    for taxonomy_cache in registry.values():
+        taxonomy_cache.evict()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    Start and end every test with an empty shared cache and empty per-process
+    taxonomy caches, whose entries outlive rolled back test data.
+    """
+    clear_all_caches()
+    yield
+    clear_all_caches()
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
@@ -1,5 +1,7 @@
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from job_listings.recommendations import invalidate_recommendations
 from .models import JobApplication
 from .tasks import send_application_status_notification
 
@@ -19,3 +21,14 @@ def job_application_status_update(sender, instance, created, **kwargs):
         send_application_status_notification.delay(
             job_seeker_email, job_title, new_status
         )
+
+
+@receiver(post_save, sender=JobApplication)
+def job_application_created(sender, instance, created, **kwargs):
+    """
+    Signal receiver to drop the job seeker's cached recommendations when they
+    apply, so they are recomputed from their updated skill profile.
+    """
+    if created:
+        job_seeker_id = instance.job_seeker_id
+        transaction.on_commit(lambda: invalidate_recommendations([job_seeker_id]))
@@ -11,7 +11,14 @@ class IndustryAdmin(admin.ModelAdmin):
 
 @admin.register(Location)
 class LocationAdmin(admin.ModelAdmin):
-    list_display = ("city", "postal_code", "state_or_province", "country")
+    list_display = (
+        "city",
+        "postal_code",
+        "state_or_province",
+        "country",
+        "latitude",
+        "longitude",
+    )
     search_fields = ("city", "country")
     ordering = ("city", "country")
 
@@ -94,3 +94,4 @@ class JobListingsConfig(AppConfig):
         post_migrate.connect(create_default_industries, sender=self)
         post_migrate.connect(create_default_locations, sender=self)
         post_migrate.connect(create_default_skills, sender=self)
+        import job_listings.signals
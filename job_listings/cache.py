@@ -0,0 +1,244 @@
+"""
+Cache key helpers for job listings.
+
+List caches are namespaced and versioned by *generations*: small integer
+counters stored in the cache under `jobboard:jobs:gen:<scope>`. Every list
+key embeds the current generation of the scopes it depends on, so a single
+atomic `INCR` on a generation makes every dependent key unreachable at once.
+Unreachable entries are never deleted explicitly; they simply age out.
+
+**Scopes:**
+- `("global",)`: Any job posting write.
+- `("employer", <user_id>)`: Writes to postings owned by that employer.
+- `("industry", <name>)`: Writes to postings in that industry.
+- `("taxonomy",)`: Changes to `Industry`, `Location` or `Skill` rows, which
+  are nested into every job posting representation.
+- `("detail",)`: Flushes every cached job posting detail at once.
+- `("detail", <job_id>)`: Changes to that job posting (see
+  `job_listings.signals`). A detail loaded before the change and cached after
+  it lands on a dead key instead of being served until it times out. These
+  generations expire with the details, so postings do not keep one forever.
+"""
+
+import time
+import uuid
+import hashlib
+from django.core.cache import cache
+
+KEY_PREFIX = "jobboard:jobs"
+
+GLOBAL_SCOPE = ("global",)
+TAXONOMY_SCOPE = ("taxonomy",)
+DETAIL_SCOPE = ("detail",)
+
+# Timeout (in seconds) for cached job posting lists
+LIST_CACHE_TIMEOUT = 300
+
+# Timeout (in seconds) for cached job posting details. Details are invalidated
+# explicitly on every change, so they can live much longer than lists.
+DETAIL_CACHE_TIMEOUT = 60 * 60 * 6
+
+# Filters that match on industry, location or skill names, or location
+# coordinates. Changing a taxonomy row can change which postings these
+# filters select.
+TAXONOMY_FILTER_PARAMS = {
+    "industry",
+    "location_city",
+    "location_state",
+    "location_country",
+    "near",
+    "skills",
+}
+
+# Query parameters whose value does not change the rendered page when empty
+# or equal to the default, and which are dropped from canonical keys.
+DEFAULT_QUERY_PARAMS = {"page": "1"}
+
+# Query parameters that only select the page or order of the results, not
+# which job postings match
+PAGE_QUERY_PARAMS = {"page", "page_size", "pagination", "cursor", "ordering"}
+
+
+def _normalize(part):
+    """Normalize a key part so equivalent values share a generation."""
+    return str(part).strip().lower()
+
+
+def _initial_generation():
+    """
+    Seed a new generation from the clock.
+
+    If a generation is evicted, re-seeding from 1 could make keys written
+    under an old generation reachable again. A millisecond timestamp is
+    always ahead of any previously issued value.
+    """
+    return int(time.time() * 1000)
+
+
+def generation_key(*scope):
+    """Return the cache key holding the generation for `scope`."""
+    return ":".join([KEY_PREFIX, "gen", *(_normalize(part) for part in scope)])
+
+
+def get_generations(scopes, timeout=None):
+    """
+    Return the current generation for each scope, in one cache round trip.
+
+    Missing generations are initialized with `cache.add` so concurrent
+    workers agree on a single value, kept for `timeout` seconds (forever by
+    default). Expired generations are re-seeded ahead of any issued value.
+    """
+    keys = [generation_key(*scope) for scope in scopes]
+    generations = cache.get_many(keys)
+
+    for key in keys:
+        if key not in generations:
+            cache.add(key, _initial_generation(), timeout=timeout)
+            generations[key] = cache.get(key)
+
+    return [generations[key] for key in keys]
+
+
+def bump_generations(scopes, timeout=None):
+    """
+    Atomically increment the generation of each scope, invalidating every
+    cache key that depends on it. `timeout` applies to generations that were
+    not initialized, as for `get_generations`.
+    """
+    for key in {generation_key(*scope) for scope in scopes}:
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Not initialized (or evicted): nothing can depend on it yet
+            cache.add(key, _initial_generation(), timeout=timeout)
+
+
+def versioned_key(name, scopes, *parts):
+    """
+    Build a namespaced cache key that embeds the generations of `scopes`.
+
+    Arguments:
+    - **name**: The kind of cached value (e.g. `"page"`).
+    - **scopes**: The generation scopes the cached value depends on.
+    - **parts**: Anything else that distinguishes the cached value.
+    """
+    generations = ".".join(str(gen) for gen in get_generations(scopes))
+    digest = hashlib.md5(repr(parts).encode()).hexdigest()
+    return f"{KEY_PREFIX}:{name}:{generations}:{digest}"
+
+
+def audience(user):
+    """
+    Return the audience class of `user` for response caching.
+
+    Anonymous users and jobseekers see exactly the same job postings, so they
+    share cache entries. Employers only see their own postings and admins see
+    everything, so they get separate entries.
+    """
+    if not user.is_authenticated or user.role == "jobseeker":
+        return "public"
+    if user.role == "employer":
+        return f"employer:{user.pk}"
+    return "admin"
+
+
+def canonical_query_params(query_params):
+    """
+    Return a canonical, hashable form of the request query parameters.
+
+    Parameter order, blank values, surrounding whitespace, default values
+    (e.g. `page=1`) and the case of the full-text `search` term do not change
+    the response, so they do not produce distinct cache entries.
+    """
+    canonical = []
+    for name in sorted(query_params):
+        values = []
+        for value in query_params.getlist(name):
+            value = " ".join(value.split())
+            if name == "search":
+                value = value.lower()
+            if value and DEFAULT_QUERY_PARAMS.get(name) != value:
+                values.append(value)
+        if values:
+            canonical.append((name, tuple(sorted(values))))
+    return tuple(canonical)
+
+
+def list_scopes(user, query_params):
+    """
+    Return the generation scopes a job posting list depends on.
+
+    The narrowest scope guaranteed by the request is used, so that writes
+    elsewhere leave the cached list intact:
+    - Employers only see their own postings.
+    - A list filtered by `industry` only contains postings in that industry.
+    """
+    if user.is_authenticated and user.role == "employer":
+        scope = ("employer", user.pk)
+    elif query_params.get("industry"):
+        scope = ("industry", query_params["industry"])
+    else:
+        scope = GLOBAL_SCOPE
+
+    return [scope, TAXONOMY_SCOPE]
+
+
+def posting_scopes(job_posting):
+    """Return the generation scopes affected by a write to `job_posting`."""
+    scopes = [GLOBAL_SCOPE, ("employer", job_posting.employer_id)]
+    if job_posting.industry_id:
+        scopes.append(("industry", job_posting.industry.name))
+    return scopes
+
+
+def id_window_scopes(user, query_params):
+    """
+    Return the generation scopes a cached window of job posting IDs depends on.
+
+    Unlike rendered pages, the IDs only change with taxonomy renames when the
+    request filters on taxonomy names.
+    """
+    scopes = list_scopes(user, query_params)
+    if TAXONOMY_FILTER_PARAMS.isdisjoint(query_params):
+        scopes.remove(TAXONOMY_SCOPE)
+    return scopes
+
+
+def pack_ids(ids):
+    """Pack UUIDs into a compact byte string of 16 bytes per ID."""
+    return b"".join(value.bytes for value in ids)
+
+
+def unpack_ids(packed):
+    """Unpack a byte string built by `pack_ids` into UUIDs, preserving order."""
+    return [uuid.UUID(bytes=packed[i : i + 16]) for i in range(0, len(packed), 16)]
+
+
+def detail_scope(job_id):
+    """Return the generation scope of a job posting's cached detail."""
+    return ("detail", job_id)
+
+
+def detail_cache_keys(job_ids):
+    """Return the detail cache keys of the given job postings, in order."""
+    job_ids = [_normalize(job_id) for job_id in job_ids]
+    (generation,) = get_generations([DETAIL_SCOPE])
+    job_generations = get_generations(
+        [detail_scope(job_id) for job_id in job_ids], timeout=DETAIL_CACHE_TIMEOUT
+    )
+    return [
+        f"{KEY_PREFIX}:detail:{generation}.{job_generation}:{job_id}"
+        for job_id, job_generation in zip(job_ids, job_generations)
+    ]
+
+
+def invalidate_job_details(job_ids):
+    """Invalidate the cached details of the given job postings."""
+    bump_generations(
+        [detail_scope(job_id) for job_id in job_ids], timeout=DETAIL_CACHE_TIMEOUT
+    )
+
+
+def invalidate_all_job_details():
+    """Invalidate every cached job posting detail with a single generation bump."""
+    bump_generations([DETAIL_SCOPE])
@@ -0,0 +1,58 @@
+"""
+Conditional GET (`ETag` / `Last-Modified`) for job posting lists and details.
+
+Validators are cached with the responses, so a request with a matching
+`If-None-Match` or `If-Modified-Since` header is answered with a
+`304 Not Modified` before any posting is loaded or serialized.
+
+- **Lists**: the ETag covers the response cache key of the page (which embeds
+  the generations of the list's scopes, the audience, the query parameters
+  and the renderer) and the IDs of the page's postings. `Last-Modified` is
+  the newest `updated_at` of the page's postings. Both come with the page
+  itself, so no aggregate over the matching postings is run.
+- **Details**: the ETag covers a digest of the serialized posting (cached
+  with it), the selected fields and the renderer, so it changes with any
+  change to the representation, taxonomy renames included. `Last-Modified`
+  is the posting's `updated_at`.
+
+`Last-Modified` only has a one second resolution and does not change when
+postings expire or taxonomy names change, so the ETag is the authoritative
+validator; as specified by HTTP, `If-None-Match` is used when both are sent.
+"""
+
+import hashlib
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    """Return a strong ETag for the response described by `parts`."""
+    return quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+
+def content_digest(data):
+    """Return a digest of serialized data, for use in an ETag."""
+    return hashlib.md5(repr(data).encode()).hexdigest()
+
+
+def set_validators(response, etag, last_modified):
+    """Set the `ETag` and `Last-Modified` headers of `response`."""
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
+
+
+def not_modified(request, etag, last_modified):
+    """
+    Return a `304 Not Modified` (or `412 Precondition Failed`) response if the
+    request's conditional headers match the validators, otherwise None.
+    """
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=last_modified and int(last_modified.timestamp()),
+    )
+    if response is None:
+        return None
+    return set_validators(response, etag, last_modified)
@@ -0,0 +1,171 @@
+"""
+Pre-rendered JSON documents of job postings (`JobPostingDocument`), used to
+assemble job posting list pages without loading or serializing the postings.
+
+**Writes**: database triggers delete the documents of postings whose
+representation changed. The `build_job_documents` task then rebuilds them:
+for the postings reported by the change listener, and periodically for every
+posting without a document.
+
+**Reads**: a page of the list is assembled by splicing the documents of its
+postings into the rendered pagination envelope. Postings without a document
+yet are serialized as usual.
+
+While a document is built, its posting and taxonomy rows are locked against
+writes, so a concurrent change cannot commit before the document does: its
+trigger then deletes the document it made stale.
+"""
+
+import orjson
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.response import Response
+from renderers import ORJSONRenderer
+from .models import Industry, JobPosting, JobPostingDocument, Location, Skill
+from .serializers import JobPostingDocumentSerializer
+
+# Number of documents built per transaction
+DOCUMENT_CHUNK_SIZE = 500
+
+# Tables whose change notifications carry job posting IDs
+JOB_POSTING_TABLES = {
+    JobPosting._meta.db_table,
+    JobPosting.skills_required.through._meta.db_table,
+}
+
+renderer = ORJSONRenderer()
+
+
+def share_lock(model, pks):
+    """Lock rows of `model` against updates until the transaction ends."""
+    if pks:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT 1 FROM {model._meta.db_table} "
+                f"WHERE {model._meta.pk.column} = ANY(%s) FOR SHARE",
+                [list(pks)],
+            )
+
+
+def build_documents(job_ids):
+    """
+    Build (or replace) the documents of the given job postings, in one
+    transaction. Postings locked by a concurrent write are skipped: the write
+    will delete their documents anyway.
+
+    Returns the number of documents built.
+    """
+    with transaction.atomic():
+        locked = list(
+            JobPosting.objects.filter(pk__in=job_ids)
+            .select_for_update(skip_locked=True)
+            .values_list("pk", "location_id", "industry_id", "skill_ids")
+        )
+        if not locked:
+            return 0
+
+        share_lock(Location, {location_id for _, location_id, _, _ in locked} - {None})
+        share_lock(Industry, {industry_id for _, _, industry_id, _ in locked} - {None})
+        share_lock(Skill, {pk for *_, skill_ids in locked for pk in skill_ids})
+
+        job_postings = (
+            JobPosting.objects.filter(pk__in=[pk for pk, *_ in locked])
+            .select_related("location", "industry")
+            .prefetch_related("skills_required")
+        )
+        built_at = timezone.now()
+        documents = [
+            JobPostingDocument(
+                job_posting=job_posting,
+                content=renderer.render(JobPostingDocumentSerializer(job_posting).data),
+                built_at=built_at,
+            )
+            for job_posting in job_postings
+        ]
+        JobPostingDocument.objects.bulk_create(
+            documents,
+            update_conflicts=True,
+            unique_fields=["job_posting"],
+            update_fields=["content", "built_at"],
+        )
+    return len(documents)
+
+
+def build_missing_documents(chunk_size=DOCUMENT_CHUNK_SIZE):
+    """
+    Build the documents of every job posting without one, `chunk_size`
+    postings per transaction, walking the postings by primary key.
+
+    Returns the number of documents built.
+    """
+    missing = JobPosting.objects.filter(document__isnull=True).order_by("pk")
+    built = 0
+    last_pk = None
+    while True:
+        chunk = missing if last_pk is None else missing.filter(pk__gt=last_pk)
+        job_ids = list(chunk.values_list("pk", flat=True)[:chunk_size])
+        if not job_ids:
+            return built
+        built += build_documents(job_ids)
+        last_pk = job_ids[-1]
+
+
+def documents_to_build(payloads):
+    """
+    Return the IDs of the job postings whose documents must be rebuilt after
+    the changes reported by the `job_listings_notify_change` trigger, or None
+    if every posting without a document must be looked for (taxonomy changes,
+    or too many changed rows to list them).
+    """
+    job_ids = set()
+    for payload in payloads:
+        if payload["table"] not in JOB_POSTING_TABLES or payload["ids"] is None:
+            return None
+        job_ids.update(payload["ids"])
+    return sorted(job_ids)
+
+
+def load_documents(job_ids):
+    """Return the documents of the given job postings, by ID, when built."""
+    return {
+        job_id: bytes(content)
+        for job_id, content in JobPostingDocument.objects.filter(
+            pk__in=job_ids
+        ).values_list("pk", "content")
+    }
+
+
+def stitch(envelope, fragments):
+    """
+    Render the pagination `envelope` (with empty `results`) as JSON, with the
+    pre-rendered JSON `fragments` spliced in as its results.
+    """
+    head, _, tail = renderer.render(envelope).rpartition(b"[]")
+    return head + b"[" + b",".join(fragments) + b"]" + tail
+
+
+class StitchedResponse(Response):
+    """
+    A response whose JSON body was assembled by `stitch`, and is returned
+    as is when the response is rendered. `data` is decoded from the body
+    on access only.
+    """
+
+    def __init__(self, content, **kwargs):
+        self.content_stitched = content
+        super().__init__(**kwargs)
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = orjson.loads(self.content_stitched)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
+    @property
+    def rendered_content(self):
+        self["Content-Type"] = self.accepted_renderer.media_type
+        return self.content_stitched
@@ -0,0 +1,217 @@
+"""
+Streaming export of job postings as NDJSON or CSV.
+
+Postings are read through a server-side cursor (`QuerySet.iterator`) in
+chunks of `EXPORT_CHUNK_SIZE` rows, and each chunk is written to the
+response as soon as it is read, so a worker holds one chunk in memory
+whatever the size of the export. Only the posting's own columns are read:
+locations, industries and skills are looked up in the taxonomy cache by ID,
+once per chunk, instead of being joined to every row.
+
+**NDJSON** (`application/x-ndjson`): one job posting per line, in the same
+shape as the job posting API.
+
+**CSV** (`text/csv`): a header row, then one job posting per row, with the
+columns accepted by the bulk import (see `job_listings.imports`), so an
+export can be imported again.
+"""
+
+import csv
+import json
+from datetime import datetime
+from itertools import islice
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+from .imports import CSV_FIELDS, CSV_LOCATION_FIELDS, CSV_SKILL_SEPARATOR
+from .serializers import industry_cache, location_cache, skill_cache
+
+# Number of rows fetched from the server-side cursor and written at a time
+EXPORT_CHUNK_SIZE = 2000
+
+# Job posting columns read for the export, by the key they are exported as
+EXPORT_COLUMNS = {
+    "job_id": "job_id",
+    "employer": "employer_id",
+    "company": "company",
+    "title": "title",
+    "slug": "slug",
+    "description": "description",
+    "job_type": "job_type",
+    "location": "location_id",
+    "industry": "industry_id",
+    "skills_required": "skill_ids",
+    "salary_min": "salary_min",
+    "salary_max": "salary_max",
+    "currency": "currency",
+    "expiration_date": "expiration_date",
+    "posted_at": "posted_at",
+    "updated_at": "updated_at",
+    "is_active": "is_active",
+}
+
+CSV_HEADER = (
+    "job_id",
+    "employer",
+    "slug",
+    "posted_at",
+    "updated_at",
+    *CSV_FIELDS,
+    *(f"location_{field}" for field in CSV_LOCATION_FIELDS),
+    "industry",
+    "skills",
+)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renders a list of records as newline-delimited JSON. Selects the NDJSON
+    format of the export through content negotiation (`Accept` or `?format=ndjson`).
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        records = data if isinstance(data, list) else [data]
+        return b"".join(ndjson_line(record) for record in records)
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Renders a list of flat records as CSV with a header row. Selects the CSV
+    format of the export through content negotiation (`Accept` or `?format=csv`).
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        records = data if isinstance(data, list) else [data]
+        header = list(records[0]) if records else []
+        writer = csv.writer(Echo())
+        lines = [writer.writerow(header)]
+        lines.extend(
+            writer.writerow(record.get(key) for key in header) for record in records
+        )
+        return "".join(lines).encode(self.charset)
+
+
+class Echo:
+    """File-like object returning what is written, for `csv.writer` to format lines."""
+
+    def write(self, value):
+        return value
+
+
+def ndjson_line(record):
+    """Return `record` encoded as one line of NDJSON."""
+    return json.dumps(record, cls=DjangoJSONEncoder).encode() + b"\n"
+
+
+def chunked(iterable, size):
+    """Yield lists of up to `size` items from `iterable`."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def export_records(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield the job postings of `queryset` as dicts shaped like the job posting
+    API, reading `chunk_size` rows at a time from a server-side cursor.
+
+    Nested locations, industries and skills are read from the taxonomy cache
+    with one lookup per chunk.
+    """
+    rows = queryset.values_list(*EXPORT_COLUMNS.values()).iterator(
+        chunk_size=chunk_size
+    )
+    for chunk in chunked(rows, chunk_size):
+        records = [dict(zip(EXPORT_COLUMNS, row)) for row in chunk]
+        locations = location_cache.get_many(
+            {record["location"] for record in records if record["location"]}
+        )
+        industries = industry_cache.get_many(
+            {record["industry"] for record in records if record["industry"]}
+        )
+        skills = skill_cache.get_many(
+            {skill_id for record in records for skill_id in record["skills_required"]}
+        )
+
+        for record in records:
+            record["location"] = locations.get(str(record["location"]))
+            record["industry"] = industries.get(str(record["industry"]))
+            record["skills_required"] = sorted(
+                (
+                    skills[str(skill_id)]
+                    for skill_id in record["skills_required"]
+                    if str(skill_id) in skills
+                ),
+                key=lambda skill: skill["name"],
+            )
+            yield record
+
+
+def csv_value(value):
+    """Return a value as written to a CSV cell: missing values are empty."""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def csv_row(record):
+    """Return the `CSV_HEADER` columns of an exported record."""
+    location = record["location"] or {}
+    industry = record["industry"] or {}
+    values = {
+        **record,
+        **{f"location_{field}": location.get(field) for field in CSV_LOCATION_FIELDS},
+        "industry": industry.get("name"),
+        "skills": CSV_SKILL_SEPARATOR.join(
+            skill["name"] for skill in record["skills_required"]
+        ),
+    }
+    return [csv_value(values[field]) for field in CSV_HEADER]
+
+
+def stream_ndjson(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the job postings of `queryset` as NDJSON, one bytestring per chunk."""
+    lines = []
+    for record in export_records(queryset, chunk_size):
+        lines.append(ndjson_line(record))
+        if len(lines) >= chunk_size:
+            yield b"".join(lines)
+            lines.clear()
+    if lines:
+        yield b"".join(lines)
+
+
+def stream_csv(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the job postings of `queryset` as CSV, one string per chunk."""
+    writer = csv.writer(Echo())
+    lines = [writer.writerow(CSV_HEADER)]
+    for record in export_records(queryset, chunk_size):
+        lines.append(writer.writerow(csv_row(record)))
+        if len(lines) >= chunk_size:
+            yield "".join(lines)
+            lines.clear()
+    if lines:
+        yield "".join(lines)
+
+
+STREAMS = {
+    NDJSONRenderer.format: stream_ndjson,
+    CSVRenderer.format: stream_csv,
+}
+
+
+def export_job_postings(queryset, export_format, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Return an iterator over the job postings of `queryset` in `export_format`
+    (`ndjson` or `csv`), for a `StreamingHttpResponse`.
+    """
+    return STREAMS[export_format](queryset, chunk_size)
@@ -0,0 +1,130 @@
+"""
+Facet counts for job posting search results.
+
+All facets are counted in a single `GROUP BY GROUPING SETS` query over the
+filtered job postings, instead of one filtered list request per facet value.
+Facet names match the `JobPostingFilter` parameters that select them, so a
+client can turn any facet value into a filter.
+"""
+
+from django.db import connections
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Coalesce
+
+# Lower bounds of the salary bands. The last band is open-ended.
+SALARY_BANDS = (0, 100_000, 250_000, 500_000, 1_000_000)
+
+# Columns selected from the filtered job postings, in `GROUPING()` order
+FACET_COLUMNS = ("job_type", "industry_name", "country", "city", "currency", "band")
+
+# Grouping set of each facet. Salary bands are only comparable within a currency.
+FACET_GROUPING_SETS = {
+    "job_type": ("job_type",),
+    "industry": ("industry_name",),
+    "location_country": ("country",),
+    "location_city": ("country", "city"),
+    "salary_band": ("currency", "band"),
+}
+
+
+def grouping_mask(columns):
+    """
+    Return the `GROUPING(...)` value of the rows grouped by `columns`: one bit
+    per facet column, set for the columns aggregated away.
+    """
+    mask = 0
+    for column in FACET_COLUMNS:
+        mask = (mask << 1) | (column not in columns)
+    return mask
+
+
+def facet_rows(queryset):
+    """
+    Select one row of facet values per job posting in `queryset`.
+
+    The salary band is the index in `SALARY_BANDS` of the minimum salary (or
+    the maximum, if only that is set), or NULL if neither is set.
+    """
+    bands = [
+        When(facet_salary__lt=bound, then=Value(i))
+        for i, bound in enumerate(SALARY_BANDS[1:])
+    ]
+    return (
+        queryset.order_by()
+        .annotate(facet_salary=Coalesce("salary_min", "salary_max"))
+        .values(
+            "job_type",
+            "currency",
+            industry_name=F("industry__name"),
+            country=F("location__country"),
+            city=F("location__city"),
+            band=Case(
+                *bands,
+                When(facet_salary__isnull=False, then=Value(len(bands))),
+                output_field=IntegerField(),
+            ),
+        )
+    )
+
+
+def salary_band_bounds(band):
+    """Return the `(min, max)` salary of a band, with `max` None for the last."""
+    upper = band + 1
+    return SALARY_BANDS[band], (
+        SALARY_BANDS[upper] if upper < len(SALARY_BANDS) else None
+    )
+
+
+def facet_counts(queryset):
+    """
+    Count the job postings of `queryset` per facet value, in one query.
+
+    Returns a dict of facet name to a list of `{"value": ..., "count": ...}`,
+    most frequent values first. City values also carry their `country`, and
+    salary bands are `{"currency", "min", "max", "count"}`, in band order. Postings without
+    a value for a facet (e.g. no industry) are not counted in it.
+    """
+    rows = facet_rows(queryset)
+    sql, params = rows.query.sql_with_params()
+
+    columns = ", ".join(FACET_COLUMNS)
+    grouping_sets = ", ".join(
+        "({})".format(", ".join(grouping_set))
+        for grouping_set in FACET_GROUPING_SETS.values()
+    )
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(
+            f"SELECT {columns}, GROUPING({columns}), COUNT(*) "
+            f"FROM ({sql}) AS facet_rows GROUP BY GROUPING SETS ({grouping_sets})",
+            params,
+        )
+        results = cursor.fetchall()
+
+    facets = {name: [] for name in FACET_GROUPING_SETS}
+    masks = {grouping_mask(cols): name for name, cols in FACET_GROUPING_SETS.items()}
+    for *values, mask, count in results:
+        row = dict(zip(FACET_COLUMNS, values))
+        name = masks[mask]
+        if any(row[column] is None for column in FACET_GROUPING_SETS[name]):
+            continue
+
+        if name == "location_city":
+            facets[name].append(
+                {"value": row["city"], "country": row["country"], "count": count}
+            )
+        elif name == "salary_band":
+            low, high = salary_band_bounds(row["band"])
+            facets[name].append(
+                {"currency": row["currency"], "min": low, "max": high, "count": count}
+            )
+        else:
+            facets[name].append(
+                {"value": row[FACET_GROUPING_SETS[name][0]], "count": count}
+            )
+
+    for name, values in facets.items():
+        if name == "salary_band":
+            values.sort(key=lambda value: (value["currency"], value["min"]))
+        else:
+            values.sort(key=lambda value: (-value["count"], value["value"]))
+    return facets
@@ -0,0 +1,106 @@
+"""
+Sparse fieldsets for job posting responses.
+
+Clients select the fields of each job posting with query parameters:
+- `fields`: Comma-separated fields to include, e.g. `?fields=title,company`.
+- `omit`: Comma-separated fields to leave out, e.g. `?omit=description`.
+- `profile`: A named set of fields from `PROFILES`, e.g. `?profile=card`.
+
+`fields` takes precedence over `profile`, and `omit` applies to either.
+Lists only read the columns of the selected fields from the database, so
+leaving out `description` also keeps it out of the query.
+"""
+
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+PROFILE_PARAM = "profile"
+
+# Query parameters that only select the fields of the results
+FIELDSET_QUERY_PARAMS = {FIELDS_PARAM, OMIT_PARAM, PROFILE_PARAM}
+
+# Named field sets. "card" has what a job list item shows.
+PROFILES = {
+    "card": (
+        "job_id",
+        "company",
+        "title",
+        "slug",
+        "job_type",
+        "location",
+        "salary_min",
+        "salary_max",
+        "currency",
+        "expiration_date",
+        "posted_at",
+    ),
+}
+
+# Model fields always read, whatever the selected fields: the primary key,
+# and the keyset of cursor pagination
+ALWAYS_READ = ("job_id", "posted_at", "expiration_date")
+
+
+def parse_names(query_params, param):
+    """Return the comma-separated names given in `param`, or None if there are none."""
+    names = [
+        name.strip()
+        for value in query_params.getlist(param)
+        for name in value.split(",")
+        if name.strip()
+    ]
+    return names or None
+
+
+def selected_fields(query_params, available):
+    """
+    Return the fields selected by the request's query parameters, in the
+    order of `available`, or None if every field is selected.
+
+    Raises a `ValidationError` for an unknown field or profile.
+    """
+    selected = parse_names(query_params, FIELDS_PARAM)
+    omitted = parse_names(query_params, OMIT_PARAM) or []
+    profile = query_params.get(PROFILE_PARAM)
+
+    if profile and profile not in PROFILES:
+        raise ValidationError({PROFILE_PARAM: [f"Unknown profile: {profile}."]})
+    for param, names in ((FIELDS_PARAM, selected or []), (OMIT_PARAM, omitted)):
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise ValidationError(
+                {param: [f"Unknown field: {name}." for name in unknown]}
+            )
+
+    if selected is None and profile:
+        selected = PROFILES[profile]
+    if selected is None and not omitted:
+        return None
+    return tuple(
+        name
+        for name in available
+        if (selected is None or name in selected) and name not in omitted
+    )
+
+
+def model_fields(serializer_class, fields):
+    """
+    Return the model fields `serializer_class` reads to serialize `fields`
+    (all of its fields if None), for `QuerySet.only()`.
+
+    Fields mapped in the serializer's `Meta.read_from` are read from other
+    model fields, e.g. nested skills from `skill_ids`.
+    """
+    read_from = getattr(serializer_class.Meta, "read_from", {})
+    names = list(ALWAYS_READ)
+    for name in serializer_class.Meta.fields if fields is None else fields:
+        names.extend(read_from.get(name, (name,)))
+    return tuple(dict.fromkeys(names))
+
+
+def pick(data, fields):
+    """Return the `fields` of serialized `data`, or all of it if None."""
+    if fields is None:
+        return data
+    return {name: data[name] for name in fields}
@@ -1,5 +1,34 @@
+from django import forms
+from django.db.models import F
+from django.db.models.functions import Lower
 from django_filters import rest_framework as filters
-from .models import JobPosting
+from rest_framework.filters import OrderingFilter
+from .geo import DEFAULT_RADIUS_KM, MAX_RADIUS_KM, within_radius
+from .models import JobPosting, Skill, salary_ceiling, salary_floor
+
+
+class CoordinatesField(forms.CharField):
+    """A `latitude,longitude` pair in decimal degrees, cleaned to a tuple of floats."""
+
+    default_error_messages = {
+        "invalid": "Enter coordinates as 'latitude,longitude' in decimal degrees.",
+    }
+
+    def to_python(self, value):
+        value = super().to_python(value)
+        if not value:
+            return None
+        try:
+            latitude, longitude = (float(part) for part in value.split(","))
+        except ValueError:
+            raise forms.ValidationError(self.error_messages["invalid"], code="invalid")
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise forms.ValidationError(self.error_messages["invalid"], code="invalid")
+        return latitude, longitude
+
+
+class CoordinatesFilter(filters.Filter):
+    field_class = CoordinatesField
 
 
 class JobPostingFilter(filters.FilterSet):
@@ -12,20 +41,35 @@ class JobPostingFilter(filters.FilterSet):
         lookup_expr="icontains"
     )  # Case-insensitive search for title
     job_type = filters.CharFilter(
-        field_name="job_type__name", lookup_expr="exact"
+        field_name="job_type", lookup_expr="exact"
     )  # Filter by job type
     location_city = filters.CharFilter(field_name="location__city", lookup_expr="exact")
     location_state = filters.CharFilter(
-        field_name="location__state", lookup_expr="exact"
+        field_name="location__state_or_province", lookup_expr="exact"
     )
     location_country = filters.CharFilter(
         field_name="location__country", lookup_expr="exact"
     )
     industry = filters.CharFilter(field_name="industry__name", lookup_expr="exact")
-    skills_required = filters.CharFilter(
-        lookup_expr="icontains"
-    )  # Filter based on required skills
-    salary_range = filters.CharFilter(lookup_expr="exact")
+
+    # Postings located within `radius_km` (default 50) of `near=lat,lon`
+    near = CoordinatesFilter(method="filter_near")
+    radius_km = filters.NumberFilter(
+        method="filter_radius_km", min_value=0, max_value=MAX_RADIUS_KM
+    )
+
+    # Comma-separated skill names, matched case-insensitively against the
+    # GIN-indexed `skill_ids`. `skills_match=any` relaxes the default `all`.
+    skills = filters.CharFilter(method="filter_skills")
+    skills_match = filters.ChoiceFilter(
+        choices=[("all", "All"), ("any", "Any")], method="filter_skills_match"
+    )
+
+    # Salary ranges overlapping [min_salary, max_salary], in `currency`
+    min_salary = filters.NumberFilter(method="filter_salary")
+    max_salary = filters.NumberFilter(method="filter_salary")
+    currency = filters.CharFilter(method="filter_currency")
+
     expiration_date = filters.DateFilter(lookup_expr="exact")
     posted_at = filters.DateTimeFilter(lookup_expr="exact")
     updated_at = filters.DateTimeFilter(lookup_expr="exact")
@@ -51,9 +95,141 @@ class JobPostingFilter(filters.FilterSet):
             "location_state",
             "location_country",
             "industry",
-            "skills_required",
-            "salary_range",
+            "near",
+            "radius_km",
+            "skills",
+            "skills_match",
+            "min_salary",
+            "max_salary",
+            "currency",
             "expiration_date",
             "posted_at",
             "updated_at",
         ]
+
+    def filter_queryset(self, queryset):
+        """
+        Filters the queryset. Salary amounts are only compared within a single
+        currency, the default job posting currency if none is requested.
+        """
+        data = self.form.cleaned_data
+        salary_filtered = (
+            data.get("min_salary") is not None or data.get("max_salary") is not None
+        )
+        if salary_filtered and not data.get("currency"):
+            default_currency = JobPosting._meta.get_field("currency").default
+            queryset = queryset.filter(currency=default_currency)
+
+        return super().filter_queryset(queryset)
+
+    def filter_skills(self, queryset, name, value):
+        """
+        Filter job postings requiring all (or any, with `skills_match=any`) of
+        the comma-separated skill names, with containment (`@>`) or overlap
+        (`&&`) checks on `skill_ids`.
+
+        Skill names are only unique case-sensitively, so a name may match
+        several skills ("Python", "python"). For `all`, names matching one
+        skill are checked with a single containment, and each other name with
+        an overlap of its skills.
+        """
+        names = {skill.strip().lower() for skill in value.split(",") if skill.strip()}
+        if not names:
+            return queryset
+
+        skills = {}
+        for pk, lower_name in (
+            Skill.objects.annotate(lower_name=Lower("name"))
+            .filter(lower_name__in=names)
+            .values_list("pk", "lower_name")
+        ):
+            skills.setdefault(lower_name, []).append(pk)
+
+        if self.form.cleaned_data.get("skills_match") == "any":
+            return queryset.filter(
+                skill_ids__overlap=[pk for pks in skills.values() for pk in pks]
+            )
+        if set(skills) != names:
+            # A requested skill does not exist, so no posting requires them all
+            return queryset.none()
+
+        required = [pks[0] for pks in skills.values() if len(pks) == 1]
+        if required:
+            queryset = queryset.filter(skill_ids__contains=required)
+        for pks in skills.values():
+            if len(pks) > 1:
+                queryset = queryset.filter(skill_ids__overlap=pks)
+        return queryset
+
+    def filter_skills_match(self, queryset, name, value):
+        """Applied by `filter_skills`."""
+        return queryset
+
+    def filter_near(self, queryset, name, value):
+        """
+        Filter job postings whose location is within `radius_km` of the
+        `near` coordinates: a bounding box prefilter on the indexed location
+        coordinates, then the exact haversine distance. Locations without
+        coordinates never match. The distance is aliased for `ordering=distance`.
+        """
+        radius_km = self.form.cleaned_data.get("radius_km")
+        if radius_km is None:
+            radius_km = DEFAULT_RADIUS_KM
+        latitude, longitude = value
+        return within_radius(
+            queryset, latitude, longitude, float(radius_km), prefix="location__"
+        )
+
+    def filter_radius_km(self, queryset, name, value):
+        """Applied by `filter_near`."""
+        return queryset
+
+    def filter_currency(self, queryset, name, value):
+        """Filter job postings paid in the requested currency code."""
+        return queryset.filter(currency=value.strip().upper())
+
+    def filter_salary(self, queryset, name, value):
+        """
+        Filter job postings whose salary range overlaps the requested one.
+
+        A posting pays between its `salary_floor` and `salary_ceiling`, so it
+        overlaps when its ceiling is at least `min_salary` and its floor at most
+        `max_salary`. With the currency, the predicates match the
+        `jobposting_salary_range_idx` expression index. Postings without a
+        salary never match.
+        """
+        if name == "min_salary":
+            return queryset.alias(ceiling=salary_ceiling()).filter(ceiling__gte=value)
+        return queryset.alias(floor=salary_floor()).filter(floor__lte=value)
+
+
+class JobPostingOrderingFilter(OrderingFilter):
+    """
+    Ordering filter for job postings.
+
+    Postings without a salary are listed last when ordering by salary,
+    in either direction. Ordering by `distance` requires a `near` filter,
+    and is ignored without one.
+    """
+
+    nulls_last_fields = {"salary_min", "salary_max"}
+    annotated_fields = {"distance"}
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+
+        order_by = []
+        for field in ordering:
+            name = field.lstrip("-")
+            if name in self.annotated_fields:
+                if name in queryset.query.annotations:
+                    order_by.append(field)
+            elif name not in self.nulls_last_fields:
+                order_by.append(field)
+            elif field.startswith("-"):
+                order_by.append(F(name).desc(nulls_last=True))
+            else:
+                order_by.append(F(name).asc(nulls_last=True))
+        return queryset.order_by(*order_by) if order_by else queryset
@@ -0,0 +1,188 @@
+"""
+Radius search of job postings around a point, without PostGIS.
+
+Locations carry a latitude and longitude, looked up by city, state or
+province and country in the bundled offline gazetteer (`data/gazetteer.csv`)
+when they are created. Cities are matched ignoring case, accents and common
+country aliases ("USA", "UK").
+
+A radius search first restricts locations to the bounding box of the circle,
+which the `location_coordinates_idx` B-tree index serves, then keeps those
+whose great-circle (haversine) distance is within the radius. The distance is
+available as the `distance` alias, in kilometres, for ordering.
+"""
+
+import csv
+import math
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from django.db.models import F, Q, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / "data" / "gazetteer.csv"
+
+# Mean Earth radius (IUGG)
+EARTH_RADIUS_KM = 6371.0088
+
+DEFAULT_RADIUS_KM = 50
+MAX_RADIUS_KM = 1000
+
+COUNTRY_ALIASES = {
+    "us": "united states",
+    "usa": "united states",
+    "u.s.": "united states",
+    "u.s.a.": "united states",
+    "united states of america": "united states",
+    "america": "united states",
+    "uk": "united kingdom",
+    "u.k.": "united kingdom",
+    "great britain": "united kingdom",
+    "britain": "united kingdom",
+    "england": "united kingdom",
+    "scotland": "united kingdom",
+    "wales": "united kingdom",
+    "northern ireland": "united kingdom",
+    "rsa": "south africa",
+    "za": "south africa",
+    "uae": "united arab emirates",
+    "holland": "netherlands",
+    "the netherlands": "netherlands",
+    "czechia": "czech republic",
+    "turkiye": "turkey",
+    "korea": "south korea",
+    "republic of korea": "south korea",
+}
+
+
+def place_key(name):
+    """Return the key a place name is matched by: lowercase, unaccented."""
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    unaccented = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(unaccented.lower().split())
+
+
+def country_key(country):
+    """Return the key a country is matched by, resolving common aliases."""
+    key = place_key(country)
+    return COUNTRY_ALIASES.get(key, key)
+
+
+@lru_cache(maxsize=None)
+def load_gazetteer(path=GAZETTEER_PATH):
+    """
+    Read the gazetteer into a dict of `(city, state_or_province, country)`
+    keys to `(latitude, longitude)`.
+
+    Cities are also listed under an empty state or province, when no other
+    city of the same name exists in their country.
+    """
+    places = {}
+    by_country = {}
+    with open(path, newline="", encoding="utf-8") as gazetteer:
+        for row in csv.DictReader(gazetteer):
+            city = place_key(row["city"])
+            country = country_key(row["country"])
+            coordinates = (float(row["latitude"]), float(row["longitude"]))
+            places[city, place_key(row["state_or_province"]), country] = coordinates
+            by_country.setdefault((city, country), []).append(coordinates)
+
+    for (city, country), matches in by_country.items():
+        if len(matches) == 1:
+            places.setdefault((city, "", country), matches[0])
+    return places
+
+
+def geocode(city, state_or_province, country):
+    """
+    Return the `(latitude, longitude)` of a city from the gazetteer, or None
+    if it is not listed. An unknown state or province is ignored if the city
+    is the only one of its name in the country.
+    """
+    places = load_gazetteer()
+    city, country = place_key(city), country_key(country)
+    return places.get((city, place_key(state_or_province), country)) or places.get(
+        (city, "", country)
+    )
+
+
+def haversine_km(latitude, longitude, other_latitude, other_longitude):
+    """Return the great-circle distance between two points, in kilometres."""
+    phi, other_phi = math.radians(latitude), math.radians(other_latitude)
+    half_chord = (
+        math.sin((other_phi - phi) / 2) ** 2
+        + math.cos(phi)
+        * math.cos(other_phi)
+        * math.sin(math.radians(other_longitude - longitude) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, half_chord)))
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Return the `(min_latitude, max_latitude, min_longitude, max_longitude)`
+    bounds of every point within `radius_km` of a point.
+
+    Longitude bounds are None when the circle contains a pole. They are not
+    normalized: a circle crossing the antimeridian gets a bound beyond ±180.
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    min_latitude = latitude - math.degrees(angle)
+    max_latitude = latitude + math.degrees(angle)
+    if min_latitude <= -90 or max_latitude >= 90:
+        return max(min_latitude, -90), min(max_latitude, 90), None, None
+
+    # Widest longitude span of the circle, at the latitude of its tangent points
+    delta = math.degrees(math.asin(math.sin(angle) / math.cos(math.radians(latitude))))
+    return min_latitude, max_latitude, longitude - delta, longitude + delta
+
+
+def bounding_box_filter(latitude, longitude, radius_km, prefix=""):
+    """
+    Return a `Q` object selecting the locations (through `prefix`, e.g.
+    "location__") in the bounding box of the circle.
+    """
+    min_latitude, max_latitude, min_longitude, max_longitude = bounding_box(
+        latitude, longitude, radius_km
+    )
+    match = Q(**{f"{prefix}latitude__range": (min_latitude, max_latitude)})
+    if min_longitude is None:
+        return match & Q(**{f"{prefix}longitude__isnull": False})
+    if min_longitude < -180:
+        return match & (
+            Q(**{f"{prefix}longitude__gte": min_longitude + 360})
+            | Q(**{f"{prefix}longitude__lte": max_longitude})
+        )
+    if max_longitude > 180:
+        return match & (
+            Q(**{f"{prefix}longitude__gte": min_longitude})
+            | Q(**{f"{prefix}longitude__lte": max_longitude - 360})
+        )
+    return match & Q(**{f"{prefix}longitude__range": (min_longitude, max_longitude)})
+
+
+def distance_km(latitude, longitude, prefix=""):
+    """
+    Return an expression of the haversine distance, in kilometres, from a
+    point to the location (through `prefix`, e.g. "location__").
+    """
+    phi = Radians(F(f"{prefix}latitude"))
+    delta_phi = phi - Value(math.radians(latitude))
+    delta_lambda = Radians(F(f"{prefix}longitude")) - Value(math.radians(longitude))
+    half_chord = Power(Sin(delta_phi / 2), 2) + Value(
+        math.cos(math.radians(latitude))
+    ) * Cos(phi) * Power(Sin(delta_lambda / 2), 2)
+    return 2 * EARTH_RADIUS_KM * ASin(Sqrt(Least(Value(1.0), half_chord)))
+
+
+def within_radius(queryset, latitude, longitude, radius_km, prefix=""):
+    """
+    Filter `queryset` to the rows whose location (through `prefix`, e.g.
+    "location__") is within `radius_km` of a point, and alias their
+    `distance` in kilometres.
+    """
+    return (
+        queryset.filter(bounding_box_filter(latitude, longitude, radius_km, prefix))
+        .alias(distance=distance_km(latitude, longitude, prefix))
+        .filter(distance__lte=radius_km)
+    )
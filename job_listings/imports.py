@@ -0,0 +1,232 @@
+"""
+Bulk import of job postings from a streamed NDJSON or CSV request body.
+
+Rows are read from the request stream one line at a time, so the body is
+never held in memory, and validated one by one. Valid rows are written in
+chunks of `IMPORT_CHUNK_SIZE`, each in its own transaction: the chunk's
+industries, locations and skills are resolved in a few set-based queries,
+then the postings and their skills are inserted with one statement each.
+Invalid rows are skipped and reported with their row number. A body that
+cannot be read to the end (e.g. malformed CSV) stops the import: the rows
+before the error are still created, and the error is reported in the summary.
+
+**NDJSON** (`application/x-ndjson`): one job posting per line, in the same
+shape as the body of `POST /api/jobs/`.
+
+Content type parameters such as `charset` are ignored: bodies are UTF-8.
+
+**CSV** (`text/csv`): a header row, then one job posting per row. Columns
+are the flat job posting fields, `location_city`, `location_state_or_province`,
+`location_country`, `location_postal_code`, `industry`, and `skills` with
+names separated by `;`. Empty cells are treated as missing.
+"""
+
+import csv
+import json
+import codecs
+from django.db import connection, transaction
+from rest_framework.exceptions import ParseError, UnsupportedMediaType, ValidationError
+from rest_framework.serializers import as_serializer_error
+from .models import Industry, JobPosting, Skill
+from .resolvers import location_key, name_key, resolve_locations, resolve_names
+from .serializers import JobPostingImportSerializer
+from .cache import GLOBAL_SCOPE, bump_generations
+from .tasks import schedule_document_build
+
+# Number of valid rows written per transaction
+IMPORT_CHUNK_SIZE = 1000
+
+# Row errors included in the import summary. Every failure is still counted.
+MAX_REPORTED_ERRORS = 100
+
+NDJSON_CONTENT_TYPES = {"application/x-ndjson", "application/jsonl"}
+CSV_CONTENT_TYPE = "text/csv"
+
+# Job posting fields read from CSV columns of the same name
+CSV_FIELDS = (
+    "company",
+    "title",
+    "description",
+    "job_type",
+    "salary_min",
+    "salary_max",
+    "currency",
+    "expiration_date",
+    "is_active",
+)
+CSV_LOCATION_FIELDS = ("city", "state_or_province", "country", "postal_code")
+CSV_SKILL_SEPARATOR = ";"
+
+
+def ndjson_rows(lines):
+    """
+    Yield `(row_number, row, error)` for each non-blank line of NDJSON.
+    `error` is set instead of `row` when the line is not valid JSON.
+    """
+    for row_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield row_number, json.loads(line), None
+        except ValueError as exc:
+            yield row_number, None, {"non_field_errors": [f"Invalid JSON: {exc}"]}
+
+
+def csv_record_to_row(record):
+    """Convert a CSV record to the nested shape of a job posting request body."""
+    row = {field: record[field] for field in CSV_FIELDS if record.get(field)}
+    row["location"] = {
+        field: record[f"location_{field}"]
+        for field in CSV_LOCATION_FIELDS
+        if record.get(f"location_{field}")
+    }
+    row["industry"] = {"name": record.get("industry") or ""}
+    row["skills_required"] = [
+        {"name": name.strip()}
+        for name in (record.get("skills") or "").split(CSV_SKILL_SEPARATOR)
+        if name.strip()
+    ]
+    return row
+
+
+def csv_rows(lines):
+    """Yield `(row_number, row, None)` for each record of a CSV body with a header."""
+    reader = csv.DictReader(codecs.iterdecode(lines, "utf-8"))
+    row_number = 0
+    try:
+        for row_number, record in enumerate(reader, start=1):
+            yield row_number, csv_record_to_row(record), None
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise ParseError(f"CSV parse error after row {row_number}: {exc}")
+
+
+def import_rows(request):
+    """
+    Return an iterator of `(row_number, row, error)` over the request body,
+    parsed according to its content type.
+    """
+    lines = request.stream or []
+    media_type = request.content_type.split(";")[0].strip().lower()
+    if media_type in NDJSON_CONTENT_TYPES:
+        return ndjson_rows(lines)
+    if media_type == CSV_CONTENT_TYPE:
+        return csv_rows(lines)
+    raise UnsupportedMediaType(request.content_type)
+
+
+def insert_skill_rows(skill_rows):
+    """
+    Insert `(job_id, skill_id)` pairs into the job posting skills table in one
+    statement, without building a through model instance per pair.
+    """
+    through = JobPosting.skills_required.through
+    job_ids, skill_ids = zip(*skill_rows)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {through._meta.db_table} "
+            f"({through._meta.get_field('jobposting').column}, "
+            f"{through._meta.get_field('skill').column}) "
+            "SELECT * FROM unnest(%s::uuid[], %s::uuid[])",
+            [list(job_ids), list(skill_ids)],
+        )
+
+
+def create_chunk(chunk, employer):
+    """
+    Create the job postings of a chunk of validated rows, in one transaction.
+
+    Change notifications are skipped: the postings are new, so no cached
+    detail refers to them, and `import_job_postings` invalidates the lists.
+
+    Returns the names of the chunk's industries.
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL job_listings.skip_notify = 'on'")
+
+        locations = resolve_locations(data["location"] for data in chunk)
+        industries = resolve_names(
+            Industry, (data["industry"]["name"] for data in chunk)
+        )
+        skills = resolve_names(
+            Skill,
+            (skill["name"] for data in chunk for skill in data["skills_required"]),
+        )
+
+        job_postings = []
+        skill_rows = []
+        for data in chunk:
+            data = dict(data)
+            location = locations[location_key(data.pop("location"))]
+            industry = industries[name_key(data.pop("industry")["name"])]
+            skill_ids = {
+                skills[name_key(skill["name"])].pk
+                for skill in data.pop("skills_required")
+            }
+
+            job_posting = JobPosting(
+                employer=employer, location=location, industry=industry, **data
+            )
+            job_postings.append(job_posting)
+            skill_rows.extend((job_posting.pk, skill_id) for skill_id in skill_ids)
+
+        JobPosting.objects.bulk_create(job_postings)
+        if skill_rows:
+            insert_skill_rows(skill_rows)
+
+    return {industry.name for industry in industries.values()}
+
+
+def import_job_postings(rows, employer, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Validate and create job postings for `employer` from `rows`.
+
+    Arguments:
+    - **rows**: `(row_number, row, error)` tuples, as yielded by `import_rows`.
+    - **employer**: The user the job postings are created for.
+    - **chunk_size**: Number of valid rows written per transaction.
+
+    Returns a summary with the number of `created` and `failed` rows, and the
+    `errors` of the first `MAX_REPORTED_ERRORS` failed rows. If `rows` raises
+    a `ParseError`, the rows read before it are still created (earlier chunks
+    are already committed), and the summary also has the parse `error`.
+    """
+    serializer = JobPostingImportSerializer()
+    summary = {"created": 0, "failed": 0, "errors": []}
+    scopes = {GLOBAL_SCOPE, ("employer", employer.pk)}
+    chunk = []
+
+    def flush():
+        for industry_name in create_chunk(chunk, employer):
+            scopes.add(("industry", industry_name))
+        summary["created"] += len(chunk)
+        chunk.clear()
+
+    try:
+        try:
+            for row_number, row, error in rows:
+                if error is None:
+                    try:
+                        data = serializer.run_validation(row)
+                        data.setdefault("skills_required", [])
+                        chunk.append(data)
+                    except ValidationError as exc:
+                        error = as_serializer_error(exc)
+
+                if error is not None:
+                    summary["failed"] += 1
+                    if len(summary["errors"]) < MAX_REPORTED_ERRORS:
+                        summary["errors"].append({"row": row_number, "errors": error})
+                elif len(chunk) >= chunk_size:
+                    flush()
+        except ParseError as exc:
+            summary["error"] = str(exc.detail)
+
+        if chunk:
+            flush()
+    finally:
+        if summary["created"]:
+            bump_generations(scopes)
+            schedule_document_build()
+
+    return summary
@@ -0,0 +1,80 @@
+"""
+Merging of duplicate `Location` rows: locations with the same city, state or
+province and country, ignoring case.
+
+Duplicates can no longer be created once the normalized unique constraint
+is in place, but rows written before it must be merged for the constraint
+to be added. Only SQL is used, so migrations can run it against the
+historical schema.
+"""
+
+# Pair every duplicate location with the canonical location of its key: the
+# one used by the most job postings, then the lowest ID.
+DUPLICATE_LOCATIONS_SQL = """
+SELECT location_id, canonical_id FROM (
+    SELECT
+        location.location_id,
+        first_value(location.location_id) OVER (
+            PARTITION BY
+                lower(location.city),
+                lower(coalesce(location.state_or_province, '')),
+                lower(location.country)
+            ORDER BY count(job.job_id) DESC, location.location_id
+        ) AS canonical_id
+    FROM job_listings_location AS location
+    LEFT JOIN job_listings_jobposting AS job
+    ON job.location_id = location.location_id
+    GROUP BY location.location_id
+) AS ranked
+WHERE location_id <> canonical_id
+"""
+
+# Repoint the job postings of every duplicate in one statement
+REPOINT_JOB_POSTINGS_SQL = """
+UPDATE job_listings_jobposting AS job
+SET location_id = merged.canonical_id
+FROM unnest(%s::uuid[], %s::uuid[]) AS merged(location_id, canonical_id)
+WHERE job.location_id = merged.location_id
+RETURNING job.job_id
+"""
+
+# Keep a postal code known only to a duplicate
+FILL_POSTAL_CODES_SQL = """
+UPDATE job_listings_location AS location
+SET postal_code = duplicate.postal_code
+FROM unnest(%s::uuid[], %s::uuid[]) AS merged(location_id, canonical_id)
+JOIN job_listings_location AS duplicate
+ON duplicate.location_id = merged.location_id
+WHERE location.location_id = merged.canonical_id
+AND location.postal_code IS NULL AND duplicate.postal_code IS NOT NULL
+"""
+
+DELETE_LOCATIONS_SQL = (
+    "DELETE FROM job_listings_location WHERE location_id = ANY(%s::uuid[])"
+)
+
+
+def find_duplicate_locations(cursor):
+    """Return `(duplicate_id, canonical_id)` pairs for every duplicate location."""
+    cursor.execute(DUPLICATE_LOCATIONS_SQL)
+    return cursor.fetchall()
+
+
+def merge_duplicate_locations(cursor):
+    """
+    Merge every duplicate location into its canonical location and delete it.
+
+    Job postings are repointed in bulk. Run inside a transaction.
+
+    Returns the IDs of the deleted locations and of the repointed job postings.
+    """
+    pairs = find_duplicate_locations(cursor)
+    if not pairs:
+        return [], []
+
+    duplicate_ids, canonical_ids = (list(ids) for ids in zip(*pairs))
+    cursor.execute(REPOINT_JOB_POSTINGS_SQL, [duplicate_ids, canonical_ids])
+    job_ids = [job_id for (job_id,) in cursor.fetchall()]
+    cursor.execute(FILL_POSTAL_CODES_SQL, [duplicate_ids, canonical_ids])
+    cursor.execute(DELETE_LOCATIONS_SQL, [duplicate_ids])
+    return duplicate_ids, job_ids
@@ -0,0 +1,116 @@
+import re
+import time
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from job_listings.models import Industry, JobPosting, JobType
+
+User = get_user_model()
+
+INDEX_PATTERN = re.compile(
+    r"(?:Index Scan using|Index Only Scan using|Bitmap Index Scan on) (\w+)"
+)
+
+# Generate postings in a single statement. One in `expired_every` postings is
+# live. Half of the others expired but are still active, as if the expiry sweep
+# fell behind, and the rest were deactivated. One in ten is in the industry.
+INSERT_SQL = """
+INSERT INTO job_listings_jobposting (
+    job_id, employer_id, title, slug, description, job_type, industry_id,
+    currency, is_active, expiration_date, posted_at, updated_at, skill_ids
+)
+SELECT
+    gen_random_uuid(), %(employer_id)s, 'Benchmark ' || n, 'benchmark-' || n,
+    'Benchmark posting', (%(job_types)s::text[])[1 + n / %(expired_every)s %% %(job_type_count)s],
+    CASE WHEN n %% 10 = 0 THEN %(industry_id)s::uuid END, 'ZAR',
+    n %% %(expired_every)s = 0 OR n %% 2 = 0,
+    CASE WHEN n %% %(expired_every)s = 0 THEN now() + interval '30 days'
+         ELSE now() - interval '1 day' END,
+    now() - n * interval '1 minute', now(), '{}'
+FROM generate_series(1, %(rows)s) AS n
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the public job listing queries against a large, mostly "
+        "expired set of generated postings, and report the indexes used. "
+        "Nothing is written: the generated postings are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=200_000,
+            help="Number of job postings to generate",
+        )
+        parser.add_argument(
+            "--expired-every",
+            type=int,
+            default=20,
+            help="Generate one live posting for every N postings",
+        )
+
+    def get_queries(self, industry):
+        """Returns the benchmarked public queries, by label."""
+        live = JobPosting.objects.live()
+        return {
+            "Newest live postings": live.order_by("-posted_at")[:20],
+            "Newest live postings (keyset)": live.order_by("-posted_at", "job_id")[:20],
+            "Live postings by industry": live.filter(industry=industry).order_by(
+                "-posted_at"
+            )[:20],
+            "Live postings by job type": live.filter(
+                job_type=JobType.CONTRACT
+            ).order_by("-posted_at")[:20],
+            "Live postings count": live.order_by().values("pk"),
+        }
+
+    def explain(self, queryset, count=False):
+        """Returns the `EXPLAIN ANALYZE` plan of a query, or of its count."""
+        sql, params = queryset.query.sql_with_params()
+        if count:
+            sql = f"SELECT COUNT(*) FROM ({sql}) AS live"
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {sql}", params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            employer = User.objects.create(
+                email="benchmark-employer@example.com",
+                role="employer",
+            )
+            industry = Industry.objects.create(name="Benchmark industry")
+
+            started = time.monotonic()
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    INSERT_SQL,
+                    {
+                        "employer_id": employer.pk,
+                        "industry_id": industry.pk,
+                        "job_types": list(JobType.values),
+                        "job_type_count": len(JobType.values),
+                        "expired_every": options["expired_every"],
+                        "rows": options["rows"],
+                    },
+                )
+                cursor.execute("ANALYZE job_listings_jobposting")
+            self.stdout.write(
+                f"Generated {options['rows']} postings in "
+                f"{time.monotonic() - started:.1f}s, "
+                f"{JobPosting.objects.live().count()} live.\n"
+            )
+
+            for label, queryset in self.get_queries(industry).items():
+                plan = self.explain(queryset, count=label.endswith("count"))
+                indexes = sorted(set(INDEX_PATTERN.findall("\n".join(plan))))
+                self.stdout.write(self.style.SUCCESS(label))
+                self.stdout.write(f"  Indexes: {', '.join(indexes) or 'none'}")
+                self.stdout.write(f"  {plan[-1].strip()}")
+                if options["verbosity"] > 1:
+                    self.stdout.write("\n".join(f"    {line}" for line in plan))
+
+            transaction.set_rollback(True)
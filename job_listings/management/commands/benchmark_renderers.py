@@ -0,0 +1,100 @@
+import time
+import uuid
+from io import BytesIO
+from datetime import timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from job_listings.models import Industry, JobPosting, Location, Skill
+from job_listings.serializers import JobPostingSerializer
+from parsers import MessagePackParser, ORJSONParser
+from renderers import MessagePackRenderer, ORJSONRenderer
+
+DESCRIPTION = (
+    "We are looking for an experienced engineer to design, build and run "
+    "the services behind our job board. You will work with Python, Django "
+    "and PostgreSQL, review code, mentor colleagues and take part in the "
+    "on-call rotation. Salary is negotiable — remote work is possible. "
+) * 4
+
+RENDERERS = {
+    "JSONRenderer (stdlib)": (JSONRenderer(), JSONParser()),
+    "ORJSONRenderer": (ORJSONRenderer(), ORJSONParser()),
+    "MessagePackRenderer": (MessagePackRenderer(), MessagePackParser()),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the API renderers and parsers on pages of serialized job "
+        "postings. Postings are built in memory from existing taxonomy rows, "
+        "nothing is written."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=50,
+            help="Number of job postings per page",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=500,
+            help="Number of times each page is rendered and parsed",
+        )
+
+    def get_page(self, rows):
+        """Returns the serialized data of a page of `rows` job postings."""
+        location = Location.objects.first()
+        industry = Industry.objects.first()
+        skill_ids = list(Skill.objects.values_list("pk", flat=True)[:5])
+        if location is None or industry is None or not skill_ids:
+            raise CommandError("Run migrate first: no location, industry or skill.")
+
+        now = timezone.now()
+        job_postings = [
+            JobPosting(
+                employer_id=uuid.uuid4(),
+                company="Benchmark Corp",
+                title=f"Ingénieur logiciel {n}",
+                slug=f"ingenieur-logiciel-{n}",
+                description=DESCRIPTION,
+                location=location,
+                industry=industry,
+                skill_ids=skill_ids,
+                salary_min=Decimal("80000.00"),
+                salary_max=Decimal("120000.00"),
+                expiration_date=now + timedelta(days=30),
+                posted_at=now - timedelta(minutes=n),
+                updated_at=now,
+            )
+            for n in range(rows)
+        ]
+        page = JobPostingSerializer(job_postings, many=True).data
+        return {"count": rows, "next": None, "previous": None, "results": page}
+
+    def handle(self, *args, **options):
+        page = self.get_page(options["rows"])
+        repeat = options["repeat"]
+
+        for label, (renderer, parser) in RENDERERS.items():
+            started = time.perf_counter()
+            for _ in range(repeat):
+                content = renderer.render(page)
+            rendered = time.perf_counter() - started
+
+            started = time.perf_counter()
+            for _ in range(repeat):
+                parser.parse(BytesIO(content))
+            parsed = time.perf_counter() - started
+
+            self.stdout.write(self.style.SUCCESS(label))
+            self.stdout.write(
+                f"  Render: {rendered / repeat * 1000:.3f} ms/page, "
+                f"parse: {parsed / repeat * 1000:.3f} ms/page, "
+                f"{len(content)} bytes"
+            )
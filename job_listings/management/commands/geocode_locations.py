@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from job_listings.geo import geocode
+from job_listings.models import Location
+from job_listings.taxonomy import invalidate_taxonomy
+from job_listings.cache import GLOBAL_SCOPE, TAXONOMY_SCOPE, bump_generations
+
+
+class Command(BaseCommand):
+    help = (
+        "Look up the coordinates of locations in the bundled gazetteer, e.g. "
+        "after cities were added to it"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Look up every location, not only those without coordinates",
+        )
+
+    def handle(self, *args, **options):
+        locations = Location.objects.order_by("pk")
+        if not options["all"]:
+            locations = locations.filter(latitude__isnull=True)
+
+        changed = []
+        for location in locations.iterator():
+            coordinates = geocode(
+                location.city, location.state_or_province, location.country
+            ) or (None, None)
+            if coordinates != (location.latitude, location.longitude):
+                location.latitude, location.longitude = coordinates
+                changed.append(location)
+
+        with transaction.atomic():
+            Location.objects.bulk_update(
+                changed, ["latitude", "longitude"], batch_size=1000
+            )
+
+        if changed:
+            invalidate_taxonomy(Location, [location.pk for location in changed])
+            bump_generations([GLOBAL_SCOPE, TAXONOMY_SCOPE])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Updated the coordinates of {len(changed)} location(s)."
+            )
+        )
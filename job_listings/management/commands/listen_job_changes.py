@@ -0,0 +1,53 @@
+import json
+import select
+from django.core.management.base import BaseCommand
+from django.db import connection
+from job_listings.documents import documents_to_build
+from job_listings.signals import handle_change_notifications
+from job_listings.tasks import build_job_documents
+
+CHANNEL = "job_listings_changes"
+
+
+class Command(BaseCommand):
+    help = (
+        "Listen for job posting and taxonomy changes published by the "
+        "database triggers, invalidate the affected cached job details and "
+        "schedule the rebuild of their pre-rendered documents"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=5.0,
+            help="Seconds to wait for notifications before polling again",
+        )
+
+    def handle(self, *args, **options):
+        connection.ensure_connection()
+        connection.set_autocommit(True)
+        pg_connection = connection.connection
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+        self.stdout.write(self.style.SUCCESS(f"Listening on '{CHANNEL}'..."))
+
+        while True:
+            # Wait for the socket to become readable, then drain every pending
+            # notification so a burst of writes is handled in one batch
+            readable, _, _ = select.select([pg_connection], [], [], options["timeout"])
+            if not readable:
+                continue
+
+            pg_connection.poll()
+            payloads = [
+                json.loads(notification.payload)
+                for notification in pg_connection.notifies
+            ]
+            pg_connection.notifies.clear()
+
+            if payloads:
+                handle_change_notifications(payloads)
+                build_job_documents.delay(documents_to_build(payloads))
+                self.stdout.write(f"Invalidated caches for {len(payloads)} change(s).")
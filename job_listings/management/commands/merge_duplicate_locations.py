@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from job_listings.models import Location
+from job_listings.locations import find_duplicate_locations, merge_duplicate_locations
+from job_listings.taxonomy import invalidate_taxonomy
+from job_listings.cache import (
+    GLOBAL_SCOPE,
+    TAXONOMY_SCOPE,
+    bump_generations,
+    invalidate_job_details,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Merge locations with the same city, state or province and country "
+        "(ignoring case) into one, and repoint their job postings in bulk"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the duplicate locations without merging them",
+        )
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            with connection.cursor() as cursor:
+                pairs = find_duplicate_locations(cursor)
+            self.stdout.write(f"Found {len(pairs)} duplicate location(s).")
+            return
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                location_ids, job_ids = merge_duplicate_locations(cursor)
+
+        if location_ids:
+            invalidate_taxonomy(Location, location_ids)
+            invalidate_job_details(job_ids)
+            bump_generations([GLOBAL_SCOPE, TAXONOMY_SCOPE])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Merged {len(location_ids)} duplicate location(s), "
+                f"repointed {len(job_ids)} job posting(s)."
+            )
+        )
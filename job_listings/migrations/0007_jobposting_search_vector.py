@@ -0,0 +1,58 @@
+# Generated by Django 5.0.12 on 2026-10-16 22:47
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+# Keep `search_vector` in sync for every write path (save, bulk_create,
+# QuerySet.update, admin, raw SQL). Title is weighted above description.
+CREATE_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION job_listings_jobposting_search_vector_update()
+RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER job_listings_jobposting_search_vector_trigger
+BEFORE INSERT OR UPDATE OF title, description, search_vector
+ON job_listings_jobposting
+FOR EACH ROW EXECUTE FUNCTION job_listings_jobposting_search_vector_update();
+
+UPDATE job_listings_jobposting SET search_vector = NULL;
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS job_listings_jobposting_search_vector_trigger
+ON job_listings_jobposting;
+DROP FUNCTION IF EXISTS job_listings_jobposting_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job_listings", "0006_alter_jobposting_skills_required_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="jobposting",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobposting",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="jobposting_search_vector_gin"
+            ),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER_SQL, reverse_sql=DROP_TRIGGER_SQL),
+    ]
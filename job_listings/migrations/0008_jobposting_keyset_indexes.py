@@ -0,0 +1,28 @@
+# Generated by Django 5.0.12 on 2026-10-16 22:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job_listings", "0007_jobposting_search_vector"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="jobposting",
+            index=models.Index(
+                fields=["-posted_at", "job_id"], name="jobposting_posted_keyset_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobposting",
+            index=models.Index(
+                fields=["expiration_date", "job_id"],
+                name="jobposting_expiry_keyset_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,107 @@
+from django.db import migrations
+
+# Publish changed row IDs on the `job_listings_changes` channel so the
+# `listen_job_changes` consumer can invalidate cached job details, including
+# for writes that bypass model signals (QuerySet.update, bulk_create, admin
+# bulk actions, raw SQL). One notification is sent per statement; when too
+# many rows changed to fit in a payload, `ids` is null and consumers flush.
+CREATE_TRIGGERS_SQL = """
+CREATE OR REPLACE FUNCTION job_listings_notify_change()
+RETURNS trigger AS $$
+DECLARE
+    changed_ids text[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        EXECUTE format('SELECT array_agg(DISTINCT %I::text) FROM new_rows', TG_ARGV[0])
+        INTO changed_ids;
+    ELSIF TG_OP = 'DELETE' THEN
+        EXECUTE format('SELECT array_agg(DISTINCT %I::text) FROM old_rows', TG_ARGV[0])
+        INTO changed_ids;
+    ELSE
+        EXECUTE format(
+            'SELECT array_agg(DISTINCT id) FROM ('
+            'SELECT %1$I::text AS id FROM old_rows '
+            'UNION SELECT %1$I::text FROM new_rows) AS changed',
+            TG_ARGV[0]
+        )
+        INTO changed_ids;
+    END IF;
+
+    IF changed_ids IS NULL THEN
+        RETURN NULL;
+    END IF;
+    IF cardinality(changed_ids) > 100 THEN
+        changed_ids := NULL;
+    END IF;
+
+    PERFORM pg_notify(
+        'job_listings_changes',
+        json_build_object('table', TG_TABLE_NAME, 'ids', changed_ids)::text
+    );
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+DROP_FUNCTION_SQL = "DROP FUNCTION IF EXISTS job_listings_notify_change();"
+
+# (table, key column, operations) watched by the trigger function. Taxonomy
+# inserts are not embedded anywhere yet, so only updates and deletes matter.
+WATCHED_TABLES = [
+    ("job_listings_jobposting", "job_id", ("INSERT", "UPDATE", "DELETE")),
+    (
+        "job_listings_jobposting_skills_required",
+        "jobposting_id",
+        ("INSERT", "UPDATE", "DELETE"),
+    ),
+    ("job_listings_location", "location_id", ("UPDATE", "DELETE")),
+    ("job_listings_industry", "industry_id", ("UPDATE", "DELETE")),
+    ("job_listings_skill", "skill_id", ("UPDATE", "DELETE")),
+]
+
+# Transition tables available to each trigger operation
+TRANSITION_TABLES = {
+    "INSERT": "NEW TABLE AS new_rows",
+    "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "OLD TABLE AS old_rows",
+}
+
+
+def trigger_name(table, operation):
+    return f"{table}_notify_{operation.lower()}"
+
+
+def create_triggers_sql():
+    statements = [CREATE_TRIGGERS_SQL]
+    for table, column, operations in WATCHED_TABLES:
+        for operation in operations:
+            statements.append(
+                f"CREATE TRIGGER {trigger_name(table, operation)} "
+                f"AFTER {operation} ON {table} "
+                f"REFERENCING {TRANSITION_TABLES[operation]} "
+                f"FOR EACH STATEMENT "
+                f"EXECUTE FUNCTION job_listings_notify_change('{column}');"
+            )
+    return "\n".join(statements)
+
+
+def drop_triggers_sql():
+    statements = []
+    for table, _, operations in WATCHED_TABLES:
+        for operation in operations:
+            statements.append(
+                f"DROP TRIGGER IF EXISTS {trigger_name(table, operation)} ON {table};"
+            )
+    statements.append(DROP_FUNCTION_SQL)
+    return "\n".join(statements)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job_listings", "0008_jobposting_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(create_triggers_sql(), reverse_sql=drop_triggers_sql()),
+    ]
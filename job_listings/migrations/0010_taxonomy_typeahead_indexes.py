@@ -0,0 +1,42 @@
+# Generated by Django 5.0.12 on 2026-10-16 23:08
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job_listings", "0009_change_notify_triggers"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="industry",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.search.SearchVector("name", config="simple"),
+                name="industry_typeahead_gin",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="location",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.search.SearchVector(
+                    "city",
+                    "state_or_province",
+                    "country",
+                    "postal_code",
+                    config="simple",
+                ),
+                name="location_typeahead_gin",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="skill",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.search.SearchVector("name", config="simple"),
+                name="skill_typeahead_gin",
+            ),
+        ),
+    ]
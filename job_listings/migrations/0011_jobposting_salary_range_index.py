@@ -0,0 +1,29 @@
+# Generated by Django 5.0.12 on 2026-10-16 23:16
+
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job_listings", "0010_taxonomy_typeahead_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="jobposting",
+            index=models.Index(
+                models.F("currency"),
+                django.db.models.functions.comparison.Coalesce(
+                    "salary_max", "salary_min"
+                ),
+                django.db.models.functions.comparison.Coalesce(
+                    "salary_min", "salary_max"
+                ),
+                name="jobposting_salary_range_idx",
+            ),
+        ),
+    ]
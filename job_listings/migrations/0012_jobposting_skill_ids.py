@@ -0,0 +1,100 @@
+# Generated by Django 5.0.12 on 2026-10-16 23:20
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+# Keep `skill_ids` in sync with the skills M2M table for every write path
+# (add/remove/set/clear from either side, bulk_create of through rows, skill
+# deletion cascades, raw SQL). One UPDATE is run per statement, rebuilding
+# the arrays of the job postings whose skills changed.
+CREATE_TRIGGERS_SQL = """
+CREATE OR REPLACE FUNCTION job_listings_sync_skill_ids()
+RETURNS trigger AS $$
+DECLARE
+    changed_ids uuid[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT jobposting_id) INTO changed_ids FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(DISTINCT jobposting_id) INTO changed_ids FROM old_rows;
+    ELSE
+        SELECT array_agg(DISTINCT id) INTO changed_ids FROM (
+            SELECT jobposting_id AS id FROM old_rows
+            UNION SELECT jobposting_id FROM new_rows
+        ) AS changed;
+    END IF;
+
+    UPDATE job_listings_jobposting AS job
+    SET skill_ids = ARRAY(
+        SELECT skill_id FROM job_listings_jobposting_skills_required AS skills
+        WHERE skills.jobposting_id = job.job_id
+        ORDER BY skill_id
+    )
+    WHERE job.job_id = ANY(changed_ids);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER job_listings_jobposting_skills_required_sync_insert
+AFTER INSERT ON job_listings_jobposting_skills_required
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION job_listings_sync_skill_ids();
+
+CREATE TRIGGER job_listings_jobposting_skills_required_sync_update
+AFTER UPDATE ON job_listings_jobposting_skills_required
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION job_listings_sync_skill_ids();
+
+CREATE TRIGGER job_listings_jobposting_skills_required_sync_delete
+AFTER DELETE ON job_listings_jobposting_skills_required
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION job_listings_sync_skill_ids();
+
+UPDATE job_listings_jobposting AS job
+SET skill_ids = ARRAY(
+    SELECT skill_id FROM job_listings_jobposting_skills_required AS skills
+    WHERE skills.jobposting_id = job.job_id
+    ORDER BY skill_id
+);
+"""
+
+DROP_TRIGGERS_SQL = """
+DROP TRIGGER IF EXISTS job_listings_jobposting_skills_required_sync_insert
+ON job_listings_jobposting_skills_required;
+DROP TRIGGER IF EXISTS job_listings_jobposting_skills_required_sync_update
+ON job_listings_jobposting_skills_required;
+DROP TRIGGER IF EXISTS job_listings_jobposting_skills_required_sync_delete
+ON job_listings_jobposting_skills_required;
+DROP FUNCTION IF EXISTS job_listings_sync_skill_ids();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job_listings", "0011_jobposting_salary_range_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="jobposting",
+            name="skill_ids",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.UUIDField(),
+                blank=True,
+                default=list,
+                editable=False,
+                size=None,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobposting",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["skill_ids"], name="jobposting_skill_ids_gin"
+            ),
+        ),
+        migrations.RunSQL(CREATE_TRIGGERS_SQL, reverse_sql=DROP_TRIGGERS_SQL),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.0.12 on 2026-10-16 23:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job_listings", "0012_jobposting_skill_ids"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="jobposting",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["-posted_at", "job_id"],
+                name="jobposting_live_posted_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobposting",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["industry", "-posted_at"],
+                name="jobposting_live_industry_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobposting",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["job_type", "-posted_at"],
+                name="jobposting_live_job_type_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobposting",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["location", "-posted_at"],
+                name="jobposting_live_location_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobposting",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["expiration_date"],
+                name="jobposting_live_expiry_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,62 @@
+from django.db import migrations
+
+# Let bulk jobs that invalidate caches themselves (e.g. the expiry sweep) skip
+# the per-statement change notifications with
+# `SET LOCAL job_listings.skip_notify = 'on'`.
+NOTIFY_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION job_listings_notify_change()
+RETURNS trigger AS $$
+DECLARE
+    changed_ids text[];
+BEGIN
+    {skip_notify}
+    IF TG_OP = 'INSERT' THEN
+        EXECUTE format('SELECT array_agg(DISTINCT %I::text) FROM new_rows', TG_ARGV[0])
+        INTO changed_ids;
+    ELSIF TG_OP = 'DELETE' THEN
+        EXECUTE format('SELECT array_agg(DISTINCT %I::text) FROM old_rows', TG_ARGV[0])
+        INTO changed_ids;
+    ELSE
+        EXECUTE format(
+            'SELECT array_agg(DISTINCT id) FROM ('
+            'SELECT %1$I::text AS id FROM old_rows '
+            'UNION SELECT %1$I::text FROM new_rows) AS changed',
+            TG_ARGV[0]
+        )
+        INTO changed_ids;
+    END IF;
+
+    IF changed_ids IS NULL THEN
+        RETURN NULL;
+    END IF;
+    IF cardinality(changed_ids) > 100 THEN
+        changed_ids := NULL;
+    END IF;
+
+    PERFORM pg_notify(
+        'job_listings_changes',
+        json_build_object('table', TG_TABLE_NAME, 'ids', changed_ids)::text
+    );
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+SKIP_NOTIFY_SQL = """IF current_setting('job_listings.skip_notify', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job_listings", "0013_jobposting_live_partial_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            NOTIFY_FUNCTION_SQL.format(skip_notify=SKIP_NOTIFY_SQL),
+            reverse_sql=NOTIFY_FUNCTION_SQL.format(skip_notify=""),
+        ),
+    ]
@@ -0,0 +1,67 @@
+from django.db import migrations
+
+# Rebuild the `skill_ids` of the changed job postings with one grouped join
+# instead of a correlated subquery per posting. The subquery plan degrades
+# badly (scanning the whole skills table per posting) when a bulk import has
+# grown the tables faster than their statistics are refreshed.
+SYNC_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION job_listings_sync_skill_ids()
+RETURNS trigger AS $$
+DECLARE
+    changed_ids uuid[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT jobposting_id) INTO changed_ids FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(DISTINCT jobposting_id) INTO changed_ids FROM old_rows;
+    ELSE
+        SELECT array_agg(DISTINCT id) INTO changed_ids FROM (
+            SELECT jobposting_id AS id FROM old_rows
+            UNION SELECT jobposting_id FROM new_rows
+        ) AS changed;
+    END IF;
+
+    {update}
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+SET_BASED_UPDATE_SQL = """UPDATE job_listings_jobposting AS job
+    SET skill_ids = synced.skill_ids
+    FROM (
+        SELECT
+            changed.id,
+            COALESCE(
+                array_agg(skills.skill_id ORDER BY skills.skill_id)
+                FILTER (WHERE skills.skill_id IS NOT NULL),
+                '{}'
+            ) AS skill_ids
+        FROM unnest(changed_ids) AS changed(id)
+        LEFT JOIN job_listings_jobposting_skills_required AS skills
+        ON skills.jobposting_id = changed.id
+        GROUP BY changed.id
+    ) AS synced
+    WHERE job.job_id = synced.id;"""
+
+CORRELATED_UPDATE_SQL = """UPDATE job_listings_jobposting AS job
+    SET skill_ids = ARRAY(
+        SELECT skill_id FROM job_listings_jobposting_skills_required AS skills
+        WHERE skills.jobposting_id = job.job_id
+        ORDER BY skill_id
+    )
+    WHERE job.job_id = ANY(changed_ids);"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job_listings", "0014_skip_notify_setting"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            SYNC_FUNCTION_SQL.format(update=SET_BASED_UPDATE_SQL),
+            reverse_sql=SYNC_FUNCTION_SQL.format(update=CORRELATED_UPDATE_SQL),
+        ),
+    ]
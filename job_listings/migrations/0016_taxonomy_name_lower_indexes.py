@@ -0,0 +1,28 @@
+# Generated by Django 5.0.12 on 2026-10-16 23:45
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job_listings", "0015_sync_skill_ids_set_based"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="industry",
+            index=models.Index(
+                django.db.models.functions.text.Lower("name"),
+                name="industry_name_lower_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="skill",
+            index=models.Index(
+                django.db.models.functions.text.Lower("name"),
+                name="skill_name_lower_idx",
+            ),
+        ),
+    ]
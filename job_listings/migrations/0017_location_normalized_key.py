@@ -0,0 +1,39 @@
+# Generated by Django 5.0.12 on 2026-10-16 23:49
+
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+from django.db import migrations, models
+from job_listings.locations import merge_duplicate_locations
+
+
+def merge_duplicates(apps, schema_editor):
+    """Merge existing duplicate locations so the unique constraint can be added."""
+    with schema_editor.connection.cursor() as cursor:
+        merge_duplicate_locations(cursor)
+        # Run the deferred foreign key checks before altering the table
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job_listings", "0016_taxonomy_name_lower_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="location",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("city"),
+                django.db.models.functions.text.Lower(
+                    django.db.models.functions.comparison.Coalesce(
+                        "state_or_province", models.Value("")
+                    )
+                ),
+                django.db.models.functions.text.Lower("country"),
+                name="location_normalized_key_unique",
+                violation_error_message="A location with this city, state or province and country already exists.",
+            ),
+        ),
+    ]
@@ -0,0 +1,111 @@
+# Generated by Django 5.0.12 on 2026-10-17 00:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Delete the pre-rendered documents of job postings whose representation
+# changed, for every write path (model saves, QuerySet.update, skill changes
+# through the `skill_ids` sync, taxonomy renames, raw SQL). One DELETE is run
+# per statement. Deleted postings take their documents with them.
+CREATE_TRIGGERS_SQL = """
+CREATE OR REPLACE FUNCTION job_listings_drop_documents()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'job_listings_jobposting' AND TG_OP = 'DELETE' THEN
+        DELETE FROM job_listings_jobpostingdocument AS document
+        USING old_rows
+        WHERE document.job_posting_id = old_rows.job_id;
+    ELSIF TG_TABLE_NAME = 'job_listings_jobposting' THEN
+        DELETE FROM job_listings_jobpostingdocument AS document
+        USING new_rows
+        WHERE document.job_posting_id = new_rows.job_id;
+    ELSIF TG_TABLE_NAME = 'job_listings_location' THEN
+        DELETE FROM job_listings_jobpostingdocument AS document
+        USING job_listings_jobposting AS job, new_rows
+        WHERE job.location_id = new_rows.location_id
+        AND document.job_posting_id = job.job_id;
+    ELSIF TG_TABLE_NAME = 'job_listings_industry' THEN
+        DELETE FROM job_listings_jobpostingdocument AS document
+        USING job_listings_jobposting AS job, new_rows
+        WHERE job.industry_id = new_rows.industry_id
+        AND document.job_posting_id = job.job_id;
+    ELSE
+        DELETE FROM job_listings_jobpostingdocument AS document
+        USING job_listings_jobposting AS job
+        WHERE job.skill_ids && ARRAY(SELECT skill_id FROM new_rows)
+        AND document.job_posting_id = job.job_id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER job_listings_jobposting_documents_update
+AFTER UPDATE ON job_listings_jobposting
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION job_listings_drop_documents();
+
+CREATE TRIGGER job_listings_jobposting_documents_delete
+AFTER DELETE ON job_listings_jobposting
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION job_listings_drop_documents();
+
+CREATE TRIGGER job_listings_location_documents_update
+AFTER UPDATE ON job_listings_location
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION job_listings_drop_documents();
+
+CREATE TRIGGER job_listings_industry_documents_update
+AFTER UPDATE ON job_listings_industry
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION job_listings_drop_documents();
+
+CREATE TRIGGER job_listings_skill_documents_update
+AFTER UPDATE ON job_listings_skill
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION job_listings_drop_documents();
+"""
+
+DROP_TRIGGERS_SQL = """
+DROP TRIGGER IF EXISTS job_listings_jobposting_documents_update
+ON job_listings_jobposting;
+DROP TRIGGER IF EXISTS job_listings_jobposting_documents_delete
+ON job_listings_jobposting;
+DROP TRIGGER IF EXISTS job_listings_location_documents_update
+ON job_listings_location;
+DROP TRIGGER IF EXISTS job_listings_industry_documents_update
+ON job_listings_industry;
+DROP TRIGGER IF EXISTS job_listings_skill_documents_update ON job_listings_skill;
+DROP FUNCTION IF EXISTS job_listings_drop_documents();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job_listings", "0017_location_normalized_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobPostingDocument",
+            fields=[
+                (
+                    "job_posting",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="document",
+                        serialize=False,
+                        to="job_listings.jobposting",
+                    ),
+                ),
+                ("content", models.BinaryField()),
+                ("built_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Job Posting Document",
+                "verbose_name_plural": "Job Posting Documents",
+            },
+        ),
+        migrations.RunSQL(CREATE_TRIGGERS_SQL, reverse_sql=DROP_TRIGGERS_SQL),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.12 on 2026-10-17 00:25
+
+from django.db import migrations, models
+from job_listings.geo import geocode
+
+
+def geocode_locations(apps, schema_editor):
+    """Look up the coordinates of existing locations in the gazetteer."""
+    Location = apps.get_model("job_listings", "Location")
+    locations = []
+    for location in Location.objects.all():
+        coordinates = geocode(
+            location.city, location.state_or_province, location.country
+        )
+        if coordinates is not None:
+            location.latitude, location.longitude = coordinates
+            locations.append(location)
+    Location.objects.bulk_update(locations, ["latitude", "longitude"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job_listings", "0018_jobpostingdocument"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="location",
+            name="latitude",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="location",
+            name="longitude",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="location",
+            index=models.Index(
+                fields=["latitude", "longitude"], name="location_coordinates_idx"
+            ),
+        ),
+        migrations.RunPython(geocode_locations, migrations.RunPython.noop),
+    ]
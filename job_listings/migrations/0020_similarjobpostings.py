@@ -0,0 +1,53 @@
+# Generated by Django 5.0.12 on 2026-10-17 00:34
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job_listings", "0019_location_coordinates"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SimilarJobPostings",
+            fields=[
+                (
+                    "job_posting",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="similar",
+                        serialize=False,
+                        to="job_listings.jobposting",
+                    ),
+                ),
+                (
+                    "job_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.UUIDField(), default=list, size=None
+                    ),
+                ),
+                (
+                    "scores",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.FloatField(), default=list, size=None
+                    ),
+                ),
+                ("built_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Similar Job Postings",
+                "verbose_name_plural": "Similar Job Postings",
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["job_ids"], name="similar_job_ids_gin"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,151 @@
+from django.db import migrations
+
+# Also publish the previous values of the cache scope columns passed as extra
+# trigger arguments (e.g. the employer and industry of job postings), so the
+# consumer can invalidate the lists a row was moved out of or deleted from.
+# Each is a list of distinct non-null values under `old`, or null when too
+# many distinct values changed to fit in a payload.
+NOTIFY_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION job_listings_notify_change()
+RETURNS trigger AS $$
+DECLARE
+    changed_ids text[];
+    scope_ids text[];
+    old_scopes jsonb := '{}'::jsonb;
+BEGIN
+    IF current_setting('job_listings.skip_notify', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP = 'INSERT' THEN
+        EXECUTE format('SELECT array_agg(DISTINCT %I::text) FROM new_rows', TG_ARGV[0])
+        INTO changed_ids;
+    ELSIF TG_OP = 'DELETE' THEN
+        EXECUTE format('SELECT array_agg(DISTINCT %I::text) FROM old_rows', TG_ARGV[0])
+        INTO changed_ids;
+    ELSE
+        EXECUTE format(
+            'SELECT array_agg(DISTINCT id) FROM ('
+            'SELECT %1$I::text AS id FROM old_rows '
+            'UNION SELECT %1$I::text FROM new_rows) AS changed',
+            TG_ARGV[0]
+        )
+        INTO changed_ids;
+    END IF;
+
+    IF changed_ids IS NULL THEN
+        RETURN NULL;
+    END IF;
+    IF cardinality(changed_ids) > 100 THEN
+        changed_ids := NULL;
+    END IF;
+
+    IF TG_OP = 'INSERT' OR TG_NARGS = 1 THEN
+        PERFORM pg_notify(
+            'job_listings_changes',
+            json_build_object('table', TG_TABLE_NAME, 'ids', changed_ids)::text
+        );
+        RETURN NULL;
+    END IF;
+
+    FOR i IN 1 .. TG_NARGS - 1 LOOP
+        EXECUTE format(
+            'SELECT coalesce(array_agg(DISTINCT %1$I::text), ''{}'') '
+            'FROM old_rows WHERE %1$I IS NOT NULL',
+            TG_ARGV[i]
+        )
+        INTO scope_ids;
+        IF cardinality(scope_ids) > 20 THEN
+            scope_ids := NULL;
+        END IF;
+        old_scopes := old_scopes || jsonb_build_object(TG_ARGV[i], scope_ids);
+    END LOOP;
+
+    PERFORM pg_notify(
+        'job_listings_changes',
+        json_build_object(
+            'table', TG_TABLE_NAME, 'ids', changed_ids, 'old', old_scopes
+        )::text
+    );
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+PREVIOUS_NOTIFY_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION job_listings_notify_change()
+RETURNS trigger AS $$
+DECLARE
+    changed_ids text[];
+BEGIN
+    IF current_setting('job_listings.skip_notify', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP = 'INSERT' THEN
+        EXECUTE format('SELECT array_agg(DISTINCT %I::text) FROM new_rows', TG_ARGV[0])
+        INTO changed_ids;
+    ELSIF TG_OP = 'DELETE' THEN
+        EXECUTE format('SELECT array_agg(DISTINCT %I::text) FROM old_rows', TG_ARGV[0])
+        INTO changed_ids;
+    ELSE
+        EXECUTE format(
+            'SELECT array_agg(DISTINCT id) FROM ('
+            'SELECT %1$I::text AS id FROM old_rows '
+            'UNION SELECT %1$I::text FROM new_rows) AS changed',
+            TG_ARGV[0]
+        )
+        INTO changed_ids;
+    END IF;
+
+    IF changed_ids IS NULL THEN
+        RETURN NULL;
+    END IF;
+    IF cardinality(changed_ids) > 100 THEN
+        changed_ids := NULL;
+    END IF;
+
+    PERFORM pg_notify(
+        'job_listings_changes',
+        json_build_object('table', TG_TABLE_NAME, 'ids', changed_ids)::text
+    );
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+# Transition tables available to each trigger operation
+TRANSITION_TABLES = {
+    "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "OLD TABLE AS old_rows",
+}
+
+
+def job_posting_triggers_sql(*columns):
+    arguments = ", ".join(f"'{column}'" for column in columns)
+    statements = []
+    for operation, transition_tables in TRANSITION_TABLES.items():
+        name = f"job_listings_jobposting_notify_{operation.lower()}"
+        statements.append(
+            f"DROP TRIGGER IF EXISTS {name} ON job_listings_jobposting;\n"
+            f"CREATE TRIGGER {name} "
+            f"AFTER {operation} ON job_listings_jobposting "
+            f"REFERENCING {transition_tables} "
+            f"FOR EACH STATEMENT "
+            f"EXECUTE FUNCTION job_listings_notify_change({arguments});"
+        )
+    return "\n".join(statements)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job_listings", "0020_similarjobpostings"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            NOTIFY_FUNCTION_SQL
+            + job_posting_triggers_sql("job_id", "employer_id", "industry_id"),
+            reverse_sql=PREVIOUS_NOTIFY_FUNCTION_SQL
+            + job_posting_triggers_sql("job_id"),
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+# `skill_ids` is maintained by the `job_listings_sync_skill_ids` trigger on the
+# skills through table. A full `save()` of a posting loaded before its skills
+# changed would write the stale list back, so updates keep the stored value
+# unless they come from that trigger (nested, at a trigger depth above 1).
+CREATE_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION job_listings_keep_skill_ids()
+RETURNS trigger AS $$
+BEGIN
+    IF pg_trigger_depth() < 2 THEN
+        NEW.skill_ids := OLD.skill_ids;
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER job_listings_jobposting_keep_skill_ids
+BEFORE UPDATE OF skill_ids ON job_listings_jobposting
+FOR EACH ROW
+WHEN (NEW.skill_ids IS DISTINCT FROM OLD.skill_ids)
+EXECUTE FUNCTION job_listings_keep_skill_ids();
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS job_listings_jobposting_keep_skill_ids
+ON job_listings_jobposting;
+DROP FUNCTION IF EXISTS job_listings_keep_skill_ids();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job_listings", "0021_notify_old_scopes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRIGGER_SQL, reverse_sql=DROP_TRIGGER_SQL),
+    ]
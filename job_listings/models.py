@@ -1,10 +1,62 @@
 import uuid
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Coalesce, Lower
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.utils import timezone
 from django.utils.text import slugify
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+# Text search configuration used both by the `search_vector` trigger
+# and by search queries. They must match for the GIN index to be used.
+SEARCH_CONFIG = "english"
+
+# Text search configuration for taxonomy typeahead. No stemming or stop words,
+# so prefixes match names as they are typed.
+TYPEAHEAD_CONFIG = "simple"
+
+
+def typeahead_vector(*fields):
+    """
+    Return the search vector used for typeahead over `fields`.
+
+    Shared by the expression indexes and the typeahead queries, which must
+    produce the same expression for the indexes to be used.
+    """
+    return SearchVector(*fields, config=TYPEAHEAD_CONFIG)
+
+
+def salary_floor():
+    """
+    Return an expression for the lowest salary a job posting pays.
+    A posting with only one salary bound set pays exactly that amount.
+    """
+    return Coalesce("salary_min", "salary_max")
+
+
+def salary_ceiling():
+    """Return an expression for the highest salary a job posting pays."""
+    return Coalesce("salary_max", "salary_min")
+
+
+def location_key_expressions():
+    """
+    Return the expressions of the normalized location key: city, state or
+    province (empty if missing) and country, case-insensitively.
+
+    Shared by the unique constraint and location lookups, which must use the
+    same expressions for the constraint's index to be used.
+    """
+    return (
+        Lower("city"),
+        Lower(Coalesce("state_or_province", Value(""))),
+        Lower("country"),
+    )
+
 
 class Industry(models.Model):
     """
@@ -27,6 +79,9 @@ class Industry(models.Model):
         verbose_name_plural = "Industries"
         indexes = [
             models.Index(fields=["name"]),
+            # Case-insensitive matching, see `job_listings.resolvers`
+            models.Index(Lower("name"), name="industry_name_lower_idx"),
+            GinIndex(typeahead_vector("name"), name="industry_typeahead_gin"),
         ]
         ordering = ["name"]
 
@@ -44,6 +99,15 @@ class Location(models.Model):
         postal_code (str): The postal code of the location.
         state_or_province (str): The state or province of the location.
         country (str): The name of the country.
+        latitude (float): The latitude of the city, from the gazetteer.
+        longitude (float): The longitude of the city, from the gazetteer.
+
+    Coordinates are looked up in the bundled offline gazetteer when a location
+    is created, and are empty for cities it does not list (see
+    `job_listings.geo`).
+
+    Locations are unique by city, state or province and country, ignoring
+    case (see `location_key_expressions`). The postal code is not part of the key.
 
     Methods:
         __str__: Return the string representation of the Location, which is a combination of city and country.
@@ -54,6 +118,8 @@ class Location(models.Model):
     postal_code = models.CharField(max_length=10, blank=True, null=True)
     state_or_province = models.CharField(max_length=100, blank=True, null=True)
     country = models.CharField(max_length=100)
+    latitude = models.FloatField(blank=True, null=True)
+    longitude = models.FloatField(blank=True, null=True)
 
     class Meta:
         verbose_name = "Job Location"
@@ -62,6 +128,24 @@ class Location(models.Model):
             models.Index(
                 fields=["city", "country", "state_or_province", "postal_code"]
             ),
+            # Bounding box prefilter of radius searches, see `job_listings.geo`
+            models.Index(
+                fields=["latitude", "longitude"], name="location_coordinates_idx"
+            ),
+            GinIndex(
+                typeahead_vector("city", "state_or_province", "country", "postal_code"),
+                name="location_typeahead_gin",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                *location_key_expressions(),
+                name="location_normalized_key_unique",
+                violation_error_message=(
+                    "A location with this city, state or province and country "
+                    "already exists."
+                ),
+            ),
         ]
         ordering = ["city", "country"]
 
@@ -89,6 +173,9 @@ class Skill(models.Model):
         verbose_name_plural = "Skills"
         indexes = [
             models.Index(fields=["name"]),
+            # Case-insensitive matching, see `job_listings.resolvers`
+            models.Index(Lower("name"), name="skill_name_lower_idx"),
+            GinIndex(typeahead_vector("name"), name="skill_typeahead_gin"),
         ]
         ordering = ["name"]
 
@@ -110,6 +197,80 @@ class JobType(models.TextChoices):
     VOLUNTEER = "volunteer", "Volunteer"
 
 
+# Slugs of postings with the same title are told apart by a random suffix
+SLUG_MAX_LENGTH = 255
+SLUG_SUFFIX_LENGTH = 6
+
+# Attempts to allocate a unique slug before giving up on a unique violation
+SLUG_ATTEMPTS = 5
+
+
+def base_slug(title):
+    """Return the slug of `title`, leaving room for a disambiguating suffix."""
+    max_length = SLUG_MAX_LENGTH - SLUG_SUFFIX_LENGTH - 1
+    return slugify(title)[:max_length].strip("-") or "job"
+
+
+def suffixed_slug(base):
+    """Return `base` with a random suffix."""
+    return f"{base}-{uuid.uuid4().hex[:SLUG_SUFFIX_LENGTH]}"
+
+
+def is_slug_violation(error):
+    """Return whether an `IntegrityError` was raised by the unique slug constraint."""
+    diag = getattr(error.__cause__, "diag", None)
+    return "slug" in (getattr(diag, "constraint_name", None) or "")
+
+
+class JobPostingQuerySet(models.QuerySet):
+    """QuerySet for job postings."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Create job postings in bulk, allocating unique slugs to those without
+        one since `save()` is not called.
+
+        Each attempt looks up which candidate slugs are taken in one query,
+        suffixes those (and duplicates within the batch), then inserts inside
+        a savepoint. A concurrent insert of the same slug is retried.
+        """
+        objs = list(objs)
+        bases = {id(obj): base_slug(obj.title) for obj in objs if not obj.slug}
+        if not bases:
+            return super().bulk_create(objs, *args, **kwargs)
+
+        unslugged = [obj for obj in objs if id(obj) in bases]
+        for obj in unslugged:
+            obj.slug = bases[id(obj)]
+        for attempt in range(SLUG_ATTEMPTS):
+            taken = set(
+                self.model._base_manager.using(self.db)
+                .filter(slug__in=[obj.slug for obj in unslugged])
+                .values_list("slug", flat=True)
+            )
+            taken.update(obj.slug for obj in objs if id(obj) not in bases)
+            for obj in unslugged:
+                if obj.slug in taken:
+                    obj.slug = suffixed_slug(bases[id(obj)])
+                taken.add(obj.slug)
+            try:
+                with transaction.atomic(using=self.db):
+                    return super().bulk_create(objs, *args, **kwargs)
+            except IntegrityError as error:
+                if attempt == SLUG_ATTEMPTS - 1 or not is_slug_violation(error):
+                    raise
+
+    def live(self):
+        """
+        Returns the postings visible on the public job board: active and not
+        expired. Queries on live postings are served by the partial indexes
+        on `is_active = true` (see `JobPosting.Meta.indexes`), which the
+        `deactivate_expired_postings` task keeps small. The expiration check
+        still covers postings expired since the last sweep.
+        """
+        return self.filter(is_active=True, expiration_date__gte=timezone.now())
+
+
 class JobPosting(models.Model):
     """
     Represents a job posting on the job board.
@@ -128,15 +289,30 @@ class JobPosting(models.Model):
     - `salary_min`: The minimum salary for the job (DecimalField).
     - `salary_max`: The maximum salary for the job (DecimalField).
     - `currency`: The currency in which the salary is paid (default: ZAR).
+    Salary ranges are indexed per currency, see `salary_floor` and `salary_ceiling`.
     - `is_active`: A boolean field. If False, the job posting is hidden from the job board.
     - `expiration_date`: The date and time when the job posting expires (DateTimeField).
     - `posted_at`: The date and time when the job posting was created (auto-generated).
     - `updated_at`: The date and time when the job posting was last updated (auto-generated).
+    - `search_vector`: Weighted full-text document (title `A`, description `B`). Maintained
+      by a database trigger, so it stays in sync on `save()`, `bulk_create()` and `update()`.
+    - `skill_ids`: Denormalized IDs of `skills_required`. Maintained by a database trigger
+      on the M2M table, so skills can be filtered and serialized without a join.
+      Other updates keep the stored value, so saving a stale instance cannot overwrite it.
 
     **Meta Information:**
     - `verbose_name`: "Job Posting"
     - `verbose_name_plural`: "Job Postings"
-    - `indexes`: Adds an index on `job_id` for faster query performance.
+    - `indexes`: Adds an index on `job_id` for faster query performance,
+      GIN indexes on `search_vector` for full-text search and on `skill_ids`
+      for skill containment, and composite
+      `(posted_at, job_id)` / `(expiration_date, job_id)` indexes for keyset pagination.
+      Partial indexes on `is_active = true` serve the public (live) listing, by
+      recency and by industry, job type and location.
+
+    **Managers:**
+    - `objects`: All job postings. `objects.live()` returns only the live
+      (active, unexpired) ones.
 
     **Methods:**
     - `save`: Override the save method to create a unique slug for each job posting.
@@ -150,7 +326,7 @@ class JobPosting(models.Model):
     )
     company = models.CharField(max_length=255, null=True, blank=True)
     title = models.CharField(max_length=255, db_index=True)
-    slug = models.SlugField(max_length=255, unique=True, blank=True)
+    slug = models.SlugField(max_length=SLUG_MAX_LENGTH, unique=True, blank=True)
     description = models.TextField()
     job_type = models.CharField(
         max_length=50, choices=JobType.choices, null=False, blank=False, db_index=True
@@ -175,6 +351,10 @@ class JobPosting(models.Model):
     expiration_date = models.DateTimeField(db_index=True)
     posted_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+    skill_ids = ArrayField(models.UUIDField(), default=list, blank=True, editable=False)
+
+    objects = JobPostingQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Job Posting"
@@ -186,22 +366,73 @@ class JobPosting(models.Model):
             models.Index(fields=["job_type"]),
             models.Index(fields=["expiration_date"]),
             models.Index(fields=["industry"]),
+            GinIndex(fields=["search_vector"], name="jobposting_search_vector_gin"),
+            GinIndex(fields=["skill_ids"], name="jobposting_skill_ids_gin"),
+            # Keyset pagination on (-posted_at, job_id) and (expiration_date, job_id)
+            models.Index(
+                fields=["-posted_at", "job_id"], name="jobposting_posted_keyset_idx"
+            ),
+            models.Index(
+                fields=["expiration_date", "job_id"],
+                name="jobposting_expiry_keyset_idx",
+            ),
+            # Live postings. Expired postings are deactivated by the expiry
+            # sweep, so these stay proportional to the public job board.
+            models.Index(
+                fields=["-posted_at", "job_id"],
+                name="jobposting_live_posted_idx",
+                condition=Q(is_active=True),
+            ),
+            models.Index(
+                fields=["industry", "-posted_at"],
+                name="jobposting_live_industry_idx",
+                condition=Q(is_active=True),
+            ),
+            models.Index(
+                fields=["job_type", "-posted_at"],
+                name="jobposting_live_job_type_idx",
+                condition=Q(is_active=True),
+            ),
+            models.Index(
+                fields=["location", "-posted_at"],
+                name="jobposting_live_location_idx",
+                condition=Q(is_active=True),
+            ),
+            models.Index(
+                fields=["expiration_date"],
+                name="jobposting_live_expiry_idx",
+                condition=Q(is_active=True),
+            ),
+            # Salary range overlap: currency = %s AND ceiling >= %s AND floor <= %s
+            models.Index(
+                F("currency"),
+                salary_ceiling(),
+                salary_floor(),
+                name="jobposting_salary_range_idx",
+            ),
         ]
 
     def save(self, *args, **kwargs):
         """
         Override the save method to create a unique slug for each job posting.
-        """
-        if not self.slug:
-            self.slug = slugify(self.title)
-
-            original_slug = self.slug
-            counter = 1
-            while JobPosting.objects.filter(slug=self.slug).exists():
-                self.slug = f"{original_slug}-{uuid.uuid4().hex[:6]}"
-                counter += 1
 
-        super().save(*args, **kwargs)
+        The slug of the title is tried first, without checking for it. If it
+        is taken, the write fails on the unique constraint inside a savepoint
+        and is retried with a random suffix.
+        """
+        if self.slug:
+            return super().save(*args, **kwargs)
+
+        base = base_slug(self.title)
+        self.slug = base
+        for attempt in range(SLUG_ATTEMPTS):
+            try:
+                with transaction.atomic(using=kwargs.get("using")):
+                    return super().save(*args, **kwargs)
+            except IntegrityError as error:
+                if attempt == SLUG_ATTEMPTS - 1 or not is_slug_violation(error):
+                    raise
+                self.slug = suffixed_slug(base)
 
     def delete_job(self):
         """
@@ -215,3 +446,82 @@ class JobPosting(models.Model):
         Returns the title of the job posting as string representation.
         """
         return f"{self.title} - {self.company}"
+
+
+class JobPostingDocument(models.Model):
+    """
+    Pre-rendered JSON representation of a job posting, as returned in job
+    posting lists. Lists are assembled from these documents without loading
+    or serializing the postings (see `job_listings.documents`).
+
+    Database triggers delete the document whenever the posting, its skills,
+    or its location, industry or skills change, so a document is never stale.
+    Missing documents are rebuilt by the `build_job_documents` task.
+
+    **Fields:**
+    - `job_posting`: The job posting (primary key).
+    - `content`: The posting serialized by `JobPostingSerializer`, encoded as JSON.
+    - `built_at`: The date and time when the document was built.
+    """
+
+    job_posting = models.OneToOneField(
+        JobPosting,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="document",
+    )
+    content = models.BinaryField()
+    built_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Job Posting Document"
+        verbose_name_plural = "Job Posting Documents"
+
+    def __str__(self):
+        """
+        Returns the ID of the job posting as string representation.
+        """
+        return f"Document of {self.job_posting_id}"
+
+
+class SimilarJobPostings(models.Model):
+    """
+    The precomputed nearest neighbours of a job posting, by the similarity of
+    their title, description and skills (see `job_listings.similar`).
+
+    Rows are maintained by the `build_similar_postings` task: incrementally for
+    new and updated postings, and for every live posting on the daily full
+    rebuild.
+
+    **Fields:**
+    - `job_posting`: The job posting (primary key).
+    - `job_ids`: The IDs of the most similar live postings, most similar first.
+    - `scores`: The cosine similarity of each of `job_ids`, in the same order.
+    - `built_at`: The date and time when the neighbours were computed.
+
+    **Indexes:**
+    - GIN index on `job_ids`, to find the lists a changed posting appears in.
+    """
+
+    job_posting = models.OneToOneField(
+        JobPosting,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="similar",
+    )
+    job_ids = ArrayField(models.UUIDField(), default=list)
+    scores = ArrayField(models.FloatField(), default=list)
+    built_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Similar Job Postings"
+        verbose_name_plural = "Similar Job Postings"
+        indexes = [
+            GinIndex(fields=["job_ids"], name="similar_job_ids_gin"),
+        ]
+
+    def __str__(self):
+        """
+        Returns the ID of the job posting as string representation.
+        """
+        return f"Similar to {self.job_posting_id}"
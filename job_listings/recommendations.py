@@ -0,0 +1,219 @@
+"""
+"Recommended for you" job postings for jobseekers, by skill overlap.
+
+A jobseeker's skill profile is built from the skills required by the postings
+they applied to, weighted by how often each skill appears. Live postings are
+encoded as binary skill vectors. Each posting is scored by the cosine
+similarity of its vector with the profile, and the top `RECOMMENDATION_COUNT`
+postings the jobseeker has not applied to are kept.
+
+The `refresh_recommendations` task scores every jobseeker periodically, in
+batches of users, with one NumPy matrix product per batch. Only the skills of
+the batch's profiles are materialized, and only for the postings that require
+at least one of them. The result lists are cached per jobseeker and served by
+`GET /api/jobs/recommended/`. A missing list (new jobseeker, new application)
+is computed for that jobseeker alone on read.
+"""
+
+import numpy as np
+from django.core.cache import cache
+from django.utils import timezone
+from .models import JobPosting
+from .cache import KEY_PREFIX, pack_ids, unpack_ids
+
+# Number of postings recommended to a jobseeker
+RECOMMENDATION_COUNT = 20
+
+# Number of jobseekers scored per matrix product
+RECOMMENDATION_BATCH_SIZE = 256
+
+# Timeout (in seconds) for cached recommendations. Longer than the refresh
+# interval, so lists are replaced before they expire.
+RECOMMENDATION_CACHE_TIMEOUT = 60 * 60 * 2
+
+
+def recommendation_key(user_id):
+    """Return the cache key of a jobseeker's recommended job postings."""
+    return f"{KEY_PREFIX}:recommended:{user_id}"
+
+
+def invalidate_recommendations(user_ids):
+    """Drop the cached recommendations of the given jobseekers."""
+    cache.delete_many([recommendation_key(user_id) for user_id in user_ids])
+
+
+class PostingMatrix:
+    """
+    The skill vectors of the live job postings, newest first, stored sparsely
+    as the column indices of each posting's skills.
+
+    **Attributes:**
+    - `job_ids`: Posting IDs, in row order.
+    - `columns`: Dict of skill ID to column index.
+    - `rows`, `skills`: Row and column index of every (posting, skill) pair.
+    - `norms`: Euclidean norm of each posting's vector (square root of its
+    number of skills).
+    """
+
+    def __init__(self, postings):
+        self.job_ids = []
+        self.columns = {}
+        rows, skills = [], []
+        for row, (job_id, skill_ids) in enumerate(postings):
+            self.job_ids.append(job_id)
+            for skill_id in skill_ids:
+                rows.append(row)
+                skills.append(self.columns.setdefault(skill_id, len(self.columns)))
+
+        self.rows = np.array(rows, dtype=np.int64)
+        self.skills = np.array(skills, dtype=np.int64)
+        counts = np.bincount(self.rows, minlength=len(self.job_ids))
+        self.norms = np.sqrt(np.maximum(counts, 1)).astype(np.float32)
+        self.index = {job_id: row for row, job_id in enumerate(self.job_ids)}
+
+    @classmethod
+    def live(cls, skill_ids=None):
+        """
+        Build the matrix of the live job postings, or only of those requiring
+        any of `skill_ids` (on the GIN-indexed `skill_ids`).
+        """
+        postings = JobPosting.objects.live()
+        if skill_ids is not None:
+            postings = postings.filter(skill_ids__overlap=list(skill_ids))
+        postings = postings.order_by("-posted_at", "pk").values_list("pk", "skill_ids")
+        return cls(postings.iterator(chunk_size=5000))
+
+    def positions(self, rows, job_ids):
+        """Return the positions in `rows` (sorted) of the postings `job_ids`."""
+        wanted = np.array(
+            [self.index[job_id] for job_id in job_ids if job_id in self.index],
+            dtype=np.int64,
+        )
+        found = np.searchsorted(rows, wanted)
+        in_range = found < len(rows)
+        found, wanted = found[in_range], wanted[in_range]
+        return found[rows[found] == wanted]
+
+    def block(self, columns):
+        """
+        Return `(rows, block)`: the postings requiring any of the given skill
+        `columns`, and their dense, norm-scaled vectors restricted to them.
+        """
+        position = np.full(len(self.columns), -1, dtype=np.int64)
+        position[columns] = np.arange(len(columns))
+        selected = position[self.skills] >= 0
+
+        rows, row_positions = np.unique(self.rows[selected], return_inverse=True)
+        block = np.zeros((len(rows), len(columns)), dtype=np.float32)
+        block[row_positions, position[self.skills[selected]]] = 1
+        return rows, block / self.norms[rows, None]
+
+
+def skill_profiles(user_ids):
+    """
+    Return `(profiles, applied)` for the given jobseekers: per jobseeker, a
+    dict of skill ID to the number of applied postings requiring it, and the
+    set of applied posting IDs.
+    """
+    profiles = {user_id: {} for user_id in user_ids}
+    applied = {user_id: set() for user_id in user_ids}
+    applications = JobPosting.objects.filter(
+        applications__job_seeker__in=user_ids
+    ).values_list("applications__job_seeker", "pk", "skill_ids")
+    for user_id, job_id, skill_ids in applications:
+        applied[user_id].add(job_id)
+        profile = profiles[user_id]
+        for skill_id in skill_ids:
+            profile[skill_id] = profile.get(skill_id, 0) + 1
+    return profiles, applied
+
+
+def top_postings(scores, count):
+    """
+    Return the indices of the `count` highest positive `scores`, best first.
+    Ties keep the lower index (the newer posting).
+    """
+    count = min(count, int(np.count_nonzero(scores > 0)))
+    if count == 0:
+        return []
+    threshold = np.partition(scores, -count)[-count]
+    above = np.flatnonzero(scores > threshold)
+    tied = np.flatnonzero(scores == threshold)[: count - len(above)]
+    top = np.sort(np.concatenate([above, tied]))
+    return top[np.argsort(-scores[top], kind="stable")].tolist()
+
+
+def score_batch(user_ids, matrix=None, count=RECOMMENDATION_COUNT):
+    """
+    Return a dict of jobseeker ID to their recommended posting IDs, best
+    first, scoring the batch's profiles against `matrix` in one product.
+
+    Without a `matrix`, one is built from the live postings sharing a skill
+    with the batch's profiles.
+    """
+    profiles, applied = skill_profiles(user_ids)
+    if matrix is None:
+        matrix = PostingMatrix.live(
+            {skill_id for profile in profiles.values() for skill_id in profile}
+        )
+    columns = sorted(
+        {
+            matrix.columns[skill_id]
+            for profile in profiles.values()
+            for skill_id in profile
+            if skill_id in matrix.columns
+        }
+    )
+    recommended = {user_id: [] for user_id in user_ids}
+    if not columns:
+        return recommended
+
+    # Weighted, normalized profile vectors restricted to the same columns
+    position = {column: i for i, column in enumerate(columns)}
+    users = np.zeros((len(user_ids), len(columns)), dtype=np.float32)
+    for i, user_id in enumerate(user_ids):
+        for skill_id, weight in profiles[user_id].items():
+            if skill_id in matrix.columns:
+                users[i, position[matrix.columns[skill_id]]] = weight
+    norms = np.linalg.norm(users, axis=1, keepdims=True)
+    users /= np.maximum(norms, 1)
+
+    rows, block = matrix.block(np.array(columns, dtype=np.int64))
+    scores = users @ block.T
+
+    for i, user_id in enumerate(user_ids):
+        # Never recommend a posting the jobseeker already applied to
+        scores[i, matrix.positions(rows, applied[user_id])] = 0
+        recommended[user_id] = [
+            matrix.job_ids[rows[j]] for j in top_postings(scores[i], count)
+        ]
+    return recommended
+
+
+def store_recommendations(recommended):
+    """
+    Cache the recommended posting IDs of each jobseeker, packed, and return
+    the time they were generated at.
+    """
+    generated_at = timezone.now()
+    cache.set_many(
+        {
+            recommendation_key(user_id): (generated_at, pack_ids(job_ids))
+            for user_id, job_ids in recommended.items()
+        },
+        timeout=RECOMMENDATION_CACHE_TIMEOUT,
+    )
+    return generated_at
+
+
+def get_recommendations(user):
+    """
+    Return `(generated_at, job_ids)` of the postings recommended to `user`,
+    from the cache, or computed and cached for that user alone on a miss.
+    """
+    cached = cache.get(recommendation_key(user.pk))
+    if cached is None:
+        recommended = score_batch([user.pk])
+        return store_recommendations(recommended), recommended[user.pk]
+    generated_at, packed_ids = cached
+    return generated_at, unpack_ids(packed_ids)
@@ -0,0 +1,187 @@
+"""
+Set-based resolution of taxonomy values to `Industry`, `Location` and `Skill`
+rows, shared by job posting creation, updates and bulk imports.
+
+Each resolver takes every value used by one or many job postings, looks up
+the existing rows in one query and creates the missing ones with one
+`bulk_create`, instead of one `get_or_create` per value. Values are matched
+case-insensitively, ignoring surrounding and repeated whitespace, so
+"python" and " Python" resolve to the existing "Python" skill. Names and
+location keys are unique in the database, so concurrent writers resolve the
+same value to the same row.
+
+Resolved rows are also cached per process by key (`TaxonomyCache.keys`), so
+values used again skip the database entirely.
+"""
+
+from functools import reduce
+from operator import or_
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from .geo import geocode
+from .models import JobPosting, Location, location_key_expressions
+from .taxonomy import invalidate_taxonomy, registry
+
+
+def clean_value(value):
+    """Return `value` with surrounding and repeated whitespace removed."""
+    return " ".join((value or "").split())
+
+
+def name_key(name):
+    """Return the case-normalized key a taxonomy name is matched by."""
+    return clean_value(name).lower()
+
+
+def invalidate_created(model):
+    """Invalidate the taxonomy lists of `model` once new rows are committed."""
+    transaction.on_commit(lambda: invalidate_taxonomy(model))
+
+
+def resolve(model, wanted, lookup, build):
+    """
+    Resolve normalized keys to rows of `model`: from this process's key cache,
+    then with one `lookup` query, then by creating the remaining rows with one
+    `bulk_create`. Rows created concurrently conflict on the unique name or
+    location key and are picked up by a second lookup.
+
+    Arguments:
+    - **model**: The taxonomy model.
+    - **wanted**: Dict of normalized key to the value a missing row is built from.
+    - **lookup**: Callable returning a dict of key to existing row, for a set of keys.
+    - **build**: Callable returning an unsaved row from a value of `wanted`.
+
+    Returns a dict of key to row. Resolved rows are added to the key cache
+    once committed.
+    """
+    key_cache = registry[model._meta.model_name].keys
+    resolved = {}
+    for key in wanted:
+        row = key_cache.get(key)
+        if row is not None:
+            resolved[key] = row
+
+    missing = wanted.keys() - resolved.keys()
+    if not missing:
+        return resolved
+
+    resolved.update(lookup(missing))
+    created = missing - resolved.keys()
+    if created:
+        model.objects.bulk_create(
+            [build(wanted[key]) for key in created], ignore_conflicts=True
+        )
+        resolved.update(lookup(created))
+        invalidate_created(model)
+
+    def cache_resolved():
+        for key in missing:
+            key_cache.set(key, resolved[key])
+
+    transaction.on_commit(cache_resolved)
+    return resolved
+
+
+def resolve_names(model, names):
+    """
+    Return a dict of `name_key` to row of `model` (`Industry` or `Skill`) for
+    each of `names`, creating the missing rows. If existing rows differ only
+    by case, the one with the lowest ID is used.
+    """
+    wanted = {}
+    for name in names:
+        wanted.setdefault(name_key(name), clean_value(name))
+
+    def lookup(keys):
+        rows = {}
+        existing = model.objects.annotate(name_key=Lower("name"))
+        for row in existing.filter(name_key__in=keys).order_by("pk"):
+            rows.setdefault(row.name_key, row)
+        return rows
+
+    return resolve(model, wanted, lookup, lambda name: model(name=name))
+
+
+def location_key(location):
+    """
+    Return the case-normalized `(city, state_or_province, country)` key a
+    location is matched by, from a validated location dict. A missing state
+    or province is "". Matches `location_key_expressions` in the database.
+    """
+    return (
+        name_key(location["city"]),
+        name_key(location.get("state_or_province")),
+        name_key(location["country"]),
+    )
+
+
+def lookup_locations(keys):
+    """Return a dict of `location_key` to existing `Location` for `keys`."""
+    match = reduce(
+        or_,
+        (
+            Q(city_key=city, state_key=state_or_province, country_key=country)
+            for city, state_or_province, country in keys
+        ),
+    )
+    city, state_or_province, country = location_key_expressions()
+    existing = Location.objects.annotate(
+        city_key=city, state_key=state_or_province, country_key=country
+    ).filter(match)
+    return {
+        (location.city_key, location.state_key, location.country_key): location
+        for location in existing
+    }
+
+
+def resolve_locations(locations):
+    """
+    Return a dict of `location_key` to `Location` for each validated location
+    dict in `locations`, creating the missing rows.
+
+    The first dict of each key provides the spelling and postal code of a
+    created location. Its coordinates are looked up in the gazetteer.
+    """
+    wanted = {}
+    for location in locations:
+        wanted.setdefault(location_key(location), location)
+
+    def build(location):
+        created = Location(
+            city=clean_value(location["city"]),
+            state_or_province=clean_value(location.get("state_or_province")),
+            country=clean_value(location["country"]),
+            postal_code=location.get("postal_code"),
+        )
+        coordinates = geocode(created.city, created.state_or_province, created.country)
+        if coordinates is not None:
+            created.latitude, created.longitude = coordinates
+        return created
+
+    return resolve(Location, wanted, lookup_locations, build)
+
+
+def set_job_skills(job_posting, skill_ids):
+    """
+    Set the skills of a saved job posting, writing only the skill rows that
+    changed.
+
+    Unlike `skills_required.set()`, the current skills are read from the
+    posting's `skill_ids` rather than queried. The database keeps `skill_ids`
+    in sync; the in-memory value is updated to match.
+    """
+    through = JobPosting.skills_required.through
+    current = set(job_posting.skill_ids)
+    wanted = set(skill_ids)
+
+    if current - wanted:
+        through.objects.filter(
+            jobposting_id=job_posting.pk, skill_id__in=current - wanted
+        ).delete()
+    if wanted - current:
+        through.objects.bulk_create(
+            through(jobposting_id=job_posting.pk, skill_id=skill_id)
+            for skill_id in wanted - current
+        )
+    job_posting.skill_ids = sorted(wanted)
@@ -1,5 +1,16 @@
+from copy import copy
 from rest_framework import serializers
+from django.core.exceptions import ValidationError as DjangoValidationError
+from .geo import geocode
 from .models import Industry, Location, Skill, JobPosting
+from .taxonomy import TaxonomyCache
+from .resolvers import (
+    location_key,
+    name_key,
+    resolve_locations,
+    resolve_names,
+    set_job_skills,
+)
 
 
 class IndustrySerializer(serializers.ModelSerializer):
@@ -19,7 +30,35 @@ class LocationSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Location
-        fields = ["location_id", "city", "postal_code", "state_or_province", "country"]
+        fields = [
+            "location_id",
+            "city",
+            "postal_code",
+            "state_or_province",
+            "country",
+            "latitude",
+            "longitude",
+        ]
+        read_only_fields = ["latitude", "longitude"]
+
+    def validate(self, attrs):
+        """
+        Reject a location that already exists under its normalized key, rather
+        than failing on the unique constraint, and look up the coordinates of
+        its city in the gazetteer.
+        """
+        location = copy(self.instance) if self.instance else Location()
+        for attr, value in attrs.items():
+            setattr(location, attr, value)
+        try:
+            location.validate_constraints()
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError(exc.messages)
+
+        attrs["latitude"], attrs["longitude"] = geocode(
+            location.city, location.state_or_province, location.country
+        ) or (None, None)
+        return attrs
 
 
 class SkillSerializer(serializers.ModelSerializer):
@@ -32,6 +71,75 @@ class SkillSerializer(serializers.ModelSerializer):
         fields = ["skill_id", "name"]
 
 
+industry_cache = TaxonomyCache(Industry, IndustrySerializer)
+location_cache = TaxonomyCache(Location, LocationSerializer)
+skill_cache = TaxonomyCache(Skill, SkillSerializer)
+
+
+class CachedTaxonomySerializerMixin:
+    """
+    Reads a nested taxonomy object from the two-tier taxonomy cache by its
+    foreign key, instead of from a joined related object. Writes still go
+    through the nested serializer.
+
+    Subclasses set `taxonomy_cache`.
+    """
+
+    taxonomy_cache = None
+
+    def get_attribute(self, instance):
+        return getattr(instance, f"{self.source}_id")
+
+    def to_representation(self, pk):
+        return self.taxonomy_cache.get(pk)
+
+
+class CachedLocationSerializer(CachedTaxonomySerializerMixin, LocationSerializer):
+    """
+    Nested location read from the taxonomy cache. Existing locations are
+    matched on write rather than rejected.
+    """
+
+    taxonomy_cache = location_cache
+
+    def validate(self, attrs):
+        return attrs
+
+
+class CachedIndustrySerializer(CachedTaxonomySerializerMixin, IndustrySerializer):
+    """
+    Nested industry read from the taxonomy cache. Existing names are matched
+    on write rather than rejected, so the name is not validated as unique.
+    """
+
+    taxonomy_cache = industry_cache
+
+    class Meta(IndustrySerializer.Meta):
+        extra_kwargs = {"name": {"validators": []}}
+
+
+class CachedSkillListSerializer(serializers.ListSerializer):
+    """
+    Nested skills read from the taxonomy cache by the denormalized `skill_ids`
+    of a job posting, so job postings need no join or prefetch for their skills.
+    """
+
+    def get_attribute(self, instance):
+        return instance.skill_ids
+
+    def to_representation(self, skill_ids):
+        skills = skill_cache.get_many(skill_ids).values()
+        return sorted(skills, key=lambda skill: skill["name"])
+
+
+class CachedSkillSerializer(SkillSerializer):
+    """Nested skill, listed from the taxonomy cache and matched by name on write."""
+
+    class Meta(SkillSerializer.Meta):
+        list_serializer_class = CachedSkillListSerializer
+        extra_kwargs = {"name": {"validators": []}}
+
+
 class JobPostingSerializer(serializers.ModelSerializer):
     """
     Serializer for the JobPosting model with dynamic creation of related fields.
@@ -39,14 +147,19 @@ class JobPostingSerializer(serializers.ModelSerializer):
     Fields:
         - employer (PrimaryKeyRelatedField): Auto-assigned from request user.
         - location (LocationSerializer): Allows nested location creation.
+          Read from the taxonomy cache.
         - industry (IndustrySerializer): Allows nested industry creation.
+          Read from the taxonomy cache.
         - skills_required (SkillSerializer): Many-to-many relationship.
+          Read from the taxonomy cache by `skill_ids`.
+
+    Pass `fields` to serialize a subset of the fields.
     """
 
     employer = serializers.PrimaryKeyRelatedField(read_only=True)
-    location = LocationSerializer()
-    industry = IndustrySerializer()
-    skills_required = SkillSerializer(many=True)
+    location = CachedLocationSerializer()
+    industry = CachedIndustrySerializer()
+    skills_required = CachedSkillSerializer(many=True)
 
     class Meta:
         model = JobPosting
@@ -75,33 +188,96 @@ class JobPostingSerializer(serializers.ModelSerializer):
             "posted_at",
             "updated_at",
         ]
+        # Model fields read for a serializer field of another name
+        read_from = {"skills_required": ("skill_ids",)}
+
+    def __init__(self, *args, fields=None, **kwargs):
+        """
+        Arguments:
+        - **fields**: Names of the fields to serialize, or None for all of them
+        (see `job_listings.fieldsets`).
+        """
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def validate_currency(self, value):
+        """Store currency codes upper-case, as salary filters match them exactly."""
+        return value.strip().upper()
+
+    def resolve_taxonomy(self, validated_data):
+        """
+        Replace the nested location and industry in `validated_data` with their
+        rows, and pop the nested skills. Values are resolved set-based, so the
+        number of queries does not grow with the number of skills.
+
+        Returns the IDs of the skills, or None if they were not given.
+        """
+        if "location" in validated_data:
+            location = validated_data["location"]
+            validated_data["location"] = resolve_locations([location])[
+                location_key(location)
+            ]
+        if "industry" in validated_data:
+            name = validated_data["industry"]["name"]
+            validated_data["industry"] = resolve_names(Industry, [name])[name_key(name)]
+        if "skills_required" not in validated_data:
+            return None
+
+        names = [skill["name"] for skill in validated_data.pop("skills_required")]
+        skills = resolve_names(Skill, names)
+        return {skills[name_key(name)].pk for name in names}
 
     def create(self, validated_data):
         """Create a new job posting while ensuring related objects are properly handled."""
-        location_data = validated_data.pop("location")
-        industry_data = validated_data.pop("industry")
-        skills_data = validated_data.pop("skills_required", [])
-
-        # Get or create location
-        location, _ = Location.objects.get_or_create(
-            city=location_data["city"],
-            state_or_province=location_data.get("state_or_province", ""),
-            country=location_data["country"],
-        )
-
-        # Get or create industry
-        industry, _ = Industry.objects.get_or_create(name=industry_data["name"])
-
-        # Create job posting
-        job_posting = JobPosting.objects.create(
-            location=location, industry=industry, **validated_data
-        )
-
-        # Add skills (efficiently handling get_or_create)
-        skill_instances = []
-        for skill_data in skills_data:
-            skill, _ = Skill.objects.get_or_create(name=skill_data["name"])
-            skill_instances.append(skill)
-        job_posting.skills_required.set(skill_instances)
-
+        skill_ids = self.resolve_taxonomy(validated_data)
+        job_posting = JobPosting.objects.create(**validated_data)
+        set_job_skills(job_posting, skill_ids or [])
         return job_posting
+
+    def update(self, instance, validated_data):
+        """Update a job posting, resolving nested related objects like `create`."""
+        skill_ids = self.resolve_taxonomy(validated_data)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save()
+        if skill_ids is not None:
+            set_job_skills(instance, skill_ids)
+        return instance
+
+
+class JobPostingImportSerializer(JobPostingSerializer):
+    """
+    Validates one row of a bulk job posting import without querying the
+    database. Taxonomy values are resolved and postings created per chunk
+    by `job_listings.imports`, and slugs are always allocated.
+    """
+
+    skills_required = CachedSkillSerializer(many=True, required=False)
+
+    class Meta(JobPostingSerializer.Meta):
+        read_only_fields = JobPostingSerializer.Meta.read_only_fields + ["slug"]
+
+
+class JobPostingDocumentSerializer(JobPostingSerializer):
+    """
+    Serializes a job posting for its pre-rendered `JobPostingDocument`.
+
+    The output is identical to `JobPostingSerializer`, but nested values are
+    read from the database (`select_related` location and industry,
+    prefetched skills) rather than the taxonomy cache, which may not reflect
+    the change a document is being rebuilt for yet.
+    """
+
+    location = LocationSerializer(read_only=True)
+    industry = IndustrySerializer(read_only=True)
+    skills_required = serializers.SerializerMethodField()
+
+    def get_skills_required(self, instance):
+        """Return the skills ordered by name, like the taxonomy cache."""
+        skills = [
+            dict(SkillSerializer(skill).data)
+            for skill in instance.skills_required.all()
+        ]
+        return sorted(skills, key=lambda skill: skill["name"])
@@ -0,0 +1,216 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import Signal, receiver
+from .models import JobPosting, Location, Industry, Skill
+from .taxonomy import invalidate_taxonomy
+from .cache import (
+    GLOBAL_SCOPE,
+    TAXONOMY_SCOPE,
+    bump_generations,
+    invalidate_all_job_details,
+    invalidate_job_details,
+)
+
+# Sent once per expiry sweep with the `job_ids` of the deactivated postings
+job_postings_expired = Signal()
+
+# Lookup from each taxonomy model to the job postings that embed it
+TAXONOMY_LOOKUPS = {
+    Location: "location__in",
+    Industry: "industry__in",
+    Skill: "skills_required__in",
+}
+
+# Tables watched by the `job_listings_notify_change` trigger, mapped to
+# the taxonomy model they hold (None for tables keyed by job posting).
+NOTIFY_TABLES = {
+    JobPosting._meta.db_table: None,
+    JobPosting.skills_required.through._meta.db_table: None,
+    Location._meta.db_table: Location,
+    Industry._meta.db_table: Industry,
+    Skill._meta.db_table: Skill,
+}
+
+
+def affected_job_ids(model, pks):
+    """Return the IDs of job postings embedding the given taxonomy rows."""
+    return list(
+        JobPosting.objects.filter(**{TAXONOMY_LOOKUPS[model]: pks})
+        .order_by()
+        .values_list("pk", flat=True)
+        .distinct()
+    )
+
+
+def invalidate_on_commit(job_ids, taxonomy=False):
+    """
+    Invalidate the cached details of `job_ids` once the transaction commits,
+    so a concurrent request cannot re-cache the pre-commit state.
+    """
+
+    def invalidate():
+        invalidate_job_details(job_ids)
+        if taxonomy:
+            bump_generations([TAXONOMY_SCOPE])
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=JobPosting)
+@receiver(post_delete, sender=JobPosting)
+def job_posting_changed(sender, instance, **kwargs):
+    """Invalidate the cached detail of a saved, soft deleted or deleted job posting."""
+    invalidate_on_commit([instance.pk])
+
+
+@receiver(m2m_changed, sender=JobPosting.skills_required.through)
+def job_posting_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Invalidate the cached details of job postings whose skills changed, from
+    either side of the relation.
+    """
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if not reverse:
+        job_ids = [instance.pk]
+    elif action == "pre_clear":
+        # `pk_set` is not provided for clear(), collect the postings first
+        job_ids = affected_job_ids(Skill, [instance.pk])
+    else:
+        job_ids = list(pk_set)
+
+    invalidate_on_commit(job_ids)
+
+
+@receiver(m2m_changed, sender=JobPosting.skills_required.through)
+def job_posting_skill_ids_changed(sender, instance, action, reverse, **kwargs):
+    """
+    Reload `skill_ids` after the skills of an in-memory job posting changed.
+    The column itself is kept in sync by a database trigger on the M2M table.
+    """
+    if not reverse and action in ("post_add", "post_remove", "post_clear"):
+        instance.refresh_from_db(fields=["skill_ids"])
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_save, sender=Industry)
+@receiver(post_save, sender=Skill)
+def taxonomy_changed(sender, instance, created, **kwargs):
+    """
+    Invalidate the taxonomy cache after an industry, location or skill is
+    created or renamed, and job postings embedding a renamed row.
+    New rows are not embedded anywhere yet, they only change taxonomy lists.
+    """
+    if created:
+        transaction.on_commit(lambda: invalidate_taxonomy(sender))
+        return
+
+    invalidate_on_commit(affected_job_ids(sender, [instance.pk]), taxonomy=True)
+    transaction.on_commit(lambda: invalidate_taxonomy(sender, [instance.pk]))
+
+
+@receiver(pre_delete, sender=Location)
+@receiver(pre_delete, sender=Industry)
+@receiver(pre_delete, sender=Skill)
+def taxonomy_deleted(sender, instance, **kwargs):
+    """
+    Invalidate the taxonomy cache and job postings embedding a deleted industry,
+    location or skill. Collected before deletion, since `SET_NULL` and M2M
+    cascades send no signals.
+    """
+    invalidate_on_commit(affected_job_ids(sender, [instance.pk]), taxonomy=True)
+    transaction.on_commit(lambda: invalidate_taxonomy(sender, [instance.pk]))
+
+
+def previous_scopes(old_scopes):
+    """
+    Return the list scopes of the previous `employer_id` and `industry_id`
+    values reported in change notifications. A `None` value stands for too
+    many values to list, and selects every employer or industry.
+    """
+    employer_ids = old_scopes.get("employer_id", ())
+    if employer_ids is None:
+        employer_ids = (
+            get_user_model()
+            .objects.filter(role="employer")
+            .values_list("pk", flat=True)
+        )
+    industry_ids = old_scopes.get("industry_id", ())
+    if industry_ids is None:
+        industry_names = Industry.objects.values_list("name", flat=True)
+    elif industry_ids:
+        industry_names = Industry.objects.filter(pk__in=industry_ids).values_list(
+            "name", flat=True
+        )
+    else:
+        industry_names = ()
+
+    return [("employer", employer_id) for employer_id in employer_ids] + [
+        ("industry", name) for name in industry_names
+    ]
+
+
+def handle_change_notifications(payloads):
+    """
+    Invalidate caches for changes reported by the `job_listings_notify_change`
+    Postgres trigger. This covers writes that bypass model signals, such as
+    `QuerySet.update()`, `bulk_create()` and admin bulk actions.
+
+    Lists are invalidated for the rows' current employer and industry, and
+    for those they had before an update or delete (the `old` scopes), so a
+    posting moved to another industry also leaves the lists of its former one.
+
+    Arguments:
+    - **payloads**: Decoded notification payloads, each with the changed `table`
+    and the affected `ids` (`None` when too many rows changed to list them).
+    Job posting updates and deletes also carry the previous `employer_id` and
+    `industry_id` values under `old` (`None` when too many to list them).
+    """
+    job_ids = set()
+    taxonomy_ids = {}
+    old_scopes = {}
+    flush = False
+
+    for payload in payloads:
+        for column, scope_ids in (payload.get("old") or {}).items():
+            if scope_ids is None:
+                old_scopes[column] = None
+            elif old_scopes.get(column, ()) is not None:
+                old_scopes.setdefault(column, set()).update(scope_ids)
+
+        model = NOTIFY_TABLES.get(payload["table"])
+        if payload["ids"] is None:
+            flush = True
+            if model is not None:
+                invalidate_taxonomy(model, flush=True)
+        elif model is None:
+            job_ids.update(payload["ids"])
+        else:
+            taxonomy_ids.setdefault(model, set()).update(payload["ids"])
+
+    for model, pks in taxonomy_ids.items():
+        invalidate_taxonomy(model, pks)
+        job_ids.update(str(pk) for pk in affected_job_ids(model, pks))
+
+    # Writes that bypassed signals also bypassed list invalidation
+    job_postings = JobPosting.objects.order_by()
+    if not flush:
+        job_postings = job_postings.filter(pk__in=job_ids)
+    scopes = [GLOBAL_SCOPE]
+    if flush or taxonomy_ids:
+        scopes.append(TAXONOMY_SCOPE)
+    for employer_id, industry_name in job_postings.values_list(
+        "employer_id", "industry__name"
+    ).distinct():
+        scopes.append(("employer", employer_id))
+        if industry_name:
+            scopes.append(("industry", industry_name))
+    scopes.extend(previous_scopes(old_scopes))
+    bump_generations(scopes)
+
+    if flush:
+        invalidate_all_job_details()
+    else:
+        invalidate_job_details(job_ids)
@@ -0,0 +1,376 @@
+"""
+"Similar jobs": the nearest neighbours of each live job posting, precomputed
+offline so that `GET /api/jobs/{id}/similar/` is a single primary key lookup.
+
+Postings are encoded as TF-IDF vectors over the words of their title and
+description and their required skills (as `skill:<id>` terms). Title words and
+skills count twice. Terms found in a single posting cannot relate two postings
+and are dropped, as are terms too common to tell postings apart. Each vector
+keeps its `TERMS_PER_POSTING` heaviest terms and is normalized, so the dot
+product of two vectors is their cosine similarity.
+
+The vectors are held sparsely, by posting and by term. A batch of postings
+is scored at once by walking the postings of each of the batch's terms: only
+the pairs sharing a term are scored, and kept sparsely. Batches are cut so
+that the number of term products they compute stays under a budget, so memory
+does not grow with the number of postings. The `SIMILAR_COUNT` best of each
+posting are stored with their scores in `SimilarJobPostings`.
+
+The `build_similar_postings` task rebuilds the lists of new and updated
+postings, and merges their new scores into the lists of the other postings.
+Only the scoring and the writes are incremental: the TF-IDF matrix of every
+live posting is rebuilt on each run with postings to rebuild (runs without
+are skipped before the matrix is built). Document frequencies drift as
+postings come and go, so every list is rebuilt by a daily full run, which
+also drops the lists of postings no longer live.
+"""
+
+import re
+import numpy as np
+from django.db.models import F, Q
+from django.utils import timezone
+from .models import JobPosting, SimilarJobPostings
+from .recommendations import top_postings
+
+# Number of similar postings kept per posting
+SIMILAR_COUNT = 10
+
+# Number of postings scored against every live posting at once, at most
+SIMILAR_BATCH_SIZE = 64
+
+# Number of term products computed for a batch, at most. A posting over the
+# budget on its own is scored alone, which the document frequency caps bound
+# to `TERMS_PER_POSTING * MAX_DOCUMENT_FREQUENCY_CAP` products.
+SIMILAR_BATCH_PRODUCTS = 1_000_000
+
+# Number of heaviest terms kept in each posting's vector
+TERMS_PER_POSTING = 48
+
+# Terms found in more than this share of the postings are dropped, on boards
+# with enough postings for the share to exceed `MIN_DOCUMENT_FREQUENCY_CAP`.
+# Terms found in more than `MAX_DOCUMENT_FREQUENCY_CAP` postings are dropped
+# on any board, as each posting using them would be scored against them all.
+MAX_DOCUMENT_FREQUENCY = 0.2
+MIN_DOCUMENT_FREQUENCY_CAP = 50
+MAX_DOCUMENT_FREQUENCY_CAP = 20_000
+
+# Number of best-scored postings of each rebuilt posting whose lists it is
+# merged into, on incremental runs
+MERGE_CANDIDATES = 50
+
+# Weight of title words and skills, relative to description words
+TITLE_WEIGHT = 2
+SKILL_WEIGHT = 2
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+STOP_WORDS = frozenset("""
+    a about all also an and any are as at be been but by can do for from has
+    have if in into is it its may more must not of on or our out over per so
+    such than that the their them then there these they this to up us we
+    what when where which while who will with within without you your
+    """.split())
+
+
+def tokenize(text):
+    """Return the words of `text`: lowercase, stop words left out."""
+    return [
+        token
+        for token in TOKEN_PATTERN.findall((text or "").lower())
+        if token not in STOP_WORDS
+    ]
+
+
+def posting_terms(title, description, skill_ids):
+    """Return a dict of term to (weighted) count for a job posting."""
+    counts = {}
+    for terms, weight in (
+        (tokenize(title), TITLE_WEIGHT),
+        (tokenize(description), 1),
+        ([f"skill:{skill_id}" for skill_id in skill_ids], SKILL_WEIGHT),
+    ):
+        for term in terms:
+            counts[term] = counts.get(term, 0) + weight
+    return counts
+
+
+def ranges(pointers, selected):
+    """
+    Return `(owners, positions)` for the concatenated index ranges
+    `pointers[i]:pointers[i + 1]` of each `i` in `selected`: the position in
+    `selected` each index belongs to, and the index itself.
+    """
+    starts = pointers[selected]
+    lengths = pointers[selected + 1] - starts
+    owners = np.repeat(np.arange(len(selected)), lengths)
+    offsets = np.arange(lengths.sum()) - np.repeat(
+        np.cumsum(lengths) - lengths, lengths
+    )
+    return owners, np.repeat(starts, lengths) + offsets
+
+
+class TermMatrix:
+    """
+    The normalized TF-IDF vectors of the live job postings, newest first,
+    stored sparsely by posting (rows) and by term (columns).
+
+    **Attributes:**
+    - `job_ids`: Posting IDs, in row order.
+    - `index`: Dict of posting ID to row.
+    - `row_pointers`, `terms`, `weights`: The term indices and weights of row
+    `i` are at `row_pointers[i]:row_pointers[i + 1]`.
+    - `term_pointers`, `term_rows`, `term_weights`: The rows and weights of
+    term `t` are at `term_pointers[t]:term_pointers[t + 1]`.
+    - `products`: The number of term products computed to score each row.
+    """
+
+    def __init__(self, postings):
+        self.job_ids = []
+        vocabulary = {}
+        rows, terms, counts = [], [], []
+        for row, (job_id, title, description, skill_ids) in enumerate(postings):
+            self.job_ids.append(job_id)
+            for term, count in posting_terms(title, description, skill_ids).items():
+                rows.append(row)
+                terms.append(vocabulary.setdefault(term, len(vocabulary)))
+                counts.append(count)
+        self.index = {job_id: row for row, job_id in enumerate(self.job_ids)}
+
+        size = len(self.job_ids)
+        rows = np.array(rows, dtype=np.int64)
+        terms = np.array(terms, dtype=np.int64)
+        counts = np.array(counts, dtype=np.float64)
+
+        # Sublinear term frequency and smoothed inverse document frequency
+        frequencies = np.bincount(terms, minlength=len(vocabulary))
+        cap = min(
+            max(MAX_DOCUMENT_FREQUENCY * size, MIN_DOCUMENT_FREQUENCY_CAP),
+            MAX_DOCUMENT_FREQUENCY_CAP,
+        )
+        kept = (frequencies[terms] > 1) & (frequencies[terms] <= cap)
+        rows, terms, counts = rows[kept], terms[kept], counts[kept]
+        idf = np.log((1 + size) / (1 + frequencies)) + 1
+        weights = (1 + np.log(counts)) * idf[terms]
+
+        # Keep the heaviest terms of each row, by row
+        order = np.lexsort((-weights, rows))
+        rows, terms, weights = rows[order], terms[order], weights[order]
+        row_counts = np.bincount(rows, minlength=size)
+        starts = np.cumsum(row_counts) - row_counts
+        kept = np.arange(len(rows)) - starts[rows] < TERMS_PER_POSTING
+        rows, terms, weights = rows[kept], terms[kept], weights[kept]
+
+        norms = np.sqrt(np.bincount(rows, weights=weights**2, minlength=size))
+        weights = weights / np.maximum(norms, 1e-12)[rows]
+
+        self.row_pointers = np.concatenate(
+            ([0], np.cumsum(np.bincount(rows, minlength=size)))
+        )
+        self.terms, self.weights = terms, weights
+
+        order = np.argsort(terms, kind="stable")
+        self.term_pointers = np.concatenate(
+            ([0], np.cumsum(np.bincount(terms, minlength=len(vocabulary))))
+        )
+        self.term_rows, self.term_weights = rows[order], weights[order]
+        self.products = np.bincount(
+            rows, weights=np.diff(self.term_pointers)[terms], minlength=size
+        ).astype(np.int64)
+
+    @classmethod
+    def live(cls):
+        """Build the matrix of the live job postings."""
+        postings = (
+            JobPosting.objects.live()
+            .order_by("-posted_at", "pk")
+            .values_list("pk", "title", "description", "skill_ids")
+        )
+        return cls(postings.iterator(chunk_size=2000))
+
+    def batches(self, rows, batch_size=SIMILAR_BATCH_SIZE):
+        """
+        Yield `rows` in batches of at most `batch_size` rows, whose scoring
+        computes at most `SIMILAR_BATCH_PRODUCTS` term products.
+        """
+        batch, products = [], 0
+        for row in rows:
+            if batch and (
+                len(batch) == batch_size
+                or products + self.products[row] > SIMILAR_BATCH_PRODUCTS
+            ):
+                yield batch
+                batch, products = [], 0
+            batch.append(row)
+            products += self.products[row]
+        if batch:
+            yield batch
+
+    def similarities(self, rows):
+        """
+        Return the `Similarities` of the postings at `rows` with the other
+        postings. Only the pairs sharing a term are scored.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        size = len(self.job_ids)
+        owners, entries = ranges(self.row_pointers, rows)
+        term_owners, term_entries = ranges(self.term_pointers, self.terms[entries])
+        pairs, pair_products = np.unique(
+            owners[term_owners] * size + self.term_rows[term_entries],
+            return_inverse=True,
+        )
+        scores = np.bincount(
+            pair_products,
+            weights=self.weights[entries][term_owners]
+            * self.term_weights[term_entries],
+            minlength=len(pairs),
+        )
+        owners, neighbours = np.divmod(pairs, size)
+        kept = neighbours != rows[owners]
+        owners, neighbours, scores = owners[kept], neighbours[kept], scores[kept]
+        pointers = np.concatenate(
+            ([0], np.cumsum(np.bincount(owners, minlength=len(rows))))
+        )
+        return Similarities(pointers, neighbours, scores)
+
+    def neighbours(self, rows, scores, count=SIMILAR_COUNT):
+        """Return the `(job_ids, scores)` of the best `count` of `rows` by `scores`."""
+        top = top_postings(scores, count)
+        return [self.job_ids[rows[i]] for i in top], [float(scores[i]) for i in top]
+
+
+class Similarities:
+    """
+    The nonzero cosine similarities of a batch of postings with the other
+    postings, stored sparsely by position in the batch.
+
+    **Attributes:**
+    - `pointers`, `neighbours`, `scores`: The rows of the postings similar to
+    the `i`-th posting of the batch, in order, and their scores are at
+    `pointers[i]:pointers[i + 1]`.
+    """
+
+    def __init__(self, pointers, neighbours, scores):
+        self.pointers = pointers
+        self.neighbours = neighbours
+        self.scores = scores
+
+    def __getitem__(self, i):
+        """Return the `(rows, scores)` of the postings similar to the `i`-th."""
+        found = slice(self.pointers[i], self.pointers[i + 1])
+        return self.neighbours[found], self.scores[found]
+
+    def score(self, i, row):
+        """Return the similarity of the `i`-th posting with the one at `row`."""
+        start, end = self.pointers[i], self.pointers[i + 1]
+        position = start + np.searchsorted(self.neighbours[start:end], row)
+        if position < end and self.neighbours[position] == row:
+            return float(self.scores[position])
+        return 0.0
+
+
+def stale_postings():
+    """Return the IDs of the live job postings without an up-to-date list."""
+    return set(
+        JobPosting.objects.live()
+        .filter(Q(similar__isnull=True) | Q(similar__built_at__lt=F("updated_at")))
+        .values_list("pk", flat=True)
+    )
+
+
+def merge_neighbours(similar, job_ids, scores, count=SIMILAR_COUNT):
+    """
+    Replace the entries of `job_ids` in a stored list with their new `scores`
+    (dropping those scored zero), keeping the `count` best. Return whether the
+    list changed.
+    """
+    replaced = set(job_ids)
+    entries = [
+        (job_id, score)
+        for job_id, score in zip(similar.job_ids, similar.scores)
+        if job_id not in replaced
+    ]
+    entries += [(job_id, score) for job_id, score in zip(job_ids, scores) if score > 0]
+    entries = sorted(entries, key=lambda entry: -entry[1])[:count]
+    merged = [job_id for job_id, _ in entries], [score for _, score in entries]
+    if merged == (similar.job_ids, similar.scores):
+        return False
+    similar.job_ids, similar.scores = merged
+    return True
+
+
+def refresh_similar_postings(full=False, batch_size=SIMILAR_BATCH_SIZE):
+    """
+    Rebuild the similar posting lists of every live job posting with `full`,
+    or else of the new and updated ones only, `batch_size` postings at once.
+
+    Incremental runs also merge the new scores of the rebuilt postings into
+    the other postings' lists: those they now rank in, and those they are
+    listed in (found with the GIN index on `job_ids`).
+
+    Returns the number of postings whose list was rebuilt.
+    """
+    # Postings updated from now on are older than their list and rebuilt next time
+    built_at = timezone.now()
+    if not full:
+        stale = stale_postings()
+        if not stale:
+            return 0
+
+    matrix = TermMatrix.live()
+    if full:
+        rows = list(range(len(matrix.job_ids)))
+    else:
+        rows = sorted(matrix.index[pk] for pk in stale if pk in matrix.index)
+    targets = {matrix.job_ids[row] for row in rows}
+
+    for batch in matrix.batches(rows, batch_size):
+        similarities = matrix.similarities(batch)
+        rebuilt = []
+        for i, row in enumerate(batch):
+            job_ids, neighbour_scores = matrix.neighbours(*similarities[i])
+            rebuilt.append(
+                SimilarJobPostings(
+                    job_posting_id=matrix.job_ids[row],
+                    job_ids=job_ids,
+                    scores=neighbour_scores,
+                    built_at=built_at,
+                )
+            )
+        SimilarJobPostings.objects.bulk_create(
+            rebuilt,
+            update_conflicts=True,
+            unique_fields=["job_posting"],
+            update_fields=["job_ids", "scores", "built_at"],
+        )
+        if not full:
+            merge_batch(matrix, batch, similarities, targets)
+
+    if full:
+        SimilarJobPostings.objects.exclude(
+            job_posting__in=JobPosting.objects.live()
+        ).delete()
+    return len(rows)
+
+
+def merge_batch(matrix, batch, similarities, targets):
+    """
+    Merge the `similarities` of the rebuilt postings at rows `batch` into the
+    lists of the other postings (not in `targets`) they rank in or are listed in.
+    """
+    job_ids = [matrix.job_ids[row] for row in batch]
+    candidates = set()
+    for i in range(len(batch)):
+        candidates.update(matrix.neighbours(*similarities[i], MERGE_CANDIDATES)[0])
+    others = SimilarJobPostings.objects.filter(
+        Q(pk__in=candidates - targets) | Q(job_ids__overlap=job_ids)
+    )
+
+    changed = []
+    for similar in others:
+        row = matrix.index.get(similar.pk)
+        if similar.pk in targets or row is None:
+            continue
+        scores = [similarities.score(i, row) for i in range(len(batch))]
+        if merge_neighbours(similar, job_ids, scores):
+            changed.append(similar)
+    SimilarJobPostings.objects.bulk_update(changed, ["job_ids", "scores"])
@@ -0,0 +1,153 @@
+import logging
+from celery import shared_task
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import Industry, JobPosting
+from .signals import job_postings_expired
+from .cache import GLOBAL_SCOPE, bump_generations, invalidate_job_details
+from .documents import DOCUMENT_CHUNK_SIZE, build_documents, build_missing_documents
+from .recommendations import (
+    RECOMMENDATION_BATCH_SIZE,
+    PostingMatrix,
+    score_batch,
+    store_recommendations,
+)
+from .similar import SIMILAR_BATCH_SIZE, refresh_similar_postings
+
+logger = logging.getLogger(__name__)
+
+# Number of job postings deactivated per UPDATE statement (and transaction)
+EXPIRY_CHUNK_SIZE = 500
+
+
+@shared_task
+def deactivate_expired_postings(chunk_size=EXPIRY_CHUNK_SIZE):
+    """
+    Periodic task to deactivate active job postings past their expiration date.
+
+    Postings are deactivated in chunks of `chunk_size`, each in its own short
+    transaction, walking the `jobposting_live_expiry_idx` partial index. Rows
+    locked by a concurrent write are skipped and picked up on the next run.
+
+    The per-statement change notifications are skipped: the affected list
+    generations are bumped once at the end of the run, and a single
+    `job_postings_expired` signal is sent with all deactivated IDs.
+
+    Returns the number of deactivated job postings.
+    """
+    now = timezone.now()
+    expired = JobPosting.objects.filter(is_active=True, expiration_date__lt=now)
+    job_ids = []
+    employer_ids = set()
+    industry_ids = set()
+
+    while True:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL job_listings.skip_notify = 'on'")
+            chunk = list(
+                expired.order_by("expiration_date")
+                .select_for_update(skip_locked=True)
+                .values_list("pk", "employer_id", "industry_id")[:chunk_size]
+            )
+            chunk_ids = [pk for pk, _, _ in chunk]
+            JobPosting.objects.filter(pk__in=chunk_ids).update(
+                is_active=False, updated_at=now
+            )
+
+        invalidate_job_details(chunk_ids)
+        for pk, employer_id, industry_id in chunk:
+            job_ids.append(pk)
+            employer_ids.add(employer_id)
+            if industry_id:
+                industry_ids.add(industry_id)
+        if len(chunk) < chunk_size:
+            break
+
+    if not job_ids:
+        return 0
+
+    industry_names = Industry.objects.filter(pk__in=industry_ids).values_list(
+        "name", flat=True
+    )
+    bump_generations(
+        [GLOBAL_SCOPE]
+        + [("employer", employer_id) for employer_id in employer_ids]
+        + [("industry", name) for name in industry_names]
+    )
+    job_postings_expired.send(sender=JobPosting, job_ids=job_ids)
+    schedule_document_build()
+    logger.info("Deactivated %d expired job postings", len(job_ids))
+    return len(job_ids)
+
+
+@shared_task
+def build_job_documents(job_ids=None, chunk_size=DOCUMENT_CHUNK_SIZE):
+    """
+    Builds the pre-rendered JSON documents of job postings, see
+    `job_listings.documents`.
+
+    Builds the documents of the given `job_ids`, or, if None, of every job
+    posting without one, `chunk_size` postings per transaction.
+
+    Returns the number of documents built.
+    """
+    if job_ids is None:
+        built = build_missing_documents(chunk_size)
+    else:
+        built = sum(
+            build_documents(job_ids[start : start + chunk_size])
+            for start in range(0, len(job_ids), chunk_size)
+        )
+    logger.info("Built %d job posting documents", built)
+    return built
+
+
+@shared_task
+def refresh_recommendations(batch_size=RECOMMENDATION_BATCH_SIZE):
+    """
+    Periodic task to recompute the recommended job postings of every
+    jobseeker who applied to a posting, see `job_listings.recommendations`.
+
+    The live postings are encoded once, then jobseekers are scored in batches
+    of `batch_size`, with one matrix product per batch.
+
+    Returns the number of jobseekers scored.
+    """
+    user_ids = list(
+        get_user_model()
+        .objects.filter(role="jobseeker", applications__isnull=False)
+        .distinct()
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    matrix = PostingMatrix.live()
+    for start in range(0, len(user_ids), batch_size):
+        store_recommendations(score_batch(user_ids[start : start + batch_size], matrix))
+    logger.info("Refreshed the recommendations of %d jobseekers", len(user_ids))
+    return len(user_ids)
+
+
+@shared_task
+def build_similar_postings(full=False, batch_size=SIMILAR_BATCH_SIZE):
+    """
+    Periodic task to precompute the similar postings of the live job postings,
+    see `job_listings.similar`.
+
+    Incremental runs rebuild the lists of new and updated postings only, and
+    merge their scores into the other lists. A `full` run rebuilds every list
+    and deletes those of postings no longer live.
+
+    Returns the number of job postings whose list was rebuilt.
+    """
+    rebuilt = refresh_similar_postings(full, batch_size)
+    logger.info("Rebuilt the similar postings of %d job postings", rebuilt)
+    return rebuilt
+
+
+def schedule_document_build(job_ids=None):
+    """
+    Enqueues `build_job_documents` once the current transaction commits.
+    """
+    transaction.on_commit(lambda: build_job_documents.delay(job_ids))
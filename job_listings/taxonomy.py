@@ -0,0 +1,366 @@
+"""
+Two-tier cache for the `Industry`, `Location` and `Skill` taxonomies.
+
+- **L1**: A bounded, per-process LRU with a short TTL. Hits cost no network
+  round trip at all.
+- **L2**: The Redis `default` cache, shared by every worker.
+
+Writers invalidate L2 by bumping the generations its keys embed (see
+`job_listings.cache`), so a row loaded before a change and cached after it
+lands on a dead key, and publish the change on a Redis pub/sub channel. Every process runs a subscriber thread that evicts its own L1
+entries, so renames and new rows become visible across all gunicorn workers
+without waiting for the L1 TTL. The TTL only bounds staleness if a message
+is missed (e.g. while Redis is reconnecting).
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from redis.exceptions import RedisError
+from .cache import KEY_PREFIX, bump_generations, get_generations, versioned_key
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = f"{KEY_PREFIX}:taxonomy"
+
+# Bounds for each per-process L1 cache
+L1_MAXSIZE = 10_000
+L1_TTL = 300
+
+# Timeout (in seconds) for L2 entries, and for the generations of single rows.
+# They are invalidated explicitly.
+L2_TIMEOUT = 60 * 60 * 6
+
+# Taxonomy caches by model label, used to evict L1 entries on invalidation
+registry = {}
+
+
+class LocalCache:
+    """
+    A thread-safe, in-process LRU cache with a maximum size and a TTL.
+
+    **Attributes:**
+    - `maxsize`: (int) Maximum number of entries before the least recently
+    used one is evicted.
+    - `ttl`: (float) Seconds an entry stays valid after it is set.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for `key`, or None if missing or expired."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+
+            value, expires_at = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Cache `value` under `key`, evicting the least recently used entry if full."""
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        """Remove `key` from the cache."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._data.clear()
+
+
+class TaxonomyCache:
+    """
+    Two-tier cache of serialized taxonomy rows and list responses for one model.
+
+    **Attributes:**
+    - `model`: The taxonomy model (`Industry`, `Location` or `Skill`).
+    - `serializer_class`: Serializer used to build the cached representation.
+    - `rows`: L1 cache of serialized rows, by primary key.
+    - `lists`: L1 cache of list response data, by request parameters.
+    - `keys`: L1 cache of model instances by normalized natural key, used to
+    resolve written values to rows (see `job_listings.resolvers`).
+    """
+
+    def __init__(self, model, serializer_class):
+        self.model = model
+        self.serializer_class = serializer_class
+        self.label = model._meta.model_name
+        self.rows = LocalCache(L1_MAXSIZE, L1_TTL)
+        self.lists = LocalCache(L1_MAXSIZE, L1_TTL)
+        self.keys = LocalCache(L1_MAXSIZE, L1_TTL)
+        registry[self.label] = self
+
+    def get(self, pk):
+        """
+        Return the serialized row for `pk`, or None if it does not exist.
+
+        Looks in L1, then L2, then the database, filling the faster tiers.
+        """
+        ensure_subscribed()
+        pk = str(pk)
+
+        data = self.rows.get(pk)
+        if data is not None:
+            return data
+
+        l2_key = row_cache_key(self.label, pk)
+        data = cache.get(l2_key)
+        if data is None:
+            try:
+                instance = self.model.objects.filter(pk=pk).first()
+            except (ValidationError, ValueError):
+                return None
+            if instance is None:
+                return None
+
+            data = dict(self.serializer_class(instance).data)
+            cache.set(l2_key, data, timeout=L2_TIMEOUT)
+
+        self.rows.set(pk, data)
+        return data
+
+    def get_many(self, pks):
+        """
+        Return the serialized rows for `pks` by primary key, omitting missing rows.
+
+        Each tier is queried once for all the rows it is missing, so a cold read
+        costs one database query and a fixed number of Redis round trips (the
+        rows' generations, then the rows).
+        """
+        ensure_subscribed()
+        pks = [str(pk) for pk in pks]
+
+        found = {}
+        for pk in pks:
+            data = self.rows.get(pk)
+            if data is not None:
+                found[pk] = data
+
+        missing = [pk for pk in pks if pk not in found]
+        if not missing:
+            return found
+
+        l2_keys = dict(zip(row_cache_keys(self.label, missing), missing))
+        loaded = {
+            l2_keys[l2_key]: data
+            for l2_key, data in cache.get_many(list(l2_keys)).items()
+        }
+
+        missing = [pk for pk in missing if pk not in loaded]
+        if missing:
+            from_db = {
+                str(instance.pk): dict(self.serializer_class(instance).data)
+                for instance in self.model.objects.filter(pk__in=missing)
+            }
+            # Filled under the keys read before loading, dead if rows changed since
+            pk_keys = {pk: l2_key for l2_key, pk in l2_keys.items()}
+            cache.set_many(
+                {pk_keys[pk]: data for pk, data in from_db.items()},
+                timeout=L2_TIMEOUT,
+            )
+            loaded.update(from_db)
+
+        for pk, data in loaded.items():
+            self.rows.set(pk, data)
+        found.update(loaded)
+        return found
+
+    def get_list(self, key, loader):
+        """
+        Return cached list response data for `key`, calling `loader` on a miss.
+
+        Arguments:
+        - **key**: Hashable description of the request (e.g. canonical params).
+        - **loader**: Callable returning the response data to cache, or None
+        if the data must not be cached.
+        """
+        ensure_subscribed()
+
+        data = self.lists.get(key)
+        if data is not None:
+            return data
+
+        l2_key = versioned_key(
+            f"taxonomy-{self.label}", [("taxonomy", self.label)], key
+        )
+        data = cache.get(l2_key)
+        if data is None:
+            data = loader()
+            if data is None:
+                return None
+            cache.set(l2_key, data, timeout=L2_TIMEOUT)
+
+        self.lists.set(key, data)
+        return data
+
+    def evict(self, pk=None):
+        """
+        Evict this process's L1 entries after a change. Lists are always evicted;
+        rows only for the changed `pk`, or all of them if `pk` is None.
+        Instances cached by key are all evicted, as their keys are unknown.
+        """
+        if pk is None:
+            self.rows.clear()
+        else:
+            self.rows.pop(str(pk))
+        self.keys.clear()
+        self.lists.clear()
+
+
+def row_scope(label, pk):
+    """Return the generation scope of a single cached taxonomy row."""
+    return ("taxonomy", label, "row", pk)
+
+
+def row_cache_key(label, pk):
+    """
+    Return the L2 cache key of a serialized taxonomy row. Keys are versioned
+    so that every row of a model can be flushed at once, and each row on its
+    own when it changes.
+    """
+    (key,) = row_cache_keys(label, [pk])
+    return key
+
+
+def row_cache_keys(label, pks):
+    """Return the L2 cache keys of several taxonomy rows, in order."""
+    pks = [str(pk).lower() for pk in pks]
+    (generation,) = get_generations([("taxonomy", label, "rows")])
+    row_generations = get_generations(
+        [row_scope(label, pk) for pk in pks], timeout=L2_TIMEOUT
+    )
+    return [
+        f"{KEY_PREFIX}:taxonomy:{label}:{generation}.{row_generation}:{pk}"
+        for pk, row_generation in zip(pks, row_generations)
+    ]
+
+
+def invalidate_taxonomy(model, pks=None, flush=False):
+    """
+    Invalidate cached taxonomy data of `model` in every process.
+
+    Arguments:
+    - **model**: The changed taxonomy model.
+    - **pks**: Primary keys of renamed or deleted rows. Omit for new rows,
+    which only change the lists.
+    - **flush**: Invalidate every row of the model, when the changed rows
+    are unknown.
+    """
+    label = model._meta.model_name
+    pks = [str(pk) for pk in pks or []]
+
+    scopes = [("taxonomy", label)]
+    if flush:
+        scopes.append(("taxonomy", label, "rows"))
+    elif pks:
+        bump_generations([row_scope(label, pk) for pk in pks], timeout=L2_TIMEOUT)
+    bump_generations(scopes)
+
+    message = {"model": label, "pks": pks, "flush": flush}
+    evict_local(message)
+    publish(message)
+
+
+def publish(message):
+    """Publish an invalidation message to every process."""
+    try:
+        from django_redis import get_redis_connection
+
+        get_redis_connection("default").publish(
+            INVALIDATION_CHANNEL, json.dumps(message)
+        )
+    except (NotImplementedError, RedisError):
+        # Not backed by Redis, or Redis is unavailable: L1 TTL bounds staleness
+        logger.warning("Could not publish taxonomy cache invalidation.")
+
+
+def evict_local(message):
+    """Evict this process's L1 entries named by an invalidation message."""
+    local_cache = registry.get(message["model"])
+    if local_cache is None:
+        return
+
+    if message["flush"]:
+        local_cache.evict()
+    elif message["pks"]:
+        for pk in message["pks"]:
+            local_cache.evict(pk)
+    else:
+        local_cache.lists.clear()
+
+
+_subscriber_pid = None
+_subscriber_lock = threading.Lock()
+
+
+def ensure_subscribed():
+    """
+    Start this process's invalidation subscriber thread, once per process.
+    The PID check restarts it in workers forked after it was started.
+    """
+    global _subscriber_pid
+
+    if _subscriber_pid == os.getpid():
+        return
+
+    with _subscriber_lock:
+        if _subscriber_pid == os.getpid():
+            return
+        _subscriber_pid = os.getpid()
+
+        thread = threading.Thread(
+            target=_listen, name="taxonomy-cache-invalidation", daemon=True
+        )
+        thread.start()
+
+
+def _evict_all():
+    for local_cache in registry.values():
+        local_cache.evict()
+
+
+def _listen():
+    """Subscribe to invalidation messages and evict L1 entries, forever."""
+    try:
+        from django_redis import get_redis_connection
+
+        connection = get_redis_connection("default")
+    except NotImplementedError:
+        return
+
+    reconnecting = False
+    while True:
+        try:
+            pubsub = connection.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+            if reconnecting:
+                # Messages may have been missed while disconnected
+                _evict_all()
+            for message in pubsub.listen():
+                evict_local(json.loads(message["data"]))
+        except RedisError:
+            logger.warning("Taxonomy cache subscriber disconnected, retrying.")
+            reconnecting = True
+            time.sleep(1)
@@ -9,7 +9,7 @@ class IndustryFactory(factory.django.DjangoModelFactory):
         model = Industry
         skip_postgeneration_save = True
 
-    name = factory.Faker("word")
+    name = factory.Sequence(lambda n: f"industry-{n}")
 
 
 class LocationFactory(factory.django.DjangoModelFactory):
@@ -32,7 +32,7 @@ class SkillFactory(factory.django.DjangoModelFactory):
         model = Skill
         skip_postgeneration_save = True
 
-    name = factory.Faker("word")
+    name = factory.Sequence(lambda n: f"skill-{n}")
 
 
 class JobListingFactory(factory.django.DjangoModelFactory):
@@ -49,5 +49,13 @@ class JobListingFactory(factory.django.DjangoModelFactory):
     job_type = "full-time"
     location = factory.SubFactory(LocationFactory)
     industry = factory.SubFactory(IndustryFactory)
-    skills_required = factory.RelatedFactoryList(SkillFactory, "job_postings", size=3)
     expiration_date = factory.Faker("date_this_year")
+
+    @factory.post_generation
+    def skills_required(self, create, extracted, **kwargs):
+        """Attach the given skills, or three generated ones by default."""
+        if not create:
+            return
+        if extracted is None:
+            extracted = SkillFactory.create_batch(3)
+        self.skills_required.set(extracted)
@@ -0,0 +1,107 @@
+import uuid
+import pytest
+from django.core.cache import cache
+from django.contrib.auth.models import AnonymousUser
+from job_listings.cache import (
+    GLOBAL_SCOPE,
+    TAXONOMY_SCOPE,
+    bump_generations,
+    detail_cache_keys,
+    generation_key,
+    get_generations,
+    id_window_scopes,
+    invalidate_job_details,
+    list_scopes,
+    pack_ids,
+    posting_scopes,
+    unpack_ids,
+    versioned_key,
+)
+
+
+def test_generation_is_initialized_once():
+    """Test that a missing generation is seeded and then stays stable."""
+    first = get_generations([GLOBAL_SCOPE])
+    assert first == get_generations([GLOBAL_SCOPE])
+    assert cache.get(generation_key(*GLOBAL_SCOPE)) == first[0]
+
+
+def test_bump_invalidates_dependent_keys_only():
+    """Test that bumping a scope changes only keys depending on it."""
+    employer_scope = ("employer", "e1")
+    global_key = versioned_key("ids", [GLOBAL_SCOPE], "all")
+    employer_key = versioned_key("ids", [employer_scope], "all")
+
+    bump_generations([GLOBAL_SCOPE])
+
+    assert versioned_key("ids", [GLOBAL_SCOPE], "all") != global_key
+    assert versioned_key("ids", [employer_scope], "all") == employer_key
+
+
+def test_bump_initializes_missing_generation():
+    """Test that bumping an unknown scope does not raise."""
+    bump_generations([("industry", "Finance")])
+    assert cache.get(generation_key("industry", "finance")) is not None
+
+
+def test_industry_scope_is_case_insensitive():
+    """Test that taxonomy values are normalized into a single generation."""
+    assert generation_key("industry", " Finance") == generation_key(
+        "industry", "finance"
+    )
+
+
+@pytest.mark.django_db
+def test_list_scopes(employer_user, jobseeker_user):
+    """Test that lists depend on the narrowest scope guaranteed by the request."""
+    assert list_scopes(AnonymousUser(), {}) == [GLOBAL_SCOPE, TAXONOMY_SCOPE]
+    assert list_scopes(jobseeker_user, {"industry": "Finance"}) == [
+        ("industry", "Finance"),
+        TAXONOMY_SCOPE,
+    ]
+    assert list_scopes(employer_user, {"industry": "Finance"}) == [
+        ("employer", employer_user.pk),
+        TAXONOMY_SCOPE,
+    ]
+
+
+@pytest.mark.django_db
+def test_posting_scopes(job_listing):
+    """Test that a posting write affects the global, employer and industry scopes."""
+    assert posting_scopes(job_listing) == [
+        GLOBAL_SCOPE,
+        ("employer", job_listing.employer_id),
+        ("industry", "NewTechnology"),
+    ]
+
+
+def test_late_detail_fill_is_unreachable():
+    """Test that a detail cached after its invalidation is not served."""
+    job_ids = [uuid.uuid4(), uuid.uuid4()]
+    stale_key, other_key = detail_cache_keys(job_ids)
+
+    invalidate_job_details(job_ids[:1])
+    cache.set(stale_key, {"data": "stale"})
+
+    key, unchanged_key = detail_cache_keys(job_ids)
+    assert key != stale_key
+    assert cache.get(key) is None
+    assert unchanged_key == other_key
+
+
+def test_pack_ids_round_trip():
+    """Test that packed IDs take 16 bytes each and unpack in order."""
+    ids = [uuid.uuid4() for _ in range(3)]
+    packed = pack_ids(ids)
+
+    assert len(packed) == 48
+    assert unpack_ids(packed) == ids
+
+
+def test_id_window_scopes_ignore_taxonomy_unless_filtered():
+    """Test that ID windows only depend on taxonomy when filtering by taxonomy names."""
+    assert id_window_scopes(AnonymousUser(), {"search": "python"}) == [GLOBAL_SCOPE]
+    assert id_window_scopes(AnonymousUser(), {"location_city": "Paris"}) == [
+        GLOBAL_SCOPE,
+        TAXONOMY_SCOPE,
+    ]
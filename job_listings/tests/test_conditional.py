@@ -0,0 +1,170 @@
+import pytest
+from datetime import timedelta
+from unittest import mock
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from rest_framework import status
+from job_listings.serializers import JobPostingSerializer
+from job_listings.cache import KEY_PREFIX, invalidate_job_details
+from job_listings.tests.factories import JobListingFactory
+
+URL = reverse("job-list")
+
+
+@pytest.fixture
+def postings(employer_user):
+    return JobListingFactory.create_batch(
+        3,
+        employer=employer_user,
+        expiration_date=timezone.now() + timedelta(days=30),
+    )
+
+
+def posting_queries(queries):
+    """Return the SQL of the queries reading job postings."""
+    return [
+        query["sql"]
+        for query in queries
+        if 'FROM "job_listings_jobposting"' in query["sql"]
+    ]
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    def test_list_not_modified(self, api_client, postings):
+        """Test that a list with a matching ETag is a 304 without loading postings."""
+        response = api_client.get(URL)
+        etag = response["ETag"]
+        newest = max(job.updated_at for job in postings)
+        assert response["Last-Modified"] == newest.strftime("%a, %d %b %Y %H:%M:%S GMT")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(URL, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response["ETag"] == etag
+        assert posting_queries(queries) == []
+
+    def test_list_validators_without_aggregates(self, api_client, postings):
+        """Test that only page-number lists count postings, for their own page."""
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(URL, {"pagination": "cursor"})
+        assert not any(
+            "COUNT(" in sql or "MAX(" in sql for sql in posting_queries(queries)
+        )
+        assert response["Last-Modified"]
+
+        # Validators recomputed on a response cache miss are the same
+        cache.delete_pattern(f"{KEY_PREFIX}:page:*")
+        assert (
+            api_client.get(
+                URL, {"pagination": "cursor"}, HTTP_IF_NONE_MATCH=response["ETag"]
+            ).status_code
+            == status.HTTP_304_NOT_MODIFIED
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            api_client.get(URL)
+        aggregates = [
+            sql for sql in posting_queries(queries) if "COUNT(" in sql or "MAX(" in sql
+        ]
+        assert len(aggregates) == 1 and "COUNT(" in aggregates[0]
+
+    def test_list_etag_varies_with_request(self, api_client, postings):
+        """Test that pages and field selections have their own ETags."""
+        etags = {
+            api_client.get(URL, params)["ETag"]
+            for params in ({}, {"page_size": 2}, {"profile": "card"})
+        }
+        assert len(etags) == 3
+
+    def test_list_modified_after_update(self, api_client, employer_user, postings):
+        """Test that an update changes the list's ETag."""
+        etag = api_client.get(URL)["ETag"]
+        api_client.force_authenticate(user=employer_user)
+        api_client.patch(
+            reverse("job-detail", args=[postings[0].pk]), {"title": "Renamed"}
+        )
+        api_client.force_authenticate(user=None)
+
+        response = api_client.get(URL, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+
+    def test_list_if_modified_since(self, api_client, postings):
+        """Test that a list unchanged since a date is a 304."""
+        last_modified = api_client.get(URL)["Last-Modified"]
+
+        response = api_client.get(URL, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_detail_not_modified_without_serializing(self, api_client, postings):
+        """Test that a cached detail with a matching ETag is not serialized."""
+        url = reverse("job-detail", args=[postings[0].pk])
+        etag = api_client.get(url)["ETag"]
+
+        with mock.patch.object(
+            JobPostingSerializer, "to_representation"
+        ) as to_representation:
+            cached = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not to_representation.called
+
+        # An unchanged posting keeps its ETag once it is serialized again
+        invalidate_job_details([postings[0].pk])
+        uncached = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert uncached.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_detail_modified_after_taxonomy_rename(
+        self, api_client, postings, django_capture_on_commit_callbacks
+    ):
+        """Test that renaming a posting's industry changes the detail's ETag."""
+        job = postings[0]
+        url = reverse("job-detail", args=[job.pk])
+        etag = api_client.get(url)["ETag"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            job.industry.name = "Renamed industry"
+            job.industry.save()
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+        assert response.json()["industry"]["name"] == "Renamed industry"
+
+    def test_detail_etag_varies_with_fields_and_updates(
+        self, api_client, employer_user, postings, django_capture_on_commit_callbacks
+    ):
+        """Test that field selections and updates change the detail's ETag."""
+        url = reverse("job-detail", args=[postings[0].pk])
+        etag = api_client.get(url)["ETag"]
+        assert api_client.get(url, {"fields": "title"})["ETag"] != etag
+
+        api_client.force_authenticate(user=employer_user)
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.patch(url, {"title": "Renamed"})
+        api_client.force_authenticate(user=None)
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["title"] == "Renamed"
+
+    def test_detail_visibility_checked_first(self, api_client, postings):
+        """Test that an expired posting is not confirmed to anonymous users."""
+        job = postings[0]
+        url = reverse("job-detail", args=[job.pk])
+        etag = api_client.get(url)["ETag"]
+        job.expiration_date = timezone.now() - timedelta(days=1)
+        job.save()
+        invalidate_job_details([job.pk])
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,151 @@
+import pytest
+from datetime import timedelta
+from unittest import mock
+from django.urls import reverse
+from django.utils import timezone
+from django.core.cache import cache
+from rest_framework import status
+from job_listings.models import JobPosting, JobPostingDocument
+from job_listings.documents import build_documents, documents_to_build
+from job_listings.serializers import JobPostingSerializer
+from job_listings.tasks import build_job_documents
+from job_listings.views import JobPostingViewSet
+from .factories import JobListingFactory, SkillFactory
+
+URL = reverse("job-list")
+
+
+@pytest.fixture
+def postings(employer_user):
+    return JobListingFactory.create_batch(
+        3,
+        employer=employer_user,
+        expiration_date=timezone.now() + timedelta(days=30),
+    )
+
+
+def document_ids():
+    return set(JobPostingDocument.objects.values_list("pk", flat=True))
+
+
+@pytest.mark.django_db
+class TestBuildDocuments:
+    def test_task_builds_missing_documents(self, postings):
+        """Test that the sweep builds a document for every posting without one."""
+        assert build_job_documents() == 3
+        assert document_ids() == {job.pk for job in postings}
+        assert build_job_documents() == 0
+
+    def test_document_matches_serializer(self, api_client, postings):
+        """Test that a stitched list is byte for byte the serialized list."""
+        page = {"page_size": 2, "ordering": "-posted_at"}
+        with mock.patch.object(JobPostingViewSet, "can_stitch", return_value=False):
+            serialized = api_client.get(URL, page).content
+
+        build_job_documents()
+        cache.clear()
+        response = api_client.get(URL, page)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/json"
+        assert response.content == serialized
+
+    def test_documents_to_build(self):
+        """Test that posting changes rebuild their documents, others sweep."""
+        payloads = [
+            {"table": "job_listings_jobposting", "ids": ["b", "a"]},
+            {"table": "job_listings_jobposting_skills_required", "ids": ["a"]},
+        ]
+        assert documents_to_build(payloads) == ["a", "b"]
+        assert (
+            documents_to_build(
+                payloads + [{"table": "job_listings_skill", "ids": ["1"]}]
+            )
+            is None
+        )
+        assert (
+            documents_to_build([{"table": "job_listings_jobposting", "ids": None}])
+            is None
+        )
+
+
+@pytest.mark.django_db
+class TestDocumentInvalidation:
+    @pytest.fixture
+    def job(self, postings):
+        build_documents([job.pk for job in postings])
+        return postings[0]
+
+    def test_posting_update_drops_document(self, job, postings):
+        """Test that updating a posting, even with `QuerySet.update`, drops its document."""
+        JobPosting.objects.filter(pk=job.pk).update(title="Renamed")
+        assert document_ids() == {other.pk for other in postings[1:]}
+
+    def test_skill_change_drops_document(self, job, postings):
+        """Test that adding a skill to a posting drops its document."""
+        job.skills_required.add(SkillFactory())
+        assert job.pk not in document_ids()
+
+    def test_taxonomy_rename_drops_documents(self, job, postings):
+        """Test that renaming a posting's industry or skill drops its document."""
+        job.industry.name = "Renamed industry"
+        job.industry.save()
+        assert job.pk not in document_ids()
+
+        build_documents([job.pk])
+        skill = job.skills_required.first()
+        skill.name = "Renamed skill"
+        skill.save()
+        assert job.pk not in document_ids()
+
+    def test_delete_drops_document(self, job):
+        """Test that deleting a posting deletes its document."""
+        job.delete()
+        assert job.pk not in document_ids()
+
+
+@pytest.mark.django_db
+class TestStitchedList:
+    def test_serializes_postings_without_document(self, api_client, postings):
+        """Test that only postings without a document are serialized."""
+        build_documents([job.pk for job in postings[1:]])
+
+        with mock.patch.object(
+            JobPostingSerializer,
+            "to_representation",
+            autospec=True,
+            side_effect=JobPostingSerializer.to_representation,
+        ) as to_representation:
+            response = api_client.get(URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [job["job_id"] for job in response.json()["results"]] == [
+            str(job.pk)
+            for job in sorted(postings, key=lambda job: job.posted_at, reverse=True)
+        ]
+        assert [call.args[1].pk for call in to_representation.call_args_list] == [
+            postings[0].pk
+        ]
+
+    def test_page_is_read_in_one_query(
+        self, api_client, postings, django_assert_num_queries
+    ):
+        """Test that a page with documents is read without loading postings."""
+        build_job_documents()
+        api_client.get(URL)
+
+        # Uncached page: one query for the count, one for the page's documents
+        with django_assert_num_queries(2):
+            response = api_client.get(URL, {"page_size": 10})
+
+        assert response.json()["count"] == 3
+
+    def test_sparse_fieldsets_are_serialized(self, api_client, postings):
+        """Test that field selections are not served from documents."""
+        build_documents([job.pk for job in postings])
+
+        response = api_client.get(URL, {"fields": "job_id,title"})
+
+        assert all(
+            set(job) == {"job_id", "title"} for job in response.json()["results"]
+        )
@@ -0,0 +1,116 @@
+import io
+import csv
+import json
+import pytest
+from datetime import timedelta
+from django.urls import reverse
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from rest_framework import status
+from job_listings.models import JobPosting
+from job_listings.exports import export_job_postings
+from job_listings.imports import csv_rows
+from job_listings.tests.factories import (
+    IndustryFactory,
+    JobListingFactory,
+    LocationFactory,
+    SkillFactory,
+)
+
+URL = reverse("job-export")
+
+
+@pytest.fixture
+def postings(employer_user):
+    """Live postings sharing a location, an industry and two skills."""
+    location = LocationFactory(city="Gotham", country="Freedonia")
+    industry = IndustryFactory(name="Exports")
+    skills = [SkillFactory(name="Kotlin"), SkillFactory(name="Koa")]
+
+    def create(count, **kwargs):
+        kwargs.setdefault("expiration_date", timezone.now() + timedelta(days=30))
+        return JobListingFactory.create_batch(
+            count,
+            employer=employer_user,
+            location=location,
+            industry=industry,
+            skills_required=skills,
+            **kwargs,
+        )
+
+    return create
+
+
+def streamed(response):
+    assert response.streaming
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestJobPostingExport:
+    def test_ndjson_export(self, api_client, postings):
+        """Test that live postings are streamed one per line, shaped like the list."""
+        live = postings(3)
+        postings(2, expiration_date=timezone.now() - timedelta(days=1))
+
+        response = api_client.get(URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/x-ndjson"
+        assert "jobs.ndjson" in response["Content-Disposition"]
+        records = [json.loads(line) for line in streamed(response).splitlines()]
+        assert {record["job_id"] for record in records} == {str(job.pk) for job in live}
+        assert records[0]["location"]["city"] == "Gotham"
+        assert records[0]["industry"]["name"] == "Exports"
+        assert [skill["name"] for skill in records[0]["skills_required"]] == [
+            "Koa",
+            "Kotlin",
+        ]
+
+    def test_csv_export_can_be_imported(self, api_client, postings):
+        """Test that CSV exports use the bulk import columns."""
+        postings(1, job_type="contract", title="CSV Engineer")
+        postings(1, job_type="full-time")
+
+        response = api_client.get(URL, {"format": "csv", "job_type": "contract"})
+
+        assert response["Content-Type"] == "text/csv; charset=utf-8"
+        lines = streamed(response).encode().splitlines(keepends=True)
+        ((row_number, row, error),) = csv_rows(lines)
+        assert row["title"] == "CSV Engineer"
+        assert row["location"]["city"] == "Gotham"
+        assert row["location"]["country"] == "Freedonia"
+        assert row["industry"] == {"name": "Exports"}
+        assert row["skills_required"] == [{"name": "Koa"}, {"name": "Kotlin"}]
+
+    def test_csv_export_negotiated_by_accept(self, api_client, postings):
+        """Test that the format can be chosen with the Accept header."""
+        postings(2)
+
+        response = api_client.get(URL, HTTP_ACCEPT="text/csv")
+
+        assert response["Content-Type"].startswith("text/csv")
+        assert len(list(csv.reader(io.StringIO(streamed(response))))) == 3
+
+    def test_export_streams_in_chunks(self, postings):
+        """Test that postings are read and written a chunk at a time."""
+        postings(5)
+
+        chunks = list(export_job_postings(JobPosting.objects.all(), "ndjson", 2))
+
+        assert [chunk.count(b"\n") for chunk in chunks] == [2, 2, 1]
+
+    def test_queries_do_not_grow_with_rows(self, api_client, postings):
+        """Test that nested values are read from the taxonomy cache, not joined."""
+
+        def export_queries():
+            with CaptureQueriesContext(connection) as queries:
+                streamed(api_client.get(URL))
+            return len(queries)
+
+        postings(2)
+        export_queries()  # Fill the taxonomy cache
+        few = export_queries()
+        postings(20)
+        assert export_queries() == few
@@ -0,0 +1,108 @@
+import pytest
+from datetime import timedelta
+from django.urls import reverse
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from rest_framework import status
+from job_listings.fieldsets import PROFILES
+from job_listings.tests.factories import JobListingFactory
+
+URL = reverse("job-list")
+
+
+@pytest.fixture
+def postings(employer_user):
+    return JobListingFactory.create_batch(
+        3,
+        employer=employer_user,
+        expiration_date=timezone.now() + timedelta(days=30),
+    )
+
+
+def posting_queries(queries):
+    """Return the SQL of the queries selecting job postings."""
+    return [
+        query["sql"]
+        for query in queries
+        if query["sql"].startswith("SELECT")
+        and 'FROM "job_listings_jobposting"' in query["sql"]
+    ]
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    def test_fields_selects_fields(self, api_client, postings):
+        """Test that only the requested fields are returned, in the usual order."""
+        response = api_client.get(URL, {"fields": "title,job_id,location"})
+
+        assert response.status_code == status.HTTP_200_OK
+        for result in response.json()["results"]:
+            assert list(result) == ["job_id", "title", "location"]
+
+    def test_omit_drops_fields(self, api_client, postings):
+        """Test that omitted fields are left out of the response and the query."""
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(URL, {"omit": "description,skills_required"})
+
+        result = response.json()["results"][0]
+        assert "description" not in result
+        assert "skills_required" not in result
+        assert "title" in result
+        assert not any(
+            '"description"' in sql or '"skill_ids"' in sql
+            for sql in posting_queries(queries)
+        )
+
+    def test_card_profile(self, api_client, postings):
+        """Test that the card profile is compact and reads only its columns."""
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(URL, {"profile": "card"})
+
+        results = response.json()["results"]
+        assert len(results) == 3
+        assert all(tuple(result) == PROFILES["card"] for result in results)
+        assert results[0]["location"]["city"]
+        assert not any(
+            '"description"' in sql or '"search_vector"' in sql
+            for sql in posting_queries(queries)
+        )
+
+        # The cached window of IDs is shared with the full representation
+        with CaptureQueriesContext(connection) as queries:
+            api_client.get(URL)
+        assert not any("COUNT(*)" in query["sql"] for query in queries)
+
+    def test_cursor_pages_with_profile(self, api_client, postings):
+        """Test that keyset pages can follow the cursor of a compact page."""
+        response = api_client.get(
+            URL, {"profile": "card", "pagination": "cursor", "page_size": 2}
+        )
+        next_page = api_client.get(response.json()["next"])
+
+        job_ids = [
+            result["job_id"]
+            for page in (response, next_page)
+            for result in page.json()["results"]
+        ]
+        assert sorted(job_ids) == sorted(str(job.pk) for job in postings)
+
+    def test_retrieve_trims_cached_posting(self, api_client, postings):
+        """Test that details are cached whole and trimmed per request."""
+        url = reverse("job-detail", args=[postings[0].pk])
+
+        trimmed = api_client.get(url, {"fields": "title"})
+        full = api_client.get(url)
+
+        assert trimmed.json() == {"title": postings[0].title}
+        assert full.json()["description"] == postings[0].description
+
+    @pytest.mark.parametrize(
+        "params", [{"fields": "title,salary"}, {"omit": "bogus"}, {"profile": "huge"}]
+    )
+    def test_unknown_names_rejected(self, api_client, params):
+        """Test that unknown fields and profiles are validation errors."""
+        response = api_client.get(URL, params)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert list(response.json()) == list(params)
@@ -0,0 +1,164 @@
+import math
+import pytest
+from datetime import timedelta
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from job_listings.models import Location
+from job_listings.geo import EARTH_RADIUS_KM, bounding_box, geocode, haversine_km
+from .factories import JobListingFactory, LocationFactory
+
+URL = reverse("job-list")
+
+
+class TestGazetteer:
+    def test_geocode_matches_loosely(self):
+        """Test that cities match ignoring case, accents and country aliases."""
+        assert geocode("Cape Town", "Western Cape", "South Africa") == (
+            -33.9249,
+            18.4241,
+        )
+        assert geocode(" cape  town ", None, "RSA") == (-33.9249, 18.4241)
+        assert geocode("Zürich", "", "Switzerland") == geocode(
+            "Zurich", "", "Switzerland"
+        )
+        assert geocode("Seattle", "WA", "USA") == (47.6062, -122.3321)
+
+    def test_geocode_unknown_or_ambiguous(self):
+        """Test that unlisted cities, or cities named alike in a country, are None."""
+        assert geocode("Gotham", None, "Freedonia") is None
+        assert geocode("Cambridge", "", "United Kingdom") == (52.2053, 0.1218)
+        assert geocode("Cambridge", "Massachusetts", "USA") == (42.3736, -71.1097)
+
+    def test_haversine(self):
+        """Test the great-circle distance between London and Paris."""
+        assert haversine_km(51.5074, -0.1278, 48.8566, 2.3522) == pytest.approx(
+            343.6, abs=0.5
+        )
+
+    def test_bounding_box_contains_circle(self):
+        """Test that every point of the circle is inside the bounding box."""
+        min_lat, max_lat, min_lon, max_lon = bounding_box(60.0, 10.0, 100)
+        assert haversine_km(60.0, 10.0, max_lat, 10.0) == pytest.approx(100)
+        assert 60.0 < max_lat and min_lat < 60.0
+        # The circle is widest north of its center, at its tangent point
+        tangent_lat = math.degrees(
+            math.asin(math.sin(math.radians(60.0)) / math.cos(100 / EARTH_RADIUS_KM))
+        )
+        assert haversine_km(60.0, 10.0, tangent_lat, max_lon) == pytest.approx(100)
+        assert haversine_km(60.0, 10.0, 60.0, max_lon) > 100
+        assert bounding_box(89.5, 0.0, 100)[2:] == (None, None)
+
+
+@pytest.mark.django_db
+class TestRadiusSearch:
+    @pytest.fixture
+    def postings(self, employer_user):
+        """Postings in Cape Town, Stellenbosch (45 km away) and Johannesburg."""
+        cities = {
+            "Cape Town": (-33.9249, 18.4241),
+            "Stellenbosch": (-33.9321, 18.8602),
+            "Johannesburg": (-26.2041, 28.0473),
+        }
+        return {
+            city: JobListingFactory.create(
+                employer=employer_user,
+                title=f"Engineer in {city}",
+                location=LocationFactory(
+                    city=city,
+                    country="South Africa",
+                    latitude=latitude,
+                    longitude=longitude,
+                ),
+                expiration_date=timezone.now() + timedelta(days=30),
+            )
+            for city, (latitude, longitude) in cities.items()
+        }
+
+    def titles(self, response):
+        assert response.status_code == status.HTTP_200_OK
+        return [job["title"] for job in response.json()["results"]]
+
+    def test_within_radius(self, api_client, postings):
+        """Test that only postings within the radius are listed."""
+        response = api_client.get(URL, {"near": "-33.93,18.86", "radius_km": 50})
+        assert sorted(self.titles(response)) == [
+            "Engineer in Cape Town",
+            "Engineer in Stellenbosch",
+        ]
+
+        response = api_client.get(URL, {"near": "-33.93,18.86", "radius_km": 10})
+        assert self.titles(response) == ["Engineer in Stellenbosch"]
+
+    def test_default_radius(self, api_client, postings):
+        """Test that the radius defaults to 50 km."""
+        response = api_client.get(URL, {"near": "-26.2,28.05"})
+        assert self.titles(response) == ["Engineer in Johannesburg"]
+
+    def test_ordering_by_distance(self, api_client, postings):
+        """Test that postings can be listed nearest first."""
+        response = api_client.get(
+            URL, {"near": "-33.92,18.42", "radius_km": 1000, "ordering": "distance"}
+        )
+        assert self.titles(response) == [
+            "Engineer in Cape Town",
+            "Engineer in Stellenbosch",
+        ]
+
+        response = api_client.get(
+            URL, {"near": "-30,24", "radius_km": 1000, "ordering": "-distance"}
+        )
+        assert self.titles(response)[0] == "Engineer in Cape Town"
+
+    def test_ordering_by_distance_without_near(self, api_client, postings):
+        """Test that distance ordering is ignored without coordinates."""
+        response = api_client.get(URL, {"ordering": "distance"})
+        assert len(self.titles(response)) == 3
+
+    def test_across_antimeridian(self, api_client, employer_user):
+        """Test that a circle crossing the antimeridian matches both sides."""
+        JobListingFactory.create(
+            employer=employer_user,
+            title="Engineer in Taveuni",
+            location=LocationFactory(latitude=-16.85, longitude=179.95),
+            expiration_date=timezone.now() + timedelta(days=30),
+        )
+        response = api_client.get(URL, {"near": "-16.85,-179.95", "radius_km": 20})
+        assert self.titles(response) == ["Engineer in Taveuni"]
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"near": "Cape Town"},
+            {"near": "-33.92"},
+            {"near": "-95,18"},
+            {"near": "-33.92,18.42", "radius_km": 5000},
+            {"near": "-33.92,18.42", "radius_km": -1},
+        ],
+    )
+    def test_invalid_parameters(self, api_client, params):
+        """Test that malformed coordinates and radii are rejected."""
+        response = api_client.get(URL, params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_created_location_is_geocoded(self, api_client, employer_user):
+        """Test that new locations get coordinates from the gazetteer."""
+        api_client.force_authenticate(user=employer_user)
+        response = api_client.post(
+            URL,
+            {
+                "title": "Engineer in Durban",
+                "description": "On the coast.",
+                "job_type": "full-time",
+                "location": {"city": "Durban", "country": "South Africa"},
+                "industry": {"name": "Technology"},
+                "skills_required": [{"name": "Python"}],
+                "expiration_date": "2099-12-31T23:59:59Z",
+            },
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        location = Location.objects.get(city="Durban")
+        assert (location.latitude, location.longitude) == (-29.8587, 31.0218)
+        assert response.json()["location"]["latitude"] == -29.8587
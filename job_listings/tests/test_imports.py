@@ -0,0 +1,165 @@
+import json
+import pytest
+from django.urls import reverse
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from rest_framework import status
+from job_listings.models import Industry, JobPosting, Location, Skill
+from job_listings.imports import csv_rows, import_job_postings, ndjson_rows
+
+URL = reverse("job-bulk-import")
+
+
+def posting(n, **overrides):
+    row = {
+        "title": f"Import Engineer {n}",
+        "description": "Imported from the ATS.",
+        "job_type": "full-time",
+        "location": {"city": "Gotham", "country": "Freedonia"},
+        "industry": {"name": "Imports"},
+        "skills_required": [{"name": "Kotlin"}, {"name": f"Skill {n % 3}"}],
+        "expiration_date": "2099-12-31T23:59:59Z",
+    }
+    row.update(overrides)
+    return row
+
+
+def ndjson(rows):
+    return "\n".join(
+        row if isinstance(row, str) else json.dumps(row) for row in rows
+    ).encode()
+
+
+@pytest.mark.django_db
+class TestJobPostingImport:
+    def test_ndjson_import_reports_row_errors(self, api_client, employer_user):
+        """Test that valid rows are created and invalid rows reported by number."""
+        Industry.objects.create(name="Imports")
+        api_client.force_authenticate(user=employer_user)
+        body = ndjson(
+            [
+                posting(1),
+                posting(2, title=""),
+                "{not json",
+                "",
+                posting(3, job_type="astronaut"),
+                posting(4, location={"city": "Metropolis", "country": "Freedonia"}),
+            ]
+        )
+
+        response = api_client.post(URL, body, content_type="application/x-ndjson")
+
+        assert response.status_code == status.HTTP_200_OK
+        summary = response.json()
+        assert summary["created"] == 2
+        assert summary["failed"] == 3
+        assert [error["row"] for error in summary["errors"]] == [2, 3, 5]
+        assert "title" in summary["errors"][0]["errors"]
+        assert "job_type" in summary["errors"][2]["errors"]
+
+        jobs = JobPosting.objects.filter(employer=employer_user).order_by("title")
+        assert [job.title for job in jobs] == ["Import Engineer 1", "Import Engineer 4"]
+        assert all(job.slug for job in jobs)
+        assert Industry.objects.filter(name="Imports").count() == 1
+        assert Location.objects.filter(country="Freedonia").count() == 2
+        skill_names = set(
+            Skill.objects.filter(skill_id__in=jobs[0].skill_ids).values_list(
+                "name", flat=True
+            )
+        )
+        assert skill_names == {"Kotlin", "Skill 1"}
+
+    def test_csv_import(self, api_client, employer_user):
+        """Test that CSV rows are mapped to nested locations, industries and skills."""
+        api_client.force_authenticate(user=employer_user)
+        body = (
+            "title,description,job_type,location_city,location_country,"
+            "industry,skills,expiration_date,salary_min,currency\n"
+            'CSV Engineer,"Builds, imports",contract,Gotham,Freedonia,'
+            "Imports,Kotlin; Koa,2099-12-31T00:00:00Z,50000,usd\n"
+            "No Location,Missing city,contract,,,Imports,,2099-12-31T00:00:00Z,,\n"
+        ).encode()
+
+        response = api_client.post(URL, body, content_type="text/csv")
+
+        summary = response.json()
+        assert summary["created"] == 1
+        assert summary["errors"][0]["row"] == 2
+        job = JobPosting.objects.get(title="CSV Engineer")
+        assert job.description == "Builds, imports"
+        assert job.currency == "USD"
+        assert job.location.city == "Gotham"
+        assert len(job.skill_ids) == 2
+
+    def test_csv_import_with_charset(self, api_client, employer_user):
+        """Test that content type parameters are ignored."""
+        api_client.force_authenticate(user=employer_user)
+        body = (
+            "title,description,job_type,location_city,location_country,"
+            "industry,expiration_date\n"
+            "CSV Engineer,Imported,contract,Gotham,Freedonia,"
+            "Imports,2099-12-31T00:00:00Z\n"
+        ).encode()
+
+        response = api_client.post(URL, body, content_type="text/csv; charset=utf-8")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["created"] == 1
+
+    def test_csv_parse_error_reports_created_rows(self, employer_user):
+        """Test that rows before a malformed one are created and the error reported."""
+        body = (
+            "title,description,job_type,location_city,location_country,"
+            "industry,expiration_date\n"
+        ).encode() + b"".join(
+            f"Engineer {n},Imported,contract,Gotham,Freedonia,"
+            "Imports,2099-12-31T00:00:00Z\n".encode()
+            for n in range(3)
+        )
+        body += b"Bad \xff,Imported,contract,Gotham,Freedonia,Imports,2099-12-31\n"
+
+        summary = import_job_postings(
+            csv_rows(body.splitlines(keepends=True)), employer_user, chunk_size=2
+        )
+
+        assert summary["created"] == 3
+        assert summary["error"].startswith("CSV parse error after row 3")
+        assert JobPosting.objects.filter(employer=employer_user).count() == 3
+
+    def test_queries_do_not_grow_with_rows(self, employer_user):
+        """Test that a chunk is written with a fixed number of queries."""
+
+        def import_queries(count):
+            body = ndjson(posting(n) for n in range(count))
+            with CaptureQueriesContext(connection) as queries:
+                summary = import_job_postings(
+                    ndjson_rows(body.splitlines()), employer_user
+                )
+            assert summary["created"] == count
+            return len(queries)
+
+        import_queries(3)  # Create the shared taxonomy rows
+        assert import_queries(5) == import_queries(50)
+
+    def test_import_invalidates_lists(self, api_client, employer_user):
+        """Test that cached job lists include the imported postings."""
+        api_client.force_authenticate(user=employer_user)
+        assert api_client.get(reverse("job-list")).json()["count"] == 0
+
+        api_client.post(URL, ndjson([posting(1)]), content_type="application/x-ndjson")
+
+        assert api_client.get(reverse("job-list")).json()["count"] == 1
+
+    def test_import_restricted_to_employers(self, api_client, jobseeker_user):
+        """Test that job seekers cannot import job postings."""
+        api_client.force_authenticate(user=jobseeker_user)
+        response = api_client.post(
+            URL, ndjson([posting(1)]), content_type="application/x-ndjson"
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_import_rejects_unknown_content_type(self, api_client, employer_user):
+        """Test that only NDJSON and CSV bodies are accepted."""
+        api_client.force_authenticate(user=employer_user)
+        response = api_client.post(URL, {"title": "x"}, format="json")
+        assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
@@ -1,9 +1,15 @@
 import pytest
+from io import StringIO
+from datetime import timedelta
 from django.utils import timezone
+from django.core.management import call_command
+from django.db import connection
 from django.db.utils import IntegrityError
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from job_listings.models import Location, Industry, Skill, JobPosting
+from job_listings.models import Location, Industry, Skill, JobPosting, SLUG_MAX_LENGTH
+from .factories import JobListingFactory
 
 
 # Industry Model Tests
@@ -47,6 +53,46 @@ def test_location_string_representation(location):
     assert str(location) == "San Francisco, USA"
 
 
+@pytest.mark.django_db
+def test_location_unique_ignoring_case(location):
+    """Test that locations are unique by city, state and country, ignoring case."""
+    with pytest.raises(IntegrityError):
+        Location.objects.create(
+            city="SAN FRANCISCO", state_or_province="ny", country="usa"
+        )
+
+
+@pytest.mark.django_db
+def test_merge_duplicate_locations(employer_user):
+    """Test that duplicate locations are merged and their postings repointed."""
+    with connection.cursor() as cursor:
+        # Duplicates predate the constraint, drop it for this test's transaction
+        cursor.execute("DROP INDEX location_normalized_key_unique")
+    canonical, duplicate = Location.objects.bulk_create(
+        [
+            Location(city="Gotham", country="Freedonia"),
+            Location(city="GOTHAM", country="freedonia", postal_code="10101"),
+        ]
+    )
+    other = Location.objects.create(city="Gotham", country="Sylvania")
+    jobs = JobListingFactory.create_batch(
+        2, employer=employer_user, location=canonical
+    ) + [JobListingFactory.create(employer=employer_user, location=duplicate)]
+
+    out = StringIO()
+    call_command("merge_duplicate_locations", stdout=out)
+
+    assert (
+        "Merged 1 duplicate location(s), repointed 1 job posting(s)." in out.getvalue()
+    )
+    assert not Location.objects.filter(pk=duplicate.pk).exists()
+    assert Location.objects.get(pk=canonical.pk).postal_code == "10101"
+    assert Location.objects.filter(pk=other.pk).exists()
+    assert all(
+        JobPosting.objects.get(pk=job.pk).location_id == canonical.pk for job in jobs
+    )
+
+
 # Skill Model Tests
 @pytest.mark.django_db
 def test_create_skill(skill):
@@ -138,3 +184,160 @@ def test_job_posting_delete_method(job_listing):
     job.delete_job()
     assert job.is_active is False
     assert JobPosting.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_job_posting_slug_allocated_without_lookup(employer_user):
+    """Test that a taken slug is resolved by retrying, not by querying first."""
+    first = JobListingFactory.create(employer=employer_user, title="Software Engineer")
+    assert first.slug == "software-engineer"
+
+    second = JobListingFactory.build(
+        employer=employer_user, title="Software Engineer", industry=None, location=None
+    )
+    with CaptureQueriesContext(connection) as queries:
+        second.save()
+
+    assert second.slug.startswith("software-engineer-")
+    assert not any(query["sql"].startswith("SELECT") for query in queries)
+    assert JobPosting.objects.filter(slug__startswith="software-engineer").count() == 2
+
+
+@pytest.mark.django_db
+def test_job_posting_slug_fits_long_titles(employer_user):
+    """Test that slugs of long titles leave room for the suffix."""
+    title = "Engineer " * 27 + "Lead"
+    jobs = JobListingFactory.create_batch(2, employer=employer_user, title=title)
+    assert all(len(job.slug) <= SLUG_MAX_LENGTH for job in jobs)
+    assert jobs[0].slug != jobs[1].slug
+
+
+@pytest.mark.django_db
+def test_job_posting_bulk_create_allocates_slugs(employer_user):
+    """Test that bulk creates allocate unique slugs in one lookup query."""
+    JobListingFactory.create(employer=employer_user, title="Data Analyst")
+    jobs = [
+        JobListingFactory.build(
+            employer=employer_user, title=title, industry=None, location=None
+        )
+        for title in ("Data Analyst", "Data Engineer", "Data Engineer", "Chef")
+    ]
+    jobs.append(
+        JobListingFactory.build(
+            employer=employer_user, slug="data-engineer-1", industry=None, location=None
+        )
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        JobPosting.objects.bulk_create(jobs)
+
+    slugs = [job.slug for job in jobs]
+    assert len(set(slugs)) == len(slugs)
+    assert slugs[0].startswith("data-analyst-")
+    assert slugs[1] == "data-engineer"
+    assert slugs[2].startswith("data-engineer-")
+    assert slugs[3] == "chef"
+    assert slugs[4] == "data-engineer-1"
+    assert sum(query["sql"].startswith("SELECT") for query in queries) == 1
+    assert JobPosting.objects.count() == 6
+
+
+@pytest.mark.django_db
+def test_job_posting_search_vector_populated_on_save(job_listing):
+    """Test that the search vector is maintained when a posting is saved."""
+    job_listing.refresh_from_db()
+    assert "softwar" in job_listing.search_vector
+
+    job_listing.title = "Data Analyst"
+    job_listing.save()
+    job_listing.refresh_from_db()
+    assert "analyst" in job_listing.search_vector
+    assert "softwar" in job_listing.search_vector  # Still in the description
+
+
+@pytest.mark.django_db
+def test_job_posting_search_vector_populated_on_bulk_create(employer_user):
+    """Test that the search vector is maintained for bulk writes."""
+    JobPosting.objects.bulk_create(
+        [
+            JobPosting(
+                employer=employer_user,
+                title="Backend Engineer",
+                slug="backend-engineer",
+                description="Build APIs.",
+                job_type="full-time",
+                expiration_date=timezone.now(),
+            )
+        ]
+    )
+    job = JobPosting.objects.get(slug="backend-engineer")
+    assert "backend" in job.search_vector
+
+    JobPosting.objects.filter(pk=job.pk).update(title="Frontend Engineer")
+    job.refresh_from_db()
+    assert "frontend" in job.search_vector
+
+
+@pytest.mark.django_db
+def test_job_posting_skill_ids_follow_skills(job_listing, skill):
+    """Test that `skill_ids` is kept in sync with the skills M2M."""
+    assert job_listing.skill_ids == [skill.pk]
+
+    other = Skill.objects.create(name="NewDjango")
+    job_listing.skills_required.add(other)
+    assert sorted(job_listing.skill_ids) == sorted([skill.pk, other.pk])
+
+    job_listing.skills_required.remove(skill)
+    assert job_listing.skill_ids == [other.pk]
+
+    job_listing.skills_required.clear()
+    assert job_listing.skill_ids == []
+
+
+@pytest.mark.django_db
+def test_job_posting_skill_ids_follow_bulk_and_reverse_writes(job_listing, skill):
+    """Test that `skill_ids` is maintained for writes that bypass the posting."""
+    other = Skill.objects.create(name="NewDjango")
+    other.job_postings.add(job_listing)
+    job_listing.refresh_from_db()
+    assert sorted(job_listing.skill_ids) == sorted([skill.pk, other.pk])
+
+    skill.delete()
+    job_listing.refresh_from_db()
+    assert job_listing.skill_ids == [other.pk]
+
+    JobPosting.skills_required.through.objects.filter(skill=other).delete()
+    job_listing.refresh_from_db()
+    assert job_listing.skill_ids == []
+
+
+@pytest.mark.django_db
+def test_job_posting_save_keeps_synced_skill_ids(job_listing, skill):
+    """Test that saving an instance loaded before a skill change keeps `skill_ids`."""
+    stale = JobPosting.objects.get(pk=job_listing.pk)
+    other = Skill.objects.create(name="NewDjango")
+    other.job_postings.add(job_listing)
+
+    stale.title = "Renamed"
+    stale.save()
+
+    stale.refresh_from_db()
+    assert sorted(stale.skill_ids) == sorted(
+        stale.skills_required.values_list("pk", flat=True)
+    )
+    assert sorted(stale.skill_ids) == sorted([skill.pk, other.pk])
+
+
+@pytest.mark.django_db
+def test_live_excludes_inactive_and_expired(employer_user):
+    """Test that only active, unexpired postings are live."""
+    future = timezone.now() + timedelta(days=1)
+    past = timezone.now() - timedelta(days=1)
+    live = JobListingFactory.create(employer=employer_user, expiration_date=future)
+    JobListingFactory.create(employer=employer_user, expiration_date=past)
+    JobListingFactory.create(
+        employer=employer_user, expiration_date=future, is_active=False
+    )
+
+    assert list(JobPosting.objects.live()) == [live]
+    assert JobPosting.objects.count() == 3
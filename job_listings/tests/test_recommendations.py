@@ -0,0 +1,170 @@
+import numpy as np
+import pytest
+from unittest import mock
+from datetime import timedelta
+from django.urls import reverse
+from django.utils import timezone
+from django.core.cache import cache
+from rest_framework import status
+from job_applications.models import JobApplication
+from job_listings.models import Skill
+from job_listings.recommendations import (
+    PostingMatrix,
+    recommendation_key,
+    score_batch,
+    top_postings,
+)
+from job_listings.tasks import refresh_recommendations
+from .factories import JobListingFactory
+
+URL = reverse("job-recommended")
+
+
+@pytest.fixture
+def skills():
+    return {
+        name: Skill.objects.get_or_create(name=name)[0]
+        for name in ("Python", "Django", "Go", "SQL")
+    }
+
+
+@pytest.fixture
+def postings(employer_user, skills):
+    """Postings by title, with the names of their required skills."""
+    required = {
+        "Django Developer": ["Python", "Django", "SQL"],
+        "Data Engineer": ["Python", "SQL"],
+        "Go Developer": ["Go"],
+        "Applied Python Job": ["Python", "Django"],
+    }
+    return {
+        title: JobListingFactory.create(
+            employer=employer_user,
+            title=title,
+            skills_required=[skills[name] for name in names],
+            expiration_date=timezone.now() + timedelta(days=30),
+        )
+        for title, names in required.items()
+    }
+
+
+def apply(job_seeker, job):
+    return JobApplication.objects.create(
+        job=job,
+        job_seeker=job_seeker,
+        resume_url="https://example.com/resume.pdf",
+        cover_letter_url="https://example.com/cover.pdf",
+    )
+
+
+class TestScoring:
+    def test_top_postings(self):
+        """Test that the best positive scores are kept, ties newest first."""
+        scores = np.array([0.5, 0.0, 0.9, 0.5, 0.7], dtype=np.float32)
+        assert top_postings(scores, 3) == [2, 4, 0]
+        assert top_postings(scores, 10) == [2, 4, 0, 3]
+        assert top_postings(np.zeros(3, dtype=np.float32), 3) == []
+
+
+@pytest.mark.django_db
+class TestRecommendations:
+    def test_ranked_by_skill_overlap(self, jobseeker_user, postings):
+        """Test that postings sharing more of the profile's skills rank higher."""
+        apply(jobseeker_user, postings["Applied Python Job"])
+
+        recommended = score_batch([jobseeker_user.pk], PostingMatrix.live())
+
+        # Applied postings and postings without a common skill are left out
+        assert recommended[jobseeker_user.pk] == [
+            postings["Django Developer"].pk,
+            postings["Data Engineer"].pk,
+        ]
+
+    def test_without_applications(self, jobseeker_user, postings):
+        """Test that a jobseeker without a skill profile gets no recommendations."""
+        assert score_batch([jobseeker_user.pk]) == {jobseeker_user.pk: []}
+
+    def test_task_caches_every_jobseeker(self, jobseeker_user, postings):
+        """Test that the task scores jobseekers in batches and caches the lists."""
+        apply(jobseeker_user, postings["Go Developer"])
+
+        assert refresh_recommendations(batch_size=1) == 1
+        assert cache.get(recommendation_key(jobseeker_user.pk)) is not None
+
+
+@pytest.mark.django_db
+class TestRecommendedEndpoint:
+    def test_lists_recommended_postings(self, api_client, jobseeker_user, postings):
+        """Test that recommendations are served, best match first."""
+        apply(jobseeker_user, postings["Applied Python Job"])
+        api_client.force_authenticate(user=jobseeker_user)
+
+        response = api_client.get(URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [job["title"] for job in response.json()["results"]] == [
+            "Django Developer",
+            "Data Engineer",
+        ]
+
+    def test_served_from_cache(
+        self, api_client, jobseeker_user, postings, django_assert_num_queries
+    ):
+        """Test that cached recommendations skip scoring."""
+        apply(jobseeker_user, postings["Applied Python Job"])
+        refresh_recommendations()
+        api_client.force_authenticate(user=jobseeker_user)
+        api_client.get(URL)  # Warm the taxonomy cache
+
+        # One query for the recommended postings
+        with django_assert_num_queries(1):
+            response = api_client.get(URL)
+
+        assert len(response.json()["results"]) == 2
+
+    def test_expired_postings_are_skipped(self, api_client, jobseeker_user, postings):
+        """Test that postings which expired since scoring are not listed."""
+        apply(jobseeker_user, postings["Applied Python Job"])
+        refresh_recommendations()
+        postings["Django Developer"].is_active = False
+        postings["Django Developer"].save()
+        api_client.force_authenticate(user=jobseeker_user)
+
+        response = api_client.get(URL)
+
+        assert [job["title"] for job in response.json()["results"]] == ["Data Engineer"]
+
+    def test_new_application_refreshes_list(
+        self, api_client, jobseeker_user, postings, django_capture_on_commit_callbacks
+    ):
+        """Test that applying drops the cached list, so it reflects the new skills."""
+        refresh_recommendations()
+        api_client.force_authenticate(user=jobseeker_user)
+        assert api_client.get(URL).json()["results"] == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            apply(jobseeker_user, postings["Go Developer"])
+
+        assert api_client.get(URL).json()["results"] == []
+        with django_capture_on_commit_callbacks(execute=True):
+            apply(jobseeker_user, postings["Data Engineer"])
+
+        titles = [job["title"] for job in api_client.get(URL).json()["results"]]
+        assert titles[0] in {"Django Developer", "Applied Python Job"}
+
+    def test_dropped_cache_write(self, api_client, jobseeker_user, postings):
+        """Test that recommendations computed on a miss are served uncached."""
+        apply(jobseeker_user, postings["Applied Python Job"])
+        api_client.force_authenticate(user=jobseeker_user)
+
+        with mock.patch.object(cache, "set_many"):
+            response = api_client.get(URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["results"]) == 2
+
+    def test_jobseekers_only(self, api_client, employer_user):
+        """Test that other roles cannot read recommendations."""
+        assert api_client.get(URL).status_code == status.HTTP_403_FORBIDDEN
+        api_client.force_authenticate(user=employer_user)
+        assert api_client.get(URL).status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,152 @@
+import pytest
+from datetime import timedelta
+from django.urls import reverse
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from rest_framework import status
+from job_listings.models import Industry, Location, Skill
+from job_listings.serializers import JobPostingSerializer
+from job_listings.resolvers import resolve_locations
+
+
+def posting_data(skills, **overrides):
+    data = {
+        "title": "Platform Engineer",
+        "description": "Keep the lights on.",
+        "job_type": "full-time",
+        "location": {"city": "Gotham", "country": "Freedonia"},
+        "industry": {"name": "Technology"},
+        "skills_required": [{"name": name} for name in skills],
+        "expiration_date": (timezone.now() + timedelta(days=30)).isoformat(),
+    }
+    data.update(overrides)
+    return data
+
+
+def create_posting(employer, data):
+    serializer = JobPostingSerializer(data=data)
+    serializer.is_valid(raise_exception=True)
+    return serializer.save(employer=employer)
+
+
+@pytest.mark.django_db
+class TestJobPostingSerializerTaxonomy:
+    def test_create_matches_existing_rows_case_insensitively(self, employer_user):
+        """Test that nested values reuse existing rows whatever their case."""
+        Location.objects.create(city="Gotham", country="Freedonia")
+        job = create_posting(
+            employer_user,
+            posting_data(
+                ["python", " SQL ", "Kotlin"],
+                location={"city": "gotham", "country": "FREEDONIA"},
+                industry={"name": "technology"},
+            ),
+        )
+
+        assert job.industry == Industry.objects.get(name="Technology")
+        assert Location.objects.filter(city__iexact="gotham").count() == 1
+        assert Skill.objects.filter(name__iexact="python").count() == 1
+        skills = Skill.objects.filter(name__in=["Python", "SQL", "Kotlin"])
+        assert sorted(job.skill_ids) == sorted(skill.pk for skill in skills)
+        job.refresh_from_db()
+        assert sorted(job.skill_ids) == sorted(skill.pk for skill in skills)
+
+    def test_create_queries_do_not_grow_with_skills(self, employer_user):
+        """Test that taxonomy resolution takes a constant number of queries."""
+
+        def create_queries(skills, title):
+            data = posting_data(skills, title=title)
+            with CaptureQueriesContext(connection) as queries:
+                create_posting(employer_user, data)
+            return len(queries)
+
+        skills = [f"Skill {n}" for n in range(20)]
+        create_queries(skills, "Warm up")  # Create the location, industry and skills
+        assert create_queries(skills[:2], "Two skills") == create_queries(
+            skills, "Twenty skills"
+        )
+
+        # Missing skills are created together, whatever their number
+        assert create_queries(["Ktor"], "One new skill") == create_queries(
+            [f"New skill {n}" for n in range(10)], "Ten new skills"
+        )
+
+    def test_update_replaces_nested_values(self, employer_user):
+        """Test that updates resolve nested values and only write changed skills."""
+        job = create_posting(employer_user, posting_data(["Kotlin", "Koa"]))
+
+        serializer = JobPostingSerializer(
+            job,
+            data={
+                "industry": {"name": "Finance"},
+                "skills_required": [{"name": "kotlin"}, {"name": "Ktor"}],
+            },
+            partial=True,
+        )
+        serializer.is_valid(raise_exception=True)
+        job = serializer.save()
+
+        job.refresh_from_db()
+        assert job.industry.name == "Finance"
+        names = set(job.skills_required.values_list("name", flat=True))
+        assert names == {"Kotlin", "Ktor"}
+        assert sorted(job.skill_ids) == sorted(
+            Skill.objects.filter(name__in=names).values_list("pk", flat=True)
+        )
+
+    def test_create_view_accepts_existing_names(self, api_client, employer_user):
+        """Test that posting an existing industry or skill name is not rejected."""
+        api_client.force_authenticate(user=employer_user)
+
+        response = api_client.post(
+            reverse("job-list"), posting_data(["Python", "SQL"]), format="json"
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["industry"]["name"] == "Technology"
+        assert [skill["name"] for skill in response.json()["skills_required"]] == [
+            "Python",
+            "SQL",
+        ]
+
+
+@pytest.mark.django_db
+class TestLocationCanonicalization:
+    def test_resolved_locations_cached_by_key(
+        self, django_capture_on_commit_callbacks, django_assert_num_queries
+    ):
+        """Test that resolved values are served from the key cache once committed."""
+        data = {"city": "Gotham", "country": "Freedonia"}
+        with django_capture_on_commit_callbacks(execute=True):
+            (location,) = resolve_locations([data]).values()
+
+        with django_assert_num_queries(0):
+            assert resolve_locations(
+                [{"city": " gotham ", "country": "FREEDONIA"}]
+            ) == {("gotham", "", "freedonia"): location}
+
+    def test_key_cache_evicted_on_change(self, django_capture_on_commit_callbacks):
+        """Test that deleting a location drops it from the key cache."""
+        data = {"city": "Gotham", "country": "Freedonia"}
+        with django_capture_on_commit_callbacks(execute=True):
+            (location,) = resolve_locations([data]).values()
+        with django_capture_on_commit_callbacks(execute=True):
+            location.delete()
+
+        (recreated,) = resolve_locations([data]).values()
+        assert recreated.pk != location.pk
+        assert Location.objects.filter(pk=recreated.pk).exists()
+
+    def test_create_location_rejects_duplicates(self, api_client):
+        """Test that a duplicate location is a validation error, not a server error."""
+        Location.objects.create(city="Gotham", country="Freedonia")
+
+        response = api_client.post(
+            reverse("location-list"),
+            {"city": "GOTHAM", "country": "freedonia"},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Location.objects.filter(city__iexact="gotham").count() == 1
@@ -0,0 +1,162 @@
+import json
+import pytest
+from datetime import timedelta
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.test import APIClient
+from job_listings.models import JobPosting
+from job_listings.cache import detail_cache_keys
+from job_listings.signals import handle_change_notifications, previous_scopes
+from .factories import IndustryFactory, JobListingFactory, SkillFactory
+
+
+@pytest.fixture
+def job(employer_user):
+    return JobListingFactory.create(
+        employer=employer_user,
+        title="Python Developer",
+        expiration_date=timezone.now() + timedelta(days=30),
+    )
+
+
+def get_detail(client, job):
+    return client.get(reverse("job-detail", args=[job.job_id])).json()
+
+
+def is_cached(job):
+    return cache.get(detail_cache_keys([job.job_id])[0]) is not None
+
+
+@pytest.mark.django_db
+class TestJobDetailInvalidation:
+    def test_save_invalidates_detail(
+        self, api_client, job, django_capture_on_commit_callbacks
+    ):
+        """Test that saving a posting drops its cached detail."""
+        assert get_detail(api_client, job)["title"] == "Python Developer"
+        assert is_cached(job)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            job.title = "Chef"
+            job.save()
+
+        assert not is_cached(job)
+        assert get_detail(api_client, job)["title"] == "Chef"
+
+    def test_skill_changes_invalidate_detail(
+        self, api_client, job, django_capture_on_commit_callbacks
+    ):
+        """Test that M2M changes from either side drop the cached detail."""
+        get_detail(api_client, job)
+        with django_capture_on_commit_callbacks(execute=True):
+            job.skills_required.add(SkillFactory.create(name="Rust"))
+        assert not is_cached(job)
+
+        get_detail(api_client, job)
+        with django_capture_on_commit_callbacks(execute=True):
+            job.skills_required.first().job_postings.clear()
+        assert not is_cached(job)
+
+    def test_location_rename_invalidates_detail(
+        self, api_client, job, django_capture_on_commit_callbacks
+    ):
+        """Test that renaming a related location drops the cached detail."""
+        get_detail(api_client, job)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            job.location.city = "Cape Town"
+            job.location.save()
+
+        assert get_detail(api_client, job)["location"]["city"] == "Cape Town"
+
+    def test_cached_detail_respects_visibility(self, api_client, admin_user, job):
+        """Test that a detail cached for an admin is not served to the public when inactive."""
+        JobPosting.objects.filter(pk=job.pk).update(is_active=False)
+
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+        assert client.get(reverse("job-detail", args=[job.job_id])).status_code == (
+            status.HTTP_200_OK
+        )
+        assert is_cached(job)
+
+        response = api_client.get(reverse("job-detail", args=[job.job_id]))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def notifications(write):
+    """Return the change notification payloads published by `write()`."""
+    with connection.cursor() as cursor:
+        cursor.execute("LISTEN job_listings_changes")
+    write()
+
+    connection.connection.poll()
+    payloads = [json.loads(n.payload) for n in connection.connection.notifies]
+    connection.connection.notifies.clear()
+    with connection.cursor() as cursor:
+        cursor.execute("UNLISTEN job_listings_changes")
+    return payloads
+
+
+@pytest.mark.django_db(transaction=True)
+def test_queryset_update_notifies_and_invalidates(api_client, job):
+    """Test that writes bypassing signals are published by the database trigger."""
+    get_detail(api_client, job)
+
+    payloads = notifications(
+        lambda: JobPosting.objects.filter(pk=job.pk).update(title="Chef")
+    )
+
+    assert {
+        "table": "job_listings_jobposting",
+        "ids": [str(job.job_id)],
+        "old": {
+            "employer_id": [str(job.employer_id)],
+            "industry_id": [str(job.industry_id)],
+        },
+    } in payloads
+    assert is_cached(job)
+
+    handle_change_notifications(payloads)
+
+    assert not is_cached(job)
+    assert get_detail(api_client, job)["title"] == "Chef"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_queryset_move_invalidates_previous_lists(api_client, job):
+    """Test that moving a posting to another industry drops it from the former's lists."""
+    url = reverse("job-list")
+    former = job.industry.name
+    assert api_client.get(url, {"industry": former}).json()["count"] == 1
+
+    payloads = notifications(
+        lambda: JobPosting.objects.filter(pk=job.pk).update(
+            industry=IndustryFactory.create()
+        )
+    )
+    handle_change_notifications(payloads)
+
+    assert api_client.get(url, {"industry": former}).json()["count"] == 0
+
+
+@pytest.mark.django_db
+def test_previous_scopes_without_ids(job):
+    """Test that old scopes too many to list select every employer and industry."""
+    scopes = previous_scopes({"employer_id": None, "industry_id": None})
+
+    assert ("employer", job.employer_id) in scopes
+    assert ("industry", job.industry.name) in scopes
+
+
+@pytest.mark.django_db
+def test_flush_notification_invalidates_all_details(api_client, job):
+    """Test that a notification without IDs flushes every cached detail."""
+    get_detail(api_client, job)
+
+    handle_change_notifications([{"table": "job_listings_jobposting", "ids": None}])
+
+    assert not is_cached(job)
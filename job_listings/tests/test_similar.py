@@ -0,0 +1,232 @@
+import uuid
+import numpy as np
+import pytest
+from datetime import timedelta
+from unittest import mock
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from job_listings.models import JobPosting, Skill, SimilarJobPostings
+from job_listings.similar import TermMatrix, refresh_similar_postings, tokenize
+from job_listings.tasks import build_job_documents, build_similar_postings
+from job_listings.views import JobPostingViewSet
+from .factories import JobListingFactory
+
+
+def similar_url(job_id):
+    return reverse("job-similar", kwargs={"pk": job_id})
+
+
+@pytest.fixture
+def skills():
+    return {
+        name: Skill.objects.get_or_create(name=name)[0]
+        for name in ("Python", "Django", "Go", "SQL")
+    }
+
+
+@pytest.fixture
+def create_posting(employer_user, skills):
+    def create_posting(title, description, names):
+        return JobListingFactory.create(
+            employer=employer_user,
+            title=title,
+            description=description,
+            skills_required=[skills[name] for name in names],
+            expiration_date=timezone.now() + timedelta(days=30),
+        )
+
+    return create_posting
+
+
+@pytest.fixture
+def postings(create_posting):
+    """Postings by title, with their description and required skills."""
+    postings = {
+        "Django Developer": ("Build Django web applications.", ["Python", "Django"]),
+        "Senior Django Engineer": ("Maintain Django web services.", ["Django"]),
+        "Python Data Analyst": ("Analyse warehouse data.", ["Python", "SQL"]),
+        "Go Developer": ("Write Go microservices.", ["Go"]),
+        "Barista": ("Pour coffee.", []),
+    }
+    return {
+        title: create_posting(title, description, names)
+        for title, (description, names) in postings.items()
+    }
+
+
+def similar_titles(job):
+    job_ids = SimilarJobPostings.objects.get(pk=job.pk).job_ids
+    titles = dict(JobPosting.objects.filter(pk__in=job_ids).values_list("pk", "title"))
+    return [titles[job_id] for job_id in job_ids]
+
+
+class TestTokenize:
+    def test_tokenize(self):
+        """Test that words are lowercased, stop words dropped, C++ and C# kept."""
+        assert tokenize("The C++ and C# Developer, Node.js") == [
+            "c++",
+            "c#",
+            "developer",
+            "node",
+            "js",
+        ]
+
+
+@pytest.mark.django_db
+class TestSimilarPostings:
+    def test_ranked_by_shared_terms(self, postings):
+        """Test that postings sharing more words and skills rank higher."""
+        assert refresh_similar_postings(full=True) == 5
+
+        titles = similar_titles(postings["Django Developer"])
+        assert titles[0] == "Senior Django Engineer"
+        assert set(titles[1:]) == {"Python Data Analyst", "Go Developer"}
+        assert similar_titles(postings["Barista"]) == []
+
+    def test_scores_are_cosine_similarities(self, postings):
+        """Test that scores are the nonzero cosine similarities with other postings."""
+        matrix = TermMatrix.live()
+        size = len(matrix.job_ids)
+        vectors = np.zeros((size, len(matrix.term_pointers) - 1))
+        for row in range(size):
+            entries = slice(matrix.row_pointers[row], matrix.row_pointers[row + 1])
+            vectors[row, matrix.terms[entries]] = matrix.weights[entries]
+        expected = vectors @ vectors.T
+        np.fill_diagonal(expected, 0)
+
+        similarities = matrix.similarities(range(size))
+
+        for row in range(size):
+            neighbours, scores = similarities[row]
+            assert neighbours.tolist() == np.flatnonzero(expected[row]).tolist()
+            assert np.allclose(scores, expected[row, neighbours])
+            assert all(0 < score < 1 for score in scores)
+            assert similarities.score(row, row) == 0
+
+    def test_batches_bounded_by_products(self, postings):
+        """Test that batches are cut to the products budget, and lists unchanged."""
+        refresh_similar_postings(full=True)
+        expected = {job.pk: similar_titles(job) for job in postings.values()}
+        matrix = TermMatrix.live()
+        rows = range(len(matrix.job_ids))
+        budget = int(matrix.products.max())
+
+        with mock.patch("job_listings.similar.SIMILAR_BATCH_PRODUCTS", budget):
+            batches = list(matrix.batches(rows))
+            assert len(batches) > 1
+            assert all(matrix.products[batch].sum() <= budget for batch in batches)
+
+            refresh_similar_postings(full=True)
+
+        assert {job.pk: similar_titles(job) for job in postings.values()} == expected
+
+    def test_incremental_build(self, postings, create_posting):
+        """Test that only new and updated postings are rebuilt, and merged."""
+        build_similar_postings(full=True)
+        with mock.patch.object(TermMatrix, "live") as live:
+            assert build_similar_postings() == 0
+        assert not live.called
+
+        job = create_posting("Django Web Developer", "Django web work.", ["Django"])
+        assert build_similar_postings() == 1
+        assert similar_titles(job)[0] in {"Django Developer", "Senior Django Engineer"}
+        # The new posting is merged into the lists it now ranks in
+        assert "Django Web Developer" in similar_titles(postings["Django Developer"])
+
+        barista = postings["Barista"]
+        barista.description = "Pour coffee for Django web developers."
+        barista.save()
+        assert build_similar_postings() == 1
+        assert "Barista" in similar_titles(postings["Senior Django Engineer"])
+
+    def test_full_build_drops_expired_postings(self, postings):
+        """Test that a full rebuild deletes the lists of expired postings."""
+        build_similar_postings(full=True)
+        job = postings["Go Developer"]
+        JobPosting.objects.filter(pk=job.pk).update(is_active=False)
+
+        assert build_similar_postings(full=True) == 4
+        assert not SimilarJobPostings.objects.filter(pk=job.pk).exists()
+        assert "Go Developer" not in similar_titles(postings["Django Developer"])
+
+
+@pytest.mark.django_db
+class TestSimilarEndpoint:
+    def test_lists_similar_postings(self, api_client, postings):
+        """Test that similar postings are listed, most similar first."""
+        build_similar_postings(full=True)
+
+        response = api_client.get(similar_url(postings["Django Developer"].pk))
+
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()["results"]
+        assert [job["title"] for job in results] == similar_titles(
+            postings["Django Developer"]
+        )
+
+    def test_read_in_one_query(self, api_client, postings, django_assert_num_queries):
+        """Test that neighbours are read with their documents in one query."""
+        build_similar_postings(full=True)
+        build_job_documents()
+
+        with django_assert_num_queries(1):
+            response = api_client.get(similar_url(postings["Django Developer"].pk))
+
+        assert len(response.json()["results"]) == 3
+
+    def test_documents_match_serializer(self, api_client, postings):
+        """Test that the assembled response is byte for byte the serialized one."""
+        build_similar_postings(full=True)
+        url = similar_url(postings["Django Developer"].pk)
+        with mock.patch.object(
+            JobPostingViewSet, "renders_compact_json", return_value=False
+        ):
+            serialized = api_client.get(url).content
+
+        build_job_documents()
+
+        assert api_client.get(url).content == serialized
+
+    def test_expired_neighbours_are_skipped(self, api_client, postings):
+        """Test that neighbours which expired since the build are not listed."""
+        build_similar_postings(full=True)
+        job = postings["Senior Django Engineer"]
+        JobPosting.objects.filter(pk=job.pk).update(is_active=False)
+
+        response = api_client.get(similar_url(postings["Django Developer"].pk))
+
+        titles = [job["title"] for job in response.json()["results"]]
+        assert "Senior Django Engineer" not in titles
+        assert len(titles) == 2
+
+    def test_hidden_posting(self, api_client, employer_user, postings):
+        """Test that postings hidden from the user are not found, as for details."""
+        build_similar_postings(full=True)
+        job = postings["Django Developer"]
+        JobPosting.objects.filter(pk=job.pk).update(is_active=False)
+
+        response = api_client.get(similar_url(job.pk))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert (
+            api_client.get(reverse("job-detail", args=[job.pk])).status_code
+            == status.HTTP_404_NOT_FOUND
+        )
+
+        api_client.force_authenticate(user=employer_user)
+        response = api_client.get(similar_url(job.pk))
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["results"]) == 3
+
+    def test_not_built_yet(self, api_client, postings):
+        """Test that a posting without neighbours yet has none listed."""
+        response = api_client.get(similar_url(postings["Barista"].pk))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"results": []}
+
+    @pytest.mark.parametrize("job_id", [uuid.uuid4(), "not-a-uuid"])
+    def test_unknown_posting(self, api_client, job_id):
+        """Test that unknown or malformed posting IDs are not found."""
+        response = api_client.get(similar_url(job_id))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,81 @@
+import pytest
+from datetime import timedelta
+from django.db import connection
+from django.utils import timezone
+from job_listings.models import JobPosting
+from job_listings.cache import GLOBAL_SCOPE, get_generations
+from job_listings.signals import job_postings_expired
+from job_listings.tasks import deactivate_expired_postings
+from .factories import JobListingFactory
+
+
+def create_jobs(employer, count, days, **kwargs):
+    return JobListingFactory.create_batch(
+        count,
+        employer=employer,
+        expiration_date=timezone.now() + timedelta(days=days),
+        **kwargs,
+    )
+
+
+@pytest.mark.django_db
+class TestDeactivateExpiredPostings:
+    def test_deactivates_expired_postings_in_chunks(self, employer_user):
+        """Test that every expired posting is deactivated, and only those."""
+        expired = create_jobs(employer_user, 5, days=-1)
+        live = create_jobs(employer_user, 2, days=30)
+
+        assert deactivate_expired_postings(chunk_size=2) == 5
+
+        inactive = JobPosting.objects.filter(is_active=False)
+        assert set(inactive.values_list("pk", flat=True)) == {job.pk for job in expired}
+        assert all(job in JobPosting.objects.live() for job in live)
+        assert deactivate_expired_postings() == 0
+
+    def test_bumps_generations_and_sends_one_event(self, employer_user):
+        """Test that a run bumps the affected scopes and sends a single event."""
+        expired = create_jobs(employer_user, 3, days=-1)
+        create_jobs(employer_user, 1, days=30)
+        scopes = [
+            GLOBAL_SCOPE,
+            ("employer", employer_user.pk),
+            ("industry", expired[0].industry.name),
+        ]
+        before = get_generations(scopes)
+        events = []
+
+        def receiver(sender, job_ids, **kwargs):
+            events.append(job_ids)
+
+        job_postings_expired.connect(receiver)
+        try:
+            deactivate_expired_postings(chunk_size=2)
+            deactivate_expired_postings(chunk_size=2)
+        finally:
+            job_postings_expired.disconnect(receiver)
+
+        after = get_generations(scopes)
+        assert all(old != new for old, new in zip(before, after))
+        assert len(events) == 1
+        assert set(events[0]) == {job.pk for job in expired}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_sweep_skips_change_notifications(employer_user):
+    """Test that the sweep does not publish one notification per chunk."""
+    create_jobs(employer_user, 3, days=-1)
+
+    with connection.cursor() as cursor:
+        cursor.execute("LISTEN job_listings_changes")
+    deactivate_expired_postings(chunk_size=1)
+    JobPosting.objects.update(title="Chef")
+
+    connection.connection.poll()
+    notifies = list(connection.connection.notifies)
+    connection.connection.notifies.clear()
+    with connection.cursor() as cursor:
+        cursor.execute("UNLISTEN job_listings_changes")
+
+    # Only the regular update outside the sweep is published
+    assert len(notifies) == 1
+    assert JobPosting.objects.filter(is_active=True).count() == 0
@@ -0,0 +1,158 @@
+import time
+import uuid
+import pytest
+from unittest.mock import patch
+from django.urls import reverse
+from django.core.cache import cache
+from django_redis import get_redis_connection
+from job_listings.models import Industry, Skill
+from job_listings.taxonomy import (
+    INVALIDATION_CHANNEL,
+    LocalCache,
+    invalidate_taxonomy,
+    publish,
+    row_cache_key,
+)
+from job_listings.serializers import industry_cache, skill_cache
+
+
+def wait_until(condition, timeout=2):
+    """Wait for a condition set by the subscriber thread."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_local_cache_evicts_least_recently_used():
+    """Test that the L1 cache is bounded and keeps recently used entries."""
+    local_cache = LocalCache(maxsize=2, ttl=60)
+    local_cache.set("a", 1)
+    local_cache.set("b", 2)
+    local_cache.get("a")
+    local_cache.set("c", 3)
+
+    assert local_cache.get("a") == 1
+    assert local_cache.get("b") is None
+    assert local_cache.get("c") == 3
+
+
+def test_local_cache_expires_entries():
+    """Test that L1 entries expire after the TTL."""
+    local_cache = LocalCache(maxsize=2, ttl=0)
+    local_cache.set("a", 1)
+
+    assert local_cache.get("a") is None
+
+
+@pytest.mark.django_db
+class TestTaxonomyCache:
+    def test_l1_hit_skips_database_and_redis(self, industry, django_assert_num_queries):
+        """Test that a warm read touches neither Postgres nor Redis."""
+        assert industry_cache.get(industry.pk)["name"] == "NewTechnology"
+
+        with django_assert_num_queries(0), patch("job_listings.taxonomy.cache") as l2:
+            assert industry_cache.get(industry.pk)["name"] == "NewTechnology"
+        assert not l2.method_calls
+
+    def test_l2_hit_skips_database(self, industry, django_assert_num_queries):
+        """Test that another process can fill its L1 from Redis."""
+        industry_cache.get(industry.pk)
+        industry_cache.evict()
+
+        with django_assert_num_queries(0):
+            assert industry_cache.get(industry.pk)["name"] == "NewTechnology"
+
+    def test_rename_invalidates_both_tiers(
+        self, industry, django_capture_on_commit_callbacks
+    ):
+        """Test that renaming a row is visible immediately."""
+        industry_cache.get(industry.pk)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            industry.name = "Software"
+            industry.save()
+
+        assert industry_cache.get(industry.pk)["name"] == "Software"
+
+    def test_late_l2_fill_is_unreachable(self, industry):
+        """Test that a row loaded before a rename and cached after it is not served."""
+        stale_key = row_cache_key("industry", industry.pk)
+        stale = industry_cache.get(industry.pk)
+
+        Industry.objects.filter(pk=industry.pk).update(name="Software")
+        invalidate_taxonomy(Industry, [industry.pk])
+        cache.set(stale_key, stale)
+
+        assert industry_cache.get(industry.pk)["name"] == "Software"
+
+    def test_published_message_evicts_l1(self, industry):
+        """Test that the subscriber thread evicts L1 entries changed elsewhere."""
+        industry_cache.get(industry.pk)
+        wait_until(
+            lambda: get_redis_connection().pubsub_numsub(INVALIDATION_CHANNEL)[0][1]
+        )
+
+        # Simulate another worker renaming the row
+        Industry.objects.filter(pk=industry.pk).update(name="Software")
+        cache.clear()
+        publish({"model": "industry", "pks": [str(industry.pk)], "flush": False})
+
+        wait_until(lambda: industry_cache.rows.get(str(industry.pk)) is None)
+        assert industry_cache.get(industry.pk)["name"] == "Software"
+
+    def test_taxonomy_list_served_from_cache(
+        self, api_client, industry, django_assert_num_queries
+    ):
+        """Test that repeated taxonomy list requests do not query the database."""
+        first = api_client.get(reverse("industry-list"))
+
+        with django_assert_num_queries(0):
+            second = api_client.get(reverse("industry-list"))
+
+        assert second.json() == first.json()
+
+    def test_new_row_invalidates_lists(
+        self, api_client, industry, django_capture_on_commit_callbacks
+    ):
+        """Test that creating a row is visible in cached taxonomy lists."""
+        count = api_client.get(reverse("industry-list")).json()["count"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Industry.objects.create(name="Agriculture")
+
+        assert api_client.get(reverse("industry-list")).json()["count"] == count + 1
+
+    def test_job_posting_nested_taxonomy_from_cache(
+        self, api_client, job_listing, django_capture_on_commit_callbacks
+    ):
+        """Test that job postings render location and industry from the cache."""
+        job_listing.expiration_date = job_listing.posted_at.replace(year=2100)
+        job_listing.save()
+        response = api_client.get(reverse("job-detail", args=[job_listing.pk]))
+        assert response.json()["location"]["city"] == "San Francisco"
+
+        with django_capture_on_commit_callbacks(execute=True):
+            job_listing.location.city = "Oakland"
+            job_listing.location.save()
+
+        response = api_client.get(reverse("job-detail", args=[job_listing.pk]))
+        assert response.json()["location"]["city"] == "Oakland"
+
+
+@pytest.mark.django_db
+def test_get_many_fills_each_tier_once(django_assert_num_queries):
+    """Test that a cold batch read costs one query, and a warm one none."""
+    skills = [Skill.objects.create(name=f"NewSkill{n}") for n in range(3)]
+    pks = [skill.pk for skill in skills]
+
+    with django_assert_num_queries(1):
+        rows = skill_cache.get_many(pks + [uuid.uuid4()])
+    assert sorted(row["name"] for row in rows.values()) == [
+        "NewSkill0",
+        "NewSkill1",
+        "NewSkill2",
+    ]
+
+    skill_cache.evict()
+    with django_assert_num_queries(0):
+        assert skill_cache.get_many(pks) == rows
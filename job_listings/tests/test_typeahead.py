@@ -0,0 +1,116 @@
+import pytest
+from unittest.mock import patch
+from django.urls import reverse
+from django.db import OperationalError
+from job_listings.models import Industry, Location, Skill
+from job_listings.typeahead import MAX_LIMIT, prefix_query, suggest
+
+
+@pytest.fixture
+def skills():
+    names = [
+        "Kotlin Multiplatform",
+        "Spring Kotlin",
+        "Django REST Framework",
+        "Koa",
+        "Kotlin",
+    ]
+    return [Skill.objects.create(name=name) for name in names]
+
+
+def test_prefix_query_drops_punctuation():
+    """Test that user input is reduced to prefix words before building a tsquery."""
+    assert prefix_query("  ja|va & ") is not None
+    assert prefix_query(" &!:* ") is None
+
+
+@pytest.mark.django_db
+class TestTypeahead:
+    def test_matches_word_prefixes(self, skills):
+        """Test that every word of the term matches the start of a word."""
+        names = [skill.name for skill in suggest(Skill.objects.all(), "rest")]
+        assert names == ["Django REST Framework"]
+
+        names = [skill.name for skill in suggest(Skill.objects.all(), "fram djan")]
+        assert names == ["Django REST Framework"]
+
+        assert suggest(Skill.objects.all(), "otlin") == []
+
+    def test_ranks_whole_term_prefix_then_length(self, skills):
+        """Test that names starting with the term come first, shortest first."""
+        names = [skill.name for skill in suggest(Skill.objects.all(), "ko")]
+        assert names == ["Koa", "Kotlin", "Kotlin Multiplatform", "Spring Kotlin"]
+
+    def test_location_matches_any_column(self):
+        """Test that locations match on city, state, country or postal code."""
+        location = Location.objects.create(
+            city="Los Angeles",
+            state_or_province="California",
+            country="Freedonia",
+            postal_code="90001",
+        )
+
+        for term in ("los an", "calif", "freedon", "9000"):
+            assert suggest(Location.objects.all(), term) == [location]
+
+    def test_over_budget_returns_none(self, skills):
+        """Test that a cancelled suggestion query does not fail the request."""
+        with patch(
+            "job_listings.typeahead.connection.cursor",
+            side_effect=OperationalError("canceling statement due to timeout"),
+        ):
+            assert suggest(Skill.objects.all(), "ko") is None
+
+
+@pytest.mark.django_db
+class TestTypeaheadViews:
+    def test_autocomplete_returns_ranked_top_k(self, api_client, skills):
+        """Test that the autocomplete action returns the best `limit` matches."""
+        url = reverse("skill-autocomplete")
+
+        response = api_client.get(url, {"q": "KO", "limit": 2})
+
+        assert response.status_code == 200
+        assert [skill["name"] for skill in response.json()] == ["Koa", "Kotlin"]
+
+    def test_autocomplete_limit_is_bounded(self, api_client):
+        """Test that clients cannot request more than `MAX_LIMIT` suggestions."""
+        Industry.objects.bulk_create(
+            Industry(name=f"Tech {n}") for n in range(MAX_LIMIT + 5)
+        )
+
+        response = api_client.get(
+            reverse("industry-autocomplete"), {"q": "tech", "limit": 1000}
+        )
+
+        assert len(response.json()) == MAX_LIMIT
+
+    def test_autocomplete_served_from_cache(
+        self, api_client, skills, django_assert_num_queries
+    ):
+        """Test that repeated keystrokes do not query the database."""
+        url = reverse("skill-autocomplete")
+        first = api_client.get(url, {"q": "ko"})
+
+        with django_assert_num_queries(0):
+            second = api_client.get(url, {"q": " Ko "})
+
+        assert second.json() == first.json()
+
+    def test_autocomplete_not_cached_over_budget(self, api_client, skills):
+        """Test that an empty response caused by the budget is not cached."""
+        url = reverse("skill-autocomplete")
+        with patch("job_listings.views.suggest", return_value=None):
+            assert api_client.get(url, {"q": "ko"}).json() == []
+
+        assert len(api_client.get(url, {"q": "ko"}).json()) == 4
+
+    def test_search_uses_typeahead(self, api_client):
+        """Test that `?search=` on taxonomy lists matches by word prefix."""
+        Location.objects.create(city="Los Angeles", country="Freedonia")
+
+        response = api_client.get(reverse("location-list"), {"search": "los an"})
+        assert response.json()["count"] == 1
+
+        response = api_client.get(reverse("location-list"), {"search": "ngeles"})
+        assert response.json()["count"] == 0
@@ -0,0 +1,528 @@
+import pytest
+from datetime import timedelta
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from job_listings.cache import TAXONOMY_SCOPE, bump_generations
+from job_listings.tasks import build_job_documents
+from job_listings.views import JobPostingViewSet
+from .factories import JobListingFactory, SkillFactory
+
+
+@pytest.fixture
+def future_date():
+    return timezone.now() + timedelta(days=30)
+
+
+@pytest.mark.django_db
+class TestJobPostingSearch:
+    def test_search_matches_title_and_description(
+        self, api_client, employer_user, future_date
+    ):
+        """Test that search uses stemmed matching over title and description."""
+        JobListingFactory.create(
+            employer=employer_user,
+            title="Python Developer",
+            description="Build services.",
+            expiration_date=future_date,
+        )
+        JobListingFactory.create(
+            employer=employer_user,
+            title="Accountant",
+            description="Some developers welcome.",
+            expiration_date=future_date,
+        )
+        JobListingFactory.create(
+            employer=employer_user,
+            title="Chef",
+            description="Cook food.",
+            expiration_date=future_date,
+        )
+
+        response = api_client.get(reverse("job-list"), {"search": "developer"})
+
+        assert response.status_code == status.HTTP_200_OK
+        titles = [job["title"] for job in response.data["results"]]
+        # Title matches rank above description matches
+        assert titles == ["Python Developer", "Accountant"]
+
+    def test_search_excludes_expired_postings(
+        self, api_client, employer_user, future_date
+    ):
+        """Test that public search only returns live postings."""
+        JobListingFactory.create(
+            employer=employer_user,
+            title="Python Developer",
+            expiration_date=future_date,
+        )
+        JobListingFactory.create(
+            employer=employer_user,
+            title="Python Engineer",
+            expiration_date=timezone.now() - timedelta(days=1),
+        )
+
+        response = api_client.get(reverse("job-list"), {"search": "python"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [job["title"] for job in response.data["results"]] == [
+            "Python Developer"
+        ]
+
+
+@pytest.mark.django_db
+class TestJobPostingCursorPagination:
+    @pytest.fixture
+    def jobs(self, employer_user, future_date):
+        return [
+            JobListingFactory.create(
+                employer=employer_user,
+                expiration_date=future_date + timedelta(days=index),
+            )
+            for index in range(7)
+        ]
+
+    def test_page_number_pagination_is_default(self, api_client, jobs):
+        """Test that list responses keep the page-number format by default."""
+        response = api_client.get(reverse("job-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 7
+
+    def test_cursor_pagination_walks_all_pages(self, api_client, jobs):
+        """Test that cursor mode returns every posting once, newest first, without a count."""
+        response = api_client.get(reverse("job-list"), {"pagination": "cursor"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "count" not in response.data
+        assert response.data["previous"] is None
+        seen = [job["job_id"] for job in response.data["results"]]
+
+        response = api_client.get(response.data["next"])
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["next"] is None
+        seen += [job["job_id"] for job in response.data["results"]]
+
+        expected = sorted(jobs, key=lambda job: job.posted_at, reverse=True)
+        assert seen == [str(job.job_id) for job in expected]
+
+    def test_cursor_pagination_honours_ordering(self, api_client, jobs):
+        """Test that cursor mode can be keyed on expiration_date."""
+        response = api_client.get(
+            reverse("job-list"),
+            {"pagination": "cursor", "ordering": "expiration_date", "page_size": 3},
+        )
+
+        assert [job["job_id"] for job in response.data["results"]] == [
+            str(job.job_id) for job in jobs[:3]
+        ]
+        response = api_client.get(response.data["next"])
+        assert [job["job_id"] for job in response.data["results"]] == [
+            str(job.job_id) for job in jobs[3:6]
+        ]
+
+    def test_unpaginated_actions_have_no_paginator(self):
+        """Test that actions without pagination ignore the cursor opt-in."""
+        for action in ("export", "recommended", "similar"):
+            view = JobPostingViewSet(action=action)
+            view.pagination_class = getattr(JobPostingViewSet, action).kwargs[
+                "pagination_class"
+            ]
+            view.request = Request(
+                APIRequestFactory().get("/", {"pagination": "cursor"})
+            )
+            assert view.paginator is None
+
+    def test_schema(self, api_client):
+        """Test that the API schema is generated, unpaginated actions included."""
+        response = api_client.get(reverse("schema-json"), {"format": "openapi"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "/jobs/{job_id}/similar/" in response.json()["paths"]
+
+
+@pytest.mark.django_db
+class TestJobPostingListCacheInvalidation:
+    @pytest.fixture
+    def job(self, employer_user, future_date):
+        return JobListingFactory.create(
+            employer=employer_user,
+            title="Python Developer",
+            expiration_date=future_date,
+        )
+
+    def test_update_invalidates_cached_lists(self, api_client, employer_user, job):
+        """Test that an update is visible immediately to cached public lists."""
+        response = api_client.get(reverse("job-list"), {"search": "python"})
+        assert response.data["count"] == 1
+
+        client = APIClient()
+        client.force_authenticate(user=employer_user)
+        response = client.patch(
+            reverse("job-detail", args=[job.job_id]), {"title": "Chef"}, format="json"
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = api_client.get(reverse("job-list"), {"search": "python"})
+        assert response.data["count"] == 0
+        response = api_client.get(reverse("job-list"), {"search": "chef"})
+        assert response.data["count"] == 1
+
+    def test_destroy_soft_deletes_and_invalidates(self, api_client, employer_user, job):
+        """Test that deleting a posting deactivates it and drops it from cached lists."""
+        assert api_client.get(reverse("job-list")).data["count"] == 1
+
+        client = APIClient()
+        client.force_authenticate(user=employer_user)
+        response = client.delete(reverse("job-detail", args=[job.job_id]))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        job.refresh_from_db()
+        assert job.is_active is False
+        assert api_client.get(reverse("job-list")).data["count"] == 0
+
+
+@pytest.mark.django_db
+class TestJobPostingResponseCache:
+    @pytest.fixture
+    def jobs(self, employer_user, future_date):
+        return [
+            JobListingFactory.create(
+                employer=employer_user,
+                title="Python Developer",
+                expiration_date=future_date,
+            ),
+            JobListingFactory.create(
+                employer=employer_user,
+                title="Python Tester",
+                is_active=False,
+                expiration_date=future_date,
+            ),
+        ]
+
+    def test_cache_hit_skips_database(
+        self, api_client, jobs, django_assert_num_queries
+    ):
+        """Test that a repeated anonymous list request is served from the cache."""
+        first = api_client.get(reverse("job-list"), {"search": "python"})
+
+        with django_assert_num_queries(0):
+            second = api_client.get(reverse("job-list"), {"search": "python"})
+
+        assert second.status_code == status.HTTP_200_OK
+        assert second.content == first.content
+        assert second["Content-Type"] == first["Content-Type"]
+
+    def test_equivalent_query_params_share_entry(
+        self, api_client, jobs, django_assert_num_queries
+    ):
+        """Test that parameter order, case and defaults are canonicalized."""
+        api_client.get(reverse("job-list") + "?search=Python&ordering=posted_at")
+
+        with django_assert_num_queries(0):
+            response = api_client.get(
+                reverse("job-list") + "?ordering=posted_at&page=1&search=%20python"
+            )
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_audiences_do_not_share_entries(self, api_client, employer_user, jobs):
+        """Test that employers do not receive the public cached page and vice versa."""
+        assert api_client.get(reverse("job-list")).json()["count"] == 1
+
+        client = APIClient()
+        client.force_authenticate(user=employer_user)
+        assert client.get(reverse("job-list")).json()["count"] == 2
+
+        assert api_client.get(reverse("job-list")).json()["count"] == 1
+
+    def test_id_window_reused_after_taxonomy_change(
+        self, api_client, jobs, django_assert_num_queries
+    ):
+        """Test that a re-render after a taxonomy change loads the cached IDs by key."""
+        build_job_documents()
+        first = api_client.get(reverse("job-list"), {"search": "python"}).json()
+        bump_generations([TAXONOMY_SCOPE])
+
+        # One query for the postings' pre-rendered documents
+        with django_assert_num_queries(1):
+            second = api_client.get(reverse("job-list"), {"search": "python"}).json()
+
+        assert second == first
+
+
+@pytest.mark.django_db
+class TestJobPostingFacets:
+    @pytest.fixture
+    def postings(self, employer_user, future_date, location, industry):
+        """Two full-time postings in San Francisco and one contract elsewhere."""
+        JobListingFactory.create(
+            employer=employer_user,
+            title="Python Developer",
+            location=location,
+            industry=industry,
+            salary_min=80000,
+            expiration_date=future_date,
+        )
+        JobListingFactory.create(
+            employer=employer_user,
+            title="Django Developer",
+            location=location,
+            industry=industry,
+            salary_min=120000,
+            salary_max=150000,
+            expiration_date=future_date,
+        )
+        JobListingFactory.create(
+            employer=employer_user,
+            title="Chef",
+            job_type="contract",
+            location__city="Berlin",
+            location__country="Germany",
+            expiration_date=future_date,
+        )
+
+    def test_facet_counts(self, api_client, postings):
+        """Test that every facet is counted over the visible postings."""
+        response = api_client.get(reverse("job-facets"))
+
+        assert response.status_code == status.HTTP_200_OK
+        facets = response.json()
+        assert facets["job_type"] == [
+            {"value": "full-time", "count": 2},
+            {"value": "contract", "count": 1},
+        ]
+        assert {"value": "NewTechnology", "count": 2} in facets["industry"]
+        assert facets["location_country"] == [
+            {"value": "USA", "count": 2},
+            {"value": "Germany", "count": 1},
+        ]
+        assert facets["location_city"] == [
+            {"value": "San Francisco", "country": "USA", "count": 2},
+            {"value": "Berlin", "country": "Germany", "count": 1},
+        ]
+        assert facets["salary_band"] == [
+            {"currency": "ZAR", "min": 0, "max": 100000, "count": 1},
+            {"currency": "ZAR", "min": 100000, "max": 250000, "count": 1},
+        ]
+
+    def test_facets_apply_filters_and_search(self, api_client, postings):
+        """Test that facets take the same filter and search parameters as the list."""
+        response = api_client.get(
+            reverse("job-facets"), {"search": "developer", "job_type": "full-time"}
+        )
+
+        assert response.json()["location_city"] == [
+            {"value": "San Francisco", "country": "USA", "count": 2}
+        ]
+
+        response = api_client.get(reverse("job-facets"), {"job_type": "contract"})
+        assert response.json()["job_type"] == [{"value": "contract", "count": 1}]
+
+    def test_facets_single_query_and_cached(
+        self, api_client, postings, django_assert_num_queries
+    ):
+        """Test that facets cost one query, then none while cached."""
+        with django_assert_num_queries(1):
+            first = api_client.get(reverse("job-facets"))
+
+        with django_assert_num_queries(0):
+            # Page and ordering do not change the facets
+            second = api_client.get(
+                reverse("job-facets"), {"page": 2, "ordering": "posted_at"}
+            )
+
+        assert second.json() == first.json()
+
+    def test_facets_invalidated_by_writes(
+        self, api_client, postings, employer_user, future_date
+    ):
+        """Test that a new posting is reflected in cached facets."""
+        api_client.get(reverse("job-facets"))
+
+        JobListingFactory.create(
+            employer=employer_user,
+            job_type="internship",
+            expiration_date=future_date,
+        )
+        bump_generations([("global",)])
+
+        job_types = api_client.get(reverse("job-facets")).json()["job_type"]
+        assert {"value": "internship", "count": 1} in job_types
+
+
+@pytest.mark.django_db
+class TestJobPostingSalary:
+    @pytest.fixture
+    def postings(self, employer_user, future_date):
+        """Postings with different salary ranges, keyed by title."""
+        salaries = {
+            "Junior": (30000, 50000, "ZAR"),
+            "Mid": (60000, 90000, "ZAR"),
+            "Senior": (100000, None, "ZAR"),
+            "Remote": (60000, 80000, "USD"),
+            "Volunteer": (None, None, "ZAR"),
+        }
+        for title, (salary_min, salary_max, currency) in salaries.items():
+            JobListingFactory.create(
+                employer=employer_user,
+                title=title,
+                salary_min=salary_min,
+                salary_max=salary_max,
+                currency=currency,
+                expiration_date=future_date,
+            )
+
+    def get_titles(self, api_client, params):
+        response = api_client.get(reverse("job-list"), {"page_size": 50, **params})
+        assert response.status_code == status.HTTP_200_OK
+        return sorted(job["title"] for job in response.json()["results"])
+
+    def test_salary_range_overlap(self, api_client, postings):
+        """Test that postings whose salary range overlaps the requested one match."""
+        params = {"min_salary": 45000, "max_salary": 70000}
+        assert self.get_titles(api_client, params) == ["Junior", "Mid"]
+
+        # A posting with a single bound pays exactly that amount
+        assert self.get_titles(api_client, {"min_salary": 95000}) == ["Senior"]
+        assert self.get_titles(api_client, {"max_salary": 100000}) == [
+            "Junior",
+            "Mid",
+            "Senior",
+        ]
+
+    def test_salary_filters_are_currency_aware(self, api_client, postings):
+        """Test that amounts are compared in the requested or default currency."""
+        params = {"min_salary": 70000, "currency": "usd"}
+        assert self.get_titles(api_client, params) == ["Remote"]
+
+        assert "Remote" not in self.get_titles(api_client, {"min_salary": 70000})
+
+    def test_order_by_salary_lists_unpaid_last(self, api_client, postings):
+        """Test that salary ordering puts postings without a salary last."""
+        # Senior has no maximum either, so it ties with Volunteer
+        for ordering in ("salary_max", "-salary_max"):
+            response = api_client.get(reverse("job-list"), {"ordering": ordering})
+            titles = [job["title"] for job in response.json()["results"]]
+            assert set(titles[-2:]) == {"Senior", "Volunteer"}
+
+        response = api_client.get(
+            reverse("job-list"), {"ordering": "-salary_min", "currency": "ZAR"}
+        )
+        titles = [job["title"] for job in response.json()["results"]]
+        assert titles == ["Senior", "Mid", "Junior", "Volunteer"]
+
+    def test_cursor_pagination_ignores_salary_ordering(self, api_client, postings):
+        """Test that keyset pages fall back to the default order for salaries."""
+        response = api_client.get(
+            reverse("job-list"), {"pagination": "cursor", "ordering": "-salary_max"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["results"][0]["title"] == "Volunteer"
+
+    def test_currency_stored_upper_case(self, api_client, employer_user, future_date):
+        """Test that currency codes are normalized on write."""
+        api_client.force_authenticate(user=employer_user)
+        response = api_client.post(
+            reverse("job-list"),
+            {
+                "title": "Accountant",
+                "description": "Keep the books.",
+                "job_type": "full-time",
+                "location": {"city": "Cape Town", "country": "South Africa"},
+                "industry": {"name": "Bookkeeping"},
+                "skills_required": [{"name": "Ledgers"}],
+                "salary_min": "10000.00",
+                "currency": " usd",
+                "expiration_date": future_date.isoformat(),
+            },
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["currency"] == "USD"
+
+
+@pytest.mark.django_db
+class TestJobPostingSkillsFilter:
+    @pytest.fixture
+    def postings(self, employer_user, future_date):
+        """Postings requiring different skill sets, keyed by title."""
+        python, sql, go = (
+            SkillFactory.create(name=name) for name in ("NewPython", "NewSQL", "NewGo")
+        )
+        for title, skills in {
+            "Data Engineer": [python, sql],
+            "Backend Engineer": [python, go],
+            "DBA": [sql],
+        }.items():
+            JobListingFactory.create(
+                employer=employer_user,
+                title=title,
+                skills_required=skills,
+                expiration_date=future_date,
+            )
+
+    def get_titles(self, api_client, params):
+        response = api_client.get(reverse("job-list"), params)
+        assert response.status_code == status.HTTP_200_OK
+        return sorted(job["title"] for job in response.json()["results"])
+
+    def test_skills_match_all_by_default(self, api_client, postings):
+        """Test that postings must require every listed skill, ignoring case."""
+        params = {"skills": "newpython, NEWSQL"}
+        assert self.get_titles(api_client, params) == ["Data Engineer"]
+
+    def test_skills_match_any(self, api_client, postings):
+        """Test that `skills_match=any` selects postings requiring any listed skill."""
+        params = {"skills": "NewGo,NewSQL", "skills_match": "any"}
+        assert self.get_titles(api_client, params) == [
+            "Backend Engineer",
+            "DBA",
+            "Data Engineer",
+        ]
+
+    def test_unknown_skill(self, api_client, postings):
+        """Test that an unknown skill matches nothing for `all`, and is ignored for `any`."""
+        assert self.get_titles(api_client, {"skills": "NewPython,Cobol"}) == []
+
+        params = {"skills": "NewGo,Cobol", "skills_match": "any"}
+        assert self.get_titles(api_client, params) == ["Backend Engineer"]
+
+    def test_skill_names_differing_in_case(
+        self, api_client, employer_user, future_date, postings
+    ):
+        """Test that a name matching several skills requires any one of them."""
+        lower_python = SkillFactory.create(name="newpython")
+        JobListingFactory.create(
+            employer=employer_user,
+            title="Scripter",
+            skills_required=[lower_python],
+            expiration_date=future_date,
+        )
+
+        assert self.get_titles(api_client, {"skills": "NewPython"}) == [
+            "Backend Engineer",
+            "Data Engineer",
+            "Scripter",
+        ]
+        params = {"skills": "NEWPYTHON,NewGo"}
+        assert self.get_titles(api_client, params) == ["Backend Engineer"]
+
+    def test_list_renders_skills_without_prefetch(
+        self, api_client, postings, django_assert_num_queries
+    ):
+        """Test that skills are rendered from `skill_ids` and the taxonomy cache."""
+        api_client.get(reverse("job-list"))
+
+        # Uncached page, without documents: one query for the count, one for
+        # the page's documents, one for the postings
+        with django_assert_num_queries(3):
+            response = api_client.get(reverse("job-list"), {"page_size": 10})
+
+        skills = {
+            job["title"]: [skill["name"] for skill in job["skills_required"]]
+            for job in response.json()["results"]
+        }
+        assert skills["Data Engineer"] == ["NewPython", "NewSQL"]
@@ -0,0 +1,112 @@
+"""
+Indexed typeahead for the `Industry`, `Location` and `Skill` search endpoints.
+
+Each keystroke is matched by *word prefix* against a `simple` text search
+vector of the searchable columns (`tec` matches "Information Technology",
+`los ang` matches "Los Angeles"). The vectors are covered by the expression
+GIN indexes declared on the models, so lookups never scan the table the way
+`%term%` patterns do.
+
+Matches are ranked so that names starting with the whole term come first,
+then shorter names, then alphabetically.
+"""
+
+import re
+from django.db import OperationalError, connection, transaction
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.db.models.functions import Length
+from django.contrib.postgres.search import SearchQuery
+from .models import Industry, Location, Skill, TYPEAHEAD_CONFIG, typeahead_vector
+
+# Searchable columns of each model, in the order of their typeahead index.
+# The first column is the display name used for ranking.
+TYPEAHEAD_FIELDS = {
+    Industry: ("name",),
+    Location: ("city", "state_or_province", "country", "postal_code"),
+    Skill: ("name",),
+}
+
+# Number of suggestions returned by default, and at most
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 25
+
+# Hard budget (in milliseconds) for a suggestion query. Postgres cancels
+# slower queries and no suggestions are returned for that keystroke.
+TIMEOUT_MS = 50
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def prefix_query(term):
+    """
+    Return a `SearchQuery` matching every word of `term` as a prefix, or None
+    if `term` has no words. Punctuation is dropped, so user input can never
+    produce an invalid `tsquery`.
+    """
+    words = WORD_PATTERN.findall(term.lower())
+    if not words:
+        return None
+
+    return SearchQuery(
+        " & ".join(f"{word}:*" for word in words),
+        search_type="raw",
+        config=TYPEAHEAD_CONFIG,
+    )
+
+
+def typeahead_filter(queryset, term):
+    """
+    Filter a taxonomy queryset to the rows matching `term` by word prefix,
+    ranked best match first. Blank terms leave the queryset unchanged.
+    """
+    query = prefix_query(term)
+    if query is None:
+        return queryset
+
+    fields = TYPEAHEAD_FIELDS[queryset.model]
+    name = fields[0]
+    return (
+        queryset.annotate(typeahead=typeahead_vector(*fields))
+        .filter(typeahead=query)
+        .annotate(
+            starts_with=ExpressionWrapper(
+                Q(**{f"{name}__istartswith": " ".join(term.split())}),
+                output_field=BooleanField(),
+            )
+        )
+        .order_by("-starts_with", Length(name), name)
+    )
+
+
+def parse_limit(value):
+    """Return the number of suggestions requested by `value`, within bounds."""
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_LIMIT
+    return min(max(limit, 1), MAX_LIMIT)
+
+
+def suggest(queryset, term, limit=DEFAULT_LIMIT):
+    """
+    Return up to `limit` rows of `queryset` matching `term`, best match first.
+
+    The query runs under a `TIMEOUT_MS` statement timeout. If it is cancelled,
+    None is returned rather than holding up the request.
+    """
+    if prefix_query(term) is None:
+        return []
+
+    queryset = typeahead_filter(queryset, term)[:limit]
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL statement_timeout = %s", [TIMEOUT_MS])
+            suggestions = list(queryset)
+            with connection.cursor() as cursor:
+                # Do not leak the budget into an enclosing transaction
+                cursor.execute("SET LOCAL statement_timeout = DEFAULT")
+    except OperationalError:
+        return None
+
+    return suggestions
@@ -1,24 +1,122 @@
-from datetime import datetime
-from rest_framework import filters
+import uuid
+from rest_framework import status
 from rest_framework.response import Response
+from rest_framework.decorators import action
 from rest_framework import viewsets, permissions
-from rest_framework.pagination import PageNumberPagination
-from django.db.models import Q, F
+from rest_framework.pagination import PageNumberPagination, CursorPagination
+from django.db.models import Exists, F, Func, IntegerField, Subquery, UUIDField
+from django.utils import timezone
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.core.paginator import Page
 from django.core.cache import cache
 from django_filters.rest_framework import DjangoFilterBackend
-from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
-from .models import JobPosting, Location, Industry, Skill
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from .models import (
+    JobPosting,
+    Location,
+    Industry,
+    Skill,
+    SimilarJobPostings,
+    SEARCH_CONFIG,
+)
 from .serializers import (
     JobPostingSerializer,
     LocationSerializer,
     IndustrySerializer,
     SkillSerializer,
+    industry_cache,
+    location_cache,
+    skill_cache,
+)
+from .filters import JobPostingFilter, JobPostingOrderingFilter
+from .typeahead import parse_limit, suggest, typeahead_filter
+from .facets import facet_counts
+from .imports import import_job_postings, import_rows
+from .exports import CSVRenderer, NDJSONRenderer, export_job_postings
+from .fieldsets import FIELDSET_QUERY_PARAMS, model_fields, pick, selected_fields
+from .conditional import (
+    content_digest,
+    make_etag,
+    not_modified,
+    set_validators,
+)
+from .documents import StitchedResponse, load_documents, stitch
+from .recommendations import get_recommendations
+from .cache import (
+    DETAIL_CACHE_TIMEOUT,
+    LIST_CACHE_TIMEOUT,
+    PAGE_QUERY_PARAMS,
+    audience,
+    bump_generations,
+    canonical_query_params,
+    detail_cache_keys,
+    id_window_scopes,
+    list_scopes,
+    pack_ids,
+    posting_scopes,
+    unpack_ids,
+    versioned_key,
 )
-from .filters import JobPostingFilter
 from permissions import IsJobseeker, IsEmployer, IsJobBoardAdmin
 
 
-class IndustryViewSet(viewsets.ModelViewSet):
+class CachedTaxonomyMixin:
+    """
+    Serves taxonomy list and detail reads from the two-tier taxonomy cache
+    (`job_listings.taxonomy`). In steady state a read costs no database query
+    and no network round trip.
+
+    Subclasses set `taxonomy_cache`.
+    """
+
+    taxonomy_cache = None
+
+    def list(self, request, *args, **kwargs):
+        list_view = super().list
+
+        def load():
+            data = list_view(request, *args, **kwargs).data
+            # Drop the serializer references held by DRF's return types
+            if isinstance(data, list):
+                return list(data)
+            return {**data, "results": list(data["results"])}
+
+        cache_key = (
+            request.build_absolute_uri(request.path),
+            canonical_query_params(request.query_params),
+        )
+        return Response(self.taxonomy_cache.get_list(cache_key, load))
+
+    def retrieve(self, request, *args, **kwargs):
+        data = self.taxonomy_cache.get(kwargs["pk"])
+        if data is None:
+            return super().retrieve(request, *args, **kwargs)
+        return Response(data)
+
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def autocomplete(self, request, *args, **kwargs):
+        """
+        Returns the top matches for a search-as-you-type term, best match first.
+
+        Query parameters:
+        - **q**: The term typed so far. Every word is matched as a prefix.
+        - **limit**: Number of suggestions, 10 by default and at most 25.
+        """
+        term = " ".join(request.query_params.get("q", "").lower().split())
+        limit = parse_limit(request.query_params.get("limit"))
+
+        def load():
+            suggestions = suggest(self.queryset.all(), term, limit)
+            if suggestions is None:
+                # Over the latency budget, do not cache the empty response
+                return None
+            return list(self.get_serializer(suggestions, many=True).data)
+
+        cache_key = ("autocomplete", term, limit)
+        return Response(self.taxonomy_cache.get_list(cache_key, load) or [])
+
+
+class IndustryViewSet(CachedTaxonomyMixin, viewsets.ModelViewSet):
     """
     API endpoint to manage industries with search support.
 
@@ -27,6 +125,11 @@ class IndustryViewSet(viewsets.ModelViewSet):
     You can search for industries based on the `name` attribute.
     This can be used to integrate a search-as-you-type functionality
     on the frontend.
+    Every word of the search term is matched as a prefix, using an index.
+
+    ## Autocomplete:
+    Example: `GET /industries/autocomplete/?q=Tech&limit=10`
+    Returns the top matches for a search-as-you-type term, best match first.
 
     ## Permissions:
     - Read: **Open to everyone**
@@ -35,6 +138,7 @@ class IndustryViewSet(viewsets.ModelViewSet):
 
     queryset = Industry.objects.all()
     serializer_class = IndustrySerializer
+    taxonomy_cache = industry_cache
     permission_classes = [permissions.AllowAny]
 
     def get_queryset(self):
@@ -51,12 +155,12 @@ class IndustryViewSet(viewsets.ModelViewSet):
         queryset = super().get_queryset()
 
         if search_query:
-            return queryset.filter(name__icontains=search_query)
+            return typeahead_filter(queryset, search_query)
 
         return queryset
 
 
-class LocationViewSet(viewsets.ModelViewSet):
+class LocationViewSet(CachedTaxonomyMixin, viewsets.ModelViewSet):
     """
     API endpoint to manage job locations with search support.
 
@@ -65,6 +169,11 @@ class LocationViewSet(viewsets.ModelViewSet):
     You can search for locations based on the `city`, `postal_code`,
     `state_or_province`, and `country`. This can be used to integrate
     a search-as-you-type functionality on the frontend.
+    Every word of the search term is matched as a prefix, using an index.
+
+    ## Autocomplete:
+    Example: `GET /locations/autocomplete/?q=Johan&limit=10`
+    Returns the top matches for a search-as-you-type term, best match first.
 
     ## Permissions:
     - Read: **Open to everyone**
@@ -73,6 +182,7 @@ class LocationViewSet(viewsets.ModelViewSet):
 
     queryset = Location.objects.all()
     serializer_class = LocationSerializer
+    taxonomy_cache = location_cache
     permission_classes = [permissions.AllowAny]
 
     def get_queryset(self):
@@ -89,17 +199,12 @@ class LocationViewSet(viewsets.ModelViewSet):
         queryset = super().get_queryset()
 
         if search_query:
-            return queryset.filter(
-                Q(city__icontains=search_query)
-                | Q(postal_code__icontains=search_query)
-                | Q(state_or_province__icontains=search_query)
-                | Q(country__icontains=search_query)
-            )
+            return typeahead_filter(queryset, search_query)
 
         return queryset
 
 
-class SkillViewSet(viewsets.ModelViewSet):
+class SkillViewSet(CachedTaxonomyMixin, viewsets.ModelViewSet):
     """
     API endpoint to manage job-related skills with search support.
 
@@ -108,6 +213,11 @@ class SkillViewSet(viewsets.ModelViewSet):
     You can search for skills based on the `name` attribute.
     This can be used to integrate a search-as-you-type functionality
     on the frontend.
+    Every word of the search term is matched as a prefix, using an index.
+
+    ## Autocomplete:
+    Example: `GET /skills/autocomplete/?q=Pyt&limit=10`
+    Returns the top matches for a search-as-you-type term, best match first.
 
     ## Permissions:
     - Read: **Open to everyone**
@@ -116,6 +226,7 @@ class SkillViewSet(viewsets.ModelViewSet):
 
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
+    taxonomy_cache = skill_cache
     permission_classes = [permissions.AllowAny]
 
     def get_queryset(self):
@@ -132,7 +243,7 @@ class SkillViewSet(viewsets.ModelViewSet):
         queryset = super().get_queryset()
 
         if search_query:
-            return queryset.filter(name__icontains=search_query)
+            return typeahead_filter(queryset, search_query)
 
         return queryset
 
@@ -155,6 +266,75 @@ class CustomUserPagination(PageNumberPagination):
     page_size_query_param = "page_size"
     max_page_size = 50
 
+    def paginate_window(self, queryset, request, count, ids):
+        """
+        Rebuilds the requested page from a cached window of IDs.
+
+        The total `count` is taken from the cache, so no `COUNT(*)` is run, and
+        the page objects are loaded by primary key in the cached order.
+
+        Arguments:
+        - **queryset**: Base queryset used to load the objects (keeps `select_related`
+        and `prefetch_related`), or None to return the page's IDs unloaded.
+        - **request**: The current request.
+        - **count**: Cached total number of results.
+        - **ids**: Cached primary keys of the page, in order.
+        """
+        paginator = self.django_paginator_class(queryset, self.get_page_size(request))
+        paginator.count = count
+        page_number = paginator.validate_number(
+            self.get_page_number(request, paginator)
+        )
+        if queryset is None:
+            object_list = list(ids)
+        else:
+            objects = queryset.in_bulk(ids)
+            object_list = [objects[pk] for pk in ids if pk in objects]
+
+        self.page = Page(object_list, page_number, paginator)
+        self.request = request
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+
+        return list(self.page)
+
+
+class JobPostingCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination for job postings.
+
+    Pages are fetched with `WHERE posted_at < <cursor position>` instead of an
+    `OFFSET`, and no `COUNT(*)` is run, so every page costs the same as the first.
+    The response only contains opaque `next`/`previous` cursors.
+
+    **Attributes:**
+    - `ordering`: Default keyset, newest postings first with `job_id` as tie-breaker.
+    - `tie_breaker`: Unique field appended to any client-requested ordering
+    (e.g. `?ordering=expiration_date`) so the page order is deterministic.
+    - `keyset_fields`: Non-nullable fields that cursors can be built from.
+    """
+
+    page_size = CustomUserPagination.page_size
+    page_size_query_param = CustomUserPagination.page_size_query_param
+    max_page_size = CustomUserPagination.max_page_size
+    ordering = ("-posted_at", "job_id")
+    tie_breaker = "job_id"
+    keyset_fields = {"posted_at", "expiration_date", "job_id"}
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return the requested ordering with the unique tie-breaker appended.
+
+        Nullable fields (e.g. salaries) cannot be paged by keyset, so orderings
+        on anything but `keyset_fields` fall back to the default ordering.
+        """
+        ordering = super().get_ordering(request, queryset, view)
+        if any(field.lstrip("-") not in self.keyset_fields for field in ordering):
+            ordering = self.ordering
+        if self.tie_breaker not in ordering:
+            ordering += (self.tie_breaker,)
+        return ordering
+
 
 class JobPostingViewSet(viewsets.ModelViewSet):
     """
@@ -252,12 +432,87 @@ class JobPostingViewSet(viewsets.ModelViewSet):
     - `GET /jobs/?location={location_id}` → Filter jobs by location
     - `GET /jobs/?job_type={job_type}` → Filter jobs by job type
     - `GET /jobs/?industry=tech&location=1&job_type=full-time` → Combined filter
+    - `GET /jobs/?skills=python,sql` → Jobs requiring both skills
+    - `GET /jobs/?skills=python,sql&skills_match=any` → Jobs requiring either skill
+
+    **Salary:**
+    Salary filters select postings whose salary range overlaps the requested
+    one. Amounts are in `currency`, the default posting currency (ZAR) if omitted.
+    - `GET /jobs/?min_salary=50000&max_salary=90000` → Ranges overlapping 50k-90k ZAR
+    - `GET /jobs/?min_salary=60000&currency=USD` → Paying at least 60k USD
+    - `GET /jobs/?ordering=-salary_max` → Best paid first, postings without a salary last
+
+    **Radius search:**
+    `near=<latitude>,<longitude>` selects postings located within `radius_km`
+    kilometres (default 50, at most 1000) of a point. Location coordinates come
+    from a bundled gazetteer of cities, so postings in cities it does not list
+    never match. Order by distance with `ordering=distance`.
+    - `GET /jobs/?near=-33.92,18.42&radius_km=25` → Within 25 km of Cape Town
+    - `GET /jobs/?near=51.51,-0.13&ordering=distance` → Nearest first, within 50 km of London
 
     **Searching:**
-    Users can search using keywords in `title` and `description`
+    Users can search using keywords in `title` and `description`.
+    Title matches rank above description matches.
     - `GET /jobs/?search=Python` → Search for jobs with "Python" in the title or description
     - `GET /jobs/?search=python%20developer` → Search for jobs with "python" and "developer"
 
+    **Facets:**
+    `GET /jobs/facets/` takes the same filter and search parameters as the list
+    and returns the number of matching postings per `job_type`, `industry`,
+    `location_country`, `location_city` and salary band, in a single query.
+    - `GET /jobs/facets/?search=python&location_country=USA`
+
+    **Bulk import:**
+    `POST /jobs/import/` creates many job postings for the requesting employer
+    from a streamed `application/x-ndjson` body (one posting per line, shaped
+    like the create request) or a `text/csv` body, and returns the number of
+    created and failed rows with the errors of each failed row.
+    ```json
+    {"created": 998, "failed": 2, "errors": [{"row": 17, "errors": {"title": ["This field is required."]}}]}
+    ```
+
+    **Sparse fieldsets:**
+    List and detail responses can be trimmed to the fields a client renders.
+    Lists then only read those columns, so dropping `description` also keeps
+    it out of the query.
+    - `GET /jobs/?fields=job_id,title,company` → Only these fields
+    - `GET /jobs/?omit=description,skills_required` → All other fields
+    - `GET /jobs/?profile=card` → Compact list item: title, company, job type,
+      location, salary and dates
+
+    **Conditional requests:**
+    List and detail responses carry `ETag` and `Last-Modified` headers. Send
+    them back as `If-None-Match` / `If-Modified-Since` to get an empty
+    `304 Not Modified` while the response is unchanged.
+
+    **Export:**
+    `GET /jobs/export/` streams every posting matching the filter and search
+    parameters, unpaginated, as NDJSON (one posting per line, shaped like the
+    list results) or, with `Accept: text/csv` or `?format=csv`, as CSV with
+    the bulk import columns.
+    - `GET /jobs/export/?industry=tech&ordering=-posted_at` → NDJSON
+    - `GET /jobs/export/?format=csv&job_type=contract` → CSV
+
+    **Recommendations:**
+    `GET /jobs/recommended/` returns up to 20 live postings recommended to the
+    requesting jobseeker, ranked by how well their required skills match the
+    skills of the postings the jobseeker applied to. Lists are refreshed
+    hourly and after each new application.
+
+    **Similar postings:**
+    `GET /jobs/{id}/similar/` returns up to 10 live postings most similar to a
+    posting, by the words of their title and description and their skills.
+    The neighbours are precomputed: new and updated postings get theirs within
+    15 minutes, and every list is rebuilt daily.
+
+    **Pagination:**
+    Results are page-number paginated by default. Pass `pagination=cursor`
+    to switch to keyset pagination, which skips the total count and returns
+    opaque `next`/`previous` cursors. Cursor mode honours `ordering`
+    by `posted_at` or `expiration_date`, and uses the default order otherwise.
+    - `GET /jobs/?pagination=cursor` → First page, newest first
+    - `GET /jobs/?pagination=cursor&ordering=expiration_date` → Soonest to expire first
+
     **Permissions:**
     - **Superuser**: Full access to all job postings.
     - **Employers**: Can view and manage their own job postings.
@@ -269,40 +524,74 @@ class JobPostingViewSet(viewsets.ModelViewSet):
     serializer_class = JobPostingSerializer
     pagination_class = CustomUserPagination
 
-    queryset = (
-        JobPosting.objects.select_related("industry", "location", "employer")
-        .prefetch_related("skills_required")
-        .order_by("-posted_at")
-    )
+    # Nested industry, location and skills are read from the taxonomy cache by
+    # their foreign keys and `skill_ids`, so they are not joined or prefetched
+    queryset = JobPosting.objects.order_by("-posted_at")
 
+    # `?search=` is handled in `get_queryset` against the indexed `search_vector`
     filter_backends = (
         DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter,
+        JobPostingOrderingFilter,
     )
     filterset_class = JobPostingFilter
 
-    search_fields = ["title", "description"]  # Full-text search
     filterset_fields = ["location", "industry", "job_type"]  # Filtering
-    ordering_fields = ["posted_at", "expiration_date"]  # Ordering
+    ordering_fields = [
+        "posted_at",
+        "expiration_date",
+        "salary_min",
+        "salary_max",
+        "distance",
+    ]  # Ordering
+
+    @property
+    def paginator(self):
+        """
+        Returns the paginator instance for this request.
+
+        Keyset pagination is used when the client opts in with
+        `?pagination=cursor` or follows a `cursor` link. Actions declared
+        with `pagination_class=None` are not paginated.
+        """
+        if not hasattr(self, "_paginator"):
+            query_params = self.request.query_params
+            if self.pagination_class is None:
+                self._paginator = None
+            elif (
+                query_params.get("pagination") == "cursor"
+                or JobPostingCursorPagination.cursor_query_param in query_params
+            ):
+                self._paginator = JobPostingCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
 
     def get_permissions(self):
         """
         Instantiates and returns the list of permissions that this view requires.
 
         Permissions depend on the action being performed:
-        - **list/retrieve**: Available to Job Seekers, Employers, and Admins.
+        - **list/retrieve/similar**: Available to Job Seekers, Employers, and Admins.
         - **create/update/delete**: Restricted to Employers and Admins.
+        - **recommended**: Restricted to Job Seekers.
         """
         user = self.request.user
 
         if user.is_superuser:
             return [permissions.AllowAny()]
 
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "facets", "export", "similar"]:
             permission_classes = [permissions.AllowAny]
-        elif self.action in ["create", "update", "partial_update", "destroy"]:
+        elif self.action in [
+            "create",
+            "update",
+            "partial_update",
+            "destroy",
+            "bulk_import",
+        ]:
             permission_classes = [IsEmployer | IsJobBoardAdmin]
+        elif self.action == "recommended":
+            permission_classes = [IsJobseeker]
         else:
             permission_classes = [permissions.IsAuthenticated]
 
@@ -311,8 +600,8 @@ class JobPostingViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """
         Returns the queryset for job postings based on the user's role.
-        Caching for job postings is implemented to reduce database queries.
-        Allows unauthenticated users to view jobs.
+        Allows unauthenticated users to view jobs. Caching happens per page,
+        see `list` and `paginate_queryset`.
 
         - **Superusers** can view all job postings.
         - **Regular users** (Job Seekers and Employers) can only view job postings
@@ -325,58 +614,479 @@ class JobPostingViewSet(viewsets.ModelViewSet):
             return JobPosting.objects.none()
 
         search_query = self.request.query_params.get("search", None)
-
-        # Try to get cached data
-        cache_key = f"job_postings_{search_query or 'all'}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return JobPosting.objects.filter(job_id__in=cached_data)
+        user = self.request.user
 
         # Get the base queryset
         queryset = super().get_queryset()
 
-        user = self.request.user
-
         # Handle filtering based on user role
         if user.is_authenticated:
             if user.role == "employer":
                 queryset = queryset.filter(employer=user)
             elif user.role == "jobseeker":
-                queryset = queryset.filter(
-                    is_active=True, expiration_date__gte=datetime.now()
-                )
+                queryset = queryset.live()
         else:
-            queryset = queryset.filter(
-                is_active=True, expiration_date__gte=datetime.now()
-            )
+            queryset = queryset.live()
 
-        # Handle search queries
+        # Handle search queries against the stored, GIN-indexed search vector
         if search_query:
-            search_vector = SearchVector("title", "description")
-            search_query_obj = SearchQuery(search_query)
-            queryset = queryset.annotate(
-                rank=SearchRank(search_vector, search_query_obj)
-            ).filter(rank__gte=0.3)
-            queryset = queryset.order_by("-rank")
+            search_query_obj = SearchQuery(search_query, config=SEARCH_CONFIG)
+            queryset = (
+                queryset.filter(search_vector=search_query_obj)
+                .annotate(rank=SearchRank(F("search_vector"), search_query_obj))
+                .order_by("-rank", "-posted_at")
+            )
 
-        # Cache job IDs for 5 minutes
-        job_ids = list(queryset.values_list("job_id", flat=True))
-        cache.set(cache_key, job_ids, timeout=300)
+        if self.action in ["list", "retrieve"]:
+            queryset = self.read_fields(queryset)
 
         return queryset
 
+    def get_fields(self):
+        """
+        Returns the job posting fields selected by the request's `fields`,
+        `omit` and `profile` query parameters, or None for all fields.
+        """
+        if not hasattr(self, "_fields"):
+            self._fields = selected_fields(
+                self.request.query_params, self.serializer_class.Meta.fields
+            )
+        return self._fields
+
+    def get_serializer(self, *args, **kwargs):
+        """
+        Returns the serializer instance, limited to the selected fields for lists.
+        Details are cached whole, and trimmed in `retrieve`.
+        """
+        if self.action == "list":
+            kwargs.setdefault("fields", self.get_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def read_fields(self, queryset):
+        """
+        Restricts `queryset` to the columns serialized for the request, leaving
+        out the search vector and, for lists, the columns of unselected fields.
+        """
+        fields = self.get_fields() if self.action == "list" else None
+        return queryset.only(*model_fields(self.serializer_class, fields))
+
+    def paginate_queryset(self, queryset, documents=False):
+        """
+        Paginates the job postings, caching the window of IDs for each page.
+
+        Only the page's IDs (packed as 16-byte UUIDs), their newest
+        `updated_at` and the total count are cached. A hit loads the page by
+        primary key in the cached order, with related objects, and skips the
+        search, filters and `COUNT(*)`. Keyset pages are cheap already and are
+        not cached.
+
+        The page's IDs and newest `updated_at` are kept in `page_metadata`, for
+        the response's validators.
+
+        With `documents` (page-number pagination only), no posting is loaded:
+        the page is a list of `(job_id, document)` pairs, with the pre-rendered
+        document of each posting, or None if it is not built.
+        """
+        paginator = self.paginator
+        if not isinstance(paginator, CustomUserPagination):
+            page = super().paginate_queryset(queryset)
+            if page is not None:
+                self.page_metadata = (
+                    [job.pk for job in page],
+                    max((job.updated_at for job in page), default=None),
+                )
+            return page
+
+        user = self.request.user
+        query_params = self.request.query_params
+        cache_key = versioned_key(
+            "window",
+            id_window_scopes(user, query_params),
+            audience(user),
+            tuple(
+                param
+                for param in canonical_query_params(query_params)
+                if param[0] not in FIELDSET_QUERY_PARAMS
+            ),
+        )
+        cached_window = cache.get(cache_key)
+        if cached_window is not None:
+            count, packed_ids, last_modified = cached_window
+            job_ids = unpack_ids(packed_ids)
+            self.page_metadata = (job_ids, last_modified)
+            page = paginator.paginate_window(
+                None if documents else self.read_fields(self.queryset.all()),
+                self.request,
+                count,
+                job_ids,
+            )
+            if documents:
+                fragments = load_documents(page)
+                page = [(pk, fragments.get(pk)) for pk in page]
+            return page
+
+        if documents:
+            queryset = queryset.values_list("pk", "updated_at", "document__content")
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            if documents:
+                last_modified = max(
+                    (updated_at for _, updated_at, _ in page), default=None
+                )
+                page = [
+                    (pk, None if content is None else bytes(content))
+                    for pk, _, content in page
+                ]
+                job_ids = [pk for pk, _ in page]
+            else:
+                last_modified = max((job.updated_at for job in page), default=None)
+                job_ids = [job.pk for job in page]
+            self.page_metadata = (job_ids, last_modified)
+            cached_window = (
+                paginator.page.paginator.count,
+                pack_ids(job_ids),
+                last_modified,
+            )
+            cache.set(cache_key, cached_window, timeout=LIST_CACHE_TIMEOUT)
+
+        return page
+
+    def get_list_cache_key(self, request):
+        """
+        Returns the response cache key for a job posting list request.
+
+        The key is built from the caller's audience class, the canonicalized
+        query parameters (filters, search, ordering, page or cursor) and the
+        negotiated renderer, and is versioned by the list's generation scopes.
+        """
+        return versioned_key(
+            "page",
+            list_scopes(request.user, request.query_params),
+            audience(request.user),
+            request.build_absolute_uri(request.path),
+            request.accepted_renderer.format,
+            canonical_query_params(request.query_params),
+        )
+
+    def list(self, request, *args, **kwargs):
+        """
+        Returns a page of job postings, served from the response cache when possible.
+
+        The final rendered bytes are cached with the response's validators, so
+        a hit skips the database and the serializer entirely. On a miss, JSON
+        pages are assembled from the postings' pre-rendered documents, see
+        `stitched_list`. Requests whose `If-None-Match` or `If-Modified-Since`
+        validators still match get a `304 Not Modified` without a body, see
+        `job_listings.conditional`.
+        """
+        cache_key = self.get_list_cache_key(request)
+        cached_response = cache.get(cache_key)
+        if cached_response is not None:
+            content, content_type, etag, last_modified = cached_response
+            response = not_modified(request, etag, last_modified)
+            if response is None:
+                response = set_validators(
+                    HttpResponse(content, content_type=content_type),
+                    etag,
+                    last_modified,
+                )
+            return response
+
+        if self.can_stitch(request):
+            response = self.stitched_list(request)
+        else:
+            response = super().list(request, *args, **kwargs)
+        job_ids, last_modified = self.page_metadata
+        etag = make_etag(cache_key, job_ids)
+        unchanged = not_modified(request, etag, last_modified)
+        if unchanged is not None:
+            return unchanged
+        response = set_validators(response, etag, last_modified)
+
+        def cache_rendered_response(rendered_response):
+            if rendered_response.status_code == status.HTTP_200_OK:
+                cache.set(
+                    cache_key,
+                    (
+                        rendered_response.content,
+                        rendered_response["Content-Type"],
+                        etag,
+                        last_modified,
+                    ),
+                    timeout=LIST_CACHE_TIMEOUT,
+                )
+
+        response.add_post_render_callback(cache_rendered_response)
+        return response
+
+    def can_stitch(self, request):
+        """
+        Whether the page can be assembled from pre-rendered job posting
+        documents: page-number pagination, every field, compact JSON.
+        """
+        return (
+            isinstance(self.paginator, CustomUserPagination)
+            and self.get_fields() is None
+            and self.renders_compact_json(request)
+        )
+
+    def renders_compact_json(self, request):
+        """
+        Whether the response is rendered as compact JSON, the encoding of the
+        pre-rendered job posting documents.
+        """
+        renderer = request.accepted_renderer
+        return (
+            renderer.format == "json"
+            and renderer.get_indent(request.accepted_media_type, {}) is None
+        )
+
+    def stitched_list(self, request):
+        """
+        Returns a page of job postings assembled from their pre-rendered
+        documents (see `job_listings.documents`), without loading or
+        serializing the postings. Postings whose document has not been
+        (re)built yet are serialized as usual.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset, documents=True)
+        content = stitch(
+            self.paginator.get_paginated_response([]).data,
+            self.document_fragments(request, page),
+        )
+        return StitchedResponse(content)
+
+    def document_fragments(self, request, page):
+        """
+        Returns the JSON documents of the `(job_id, document)` pairs of `page`,
+        in order, serializing the postings whose document is not built.
+        """
+        fragments = {pk: content for pk, content in page if content is not None}
+
+        missing = [pk for pk, content in page if content is None]
+        if missing:
+            job_postings = self.read_fields(self.queryset.all()).in_bulk(missing)
+            for job_posting in job_postings.values():
+                fragments[job_posting.pk] = request.accepted_renderer.render(
+                    self.get_serializer(job_posting).data
+                )
+
+        return [fragments[pk] for pk, _ in page if pk in fragments]
+
+    @action(detail=False, methods=["get"])
+    def facets(self, request, *args, **kwargs):
+        """
+        Returns facet counts for the job postings matching the request's filters
+        and search, computed in a single grouped aggregate query.
+
+        Counts are cached alongside the page's ID window: they are invalidated
+        by the same generations and shared by every page and ordering.
+        """
+        user = request.user
+        query_params = request.query_params
+        cache_key = versioned_key(
+            "facets",
+            id_window_scopes(user, query_params),
+            audience(user),
+            tuple(
+                param
+                for param in canonical_query_params(query_params)
+                if param[0] not in PAGE_QUERY_PARAMS | FIELDSET_QUERY_PARAMS
+            ),
+        )
+        facets = cache.get(cache_key)
+        if facets is None:
+            facets = facet_counts(self.filter_queryset(self.get_queryset()))
+            cache.set(cache_key, facets, timeout=LIST_CACHE_TIMEOUT)
+
+        return Response(facets)
+
+    @action(detail=False, methods=["post"], url_path="import")
+    def bulk_import(self, request, *args, **kwargs):
+        """
+        Creates job postings in bulk from a streamed NDJSON or CSV request body.
+
+        Rows are validated one by one and written in chunks, see
+        `job_listings.imports`. Invalid rows do not prevent the others from
+        being created, and are reported in the response.
+        """
+        summary = import_job_postings(import_rows(request), request.user)
+        return Response(summary)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        renderer_classes=[NDJSONRenderer, CSVRenderer],
+        pagination_class=None,
+    )
+    def export(self, request, *args, **kwargs):
+        """
+        Streams all the job postings matching the request's filters and search
+        as NDJSON or CSV, chosen by content negotiation.
+
+        Postings are read from a server-side cursor and written in chunks, see
+        `job_listings.exports`, so memory use does not grow with the export.
+        """
+        renderer = request.accepted_renderer
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            export_job_postings(queryset, renderer.format), content_type=content_type
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="jobs.{renderer.format}"'
+        )
+        return response
+
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def recommended(self, request, *args, **kwargs):
+        """
+        Returns the live job postings recommended to the requesting jobseeker
+        from the skills of the postings they applied to, best match first.
+
+        The lists are computed in batches by the `refresh_recommendations`
+        task and read from the cache, see `job_listings.recommendations`.
+        """
+        generated_at, job_ids = get_recommendations(request.user)
+        job_postings = self.read_fields(JobPosting.objects.live()).in_bulk(job_ids)
+        serializer = self.get_serializer(
+            [job_postings[pk] for pk in job_ids if pk in job_postings], many=True
+        )
+        return Response({"generated_at": generated_at, "results": serializer.data})
+
+    @action(detail=True, methods=["get"], pagination_class=None)
+    def similar(self, request, *args, **kwargs):
+        """
+        Returns the live job postings most similar to a job posting, by the
+        words of their title and description and their skills, most similar
+        first.
+
+        The posting must be visible to the user, as for `retrieve`. The
+        neighbours are precomputed by the `build_similar_postings` task (see
+        `job_listings.similar`) and read with the postings' documents in a
+        single query. JSON responses are assembled from the documents.
+        """
+        try:
+            job_id = uuid.UUID(str(kwargs["pk"]))
+        except ValueError:
+            raise Http404
+
+        # The posting must be visible to the user, as for `retrieve`
+        posting = self.get_queryset().filter(pk=job_id)
+        neighbours = SimilarJobPostings.objects.filter(pk=job_id).values("job_ids")
+        page = list(
+            JobPosting.objects.live()
+            .filter(
+                Exists(posting),
+                pk__in=neighbours.annotate(
+                    neighbour_id=Func(
+                        "job_ids", function="unnest", output_field=UUIDField()
+                    )
+                ).values("neighbour_id"),
+            )
+            .annotate(
+                position=Func(
+                    Subquery(neighbours),
+                    F("pk"),
+                    function="array_position",
+                    output_field=IntegerField(),
+                )
+            )
+            .order_by("position")
+            .values_list("pk", "document__content")
+        )
+        if not page and not posting.exists():
+            raise Http404
+
+        page = [
+            (pk, None if content is None else bytes(content)) for pk, content in page
+        ]
+        if self.renders_compact_json(request):
+            return StitchedResponse(
+                stitch({"results": []}, self.document_fragments(request, page))
+            )
+
+        job_postings = self.read_fields(self.queryset.all()).in_bulk(
+            [pk for pk, _ in page]
+        )
+        serializer = self.get_serializer(
+            [job_postings[pk] for pk, _ in page if pk in job_postings], many=True
+        )
+        return Response({"results": serializer.data})
+
+    def is_visible(self, job_posting):
+        """
+        Returns whether the requesting user may view a cached job posting,
+        mirroring the role rules of `get_queryset`.
+
+        Arguments:
+        - **job_posting**: Cached visibility fields (`employer_id`, `is_active`,
+        `expiration_date`) of the job posting.
+        """
+        user = self.request.user
+
+        if user.is_authenticated and user.role == "employer":
+            return job_posting["employer_id"] == user.pk
+        if user.is_authenticated and user.role != "jobseeker":
+            return True
+        return (
+            job_posting["is_active"]
+            and job_posting["expiration_date"] >= timezone.now()
+        )
+
     def retrieve(self, request, *args, **kwargs):
-        """Cachiing individual job postings for 5 minutes."""
-        cache_key = f"job_posting_{kwargs['pk']}"
+        """
+        Caching individual job postings.
+
+        Entries are invalidated by `job_listings.signals` whenever the posting,
+        its skills, or its location or industry change, so they are kept for
+        hours. The cached visibility fields are re-checked for every caller.
+        The whole posting is cached, and trimmed to the selected fields.
+
+        Requests whose `If-None-Match` or `If-Modified-Since` validators still
+        match get a `304 Not Modified`, see `job_listings.conditional`. The
+        ETag covers a digest of the serialized posting, cached with it, so a
+        cached posting is not serialized again to be validated.
+        """
+        fields = self.get_fields()
+        (cache_key,) = detail_cache_keys([kwargs["pk"]])
         cached_data = cache.get(cache_key)
 
-        if cached_data:
-            return Response(cached_data)
+        # Entries cached without a `digest` predate content-based ETags and are refilled
+        if (
+            cached_data is not None
+            and "digest" in cached_data
+            and self.is_visible(cached_data)
+        ):
+            instance = None
+        else:
+            instance = self.get_object()
+            data = self.get_serializer(instance).data
+            cached_data = {
+                "data": data,
+                "digest": content_digest(data),
+                "employer_id": instance.employer_id,
+                "is_active": instance.is_active,
+                "expiration_date": instance.expiration_date,
+                "updated_at": instance.updated_at,
+            }
 
-        response = super().retrieve(request, *args, **kwargs)
-        cache.set(cache_key, response.data, timeout=300)  # Cache for 5 minutes
+        updated_at = cached_data["updated_at"]
+        etag = make_etag(
+            cached_data["digest"], fields, request.accepted_renderer.format
+        )
+        response = not_modified(request, etag, updated_at)
+        if response is not None:
+            return response
 
-        return response
+        if instance is not None:
+            cache.set(cache_key, cached_data, timeout=DETAIL_CACHE_TIMEOUT)
+
+        response = Response(pick(cached_data["data"], fields))
+        return set_validators(response, etag, updated_at)
 
     def perform_create(self, serializer):
         """
@@ -385,27 +1095,28 @@ class JobPostingViewSet(viewsets.ModelViewSet):
 
         The employer is assigned based on the authenticated user making the request.
 
-        Cached data is cleared when a new job posting is created.
+        Cached lists are invalidated when a new job posting is created.
 
         Arguments:
         - **serializer**: The validated data for the job posting.
         """
-        cache.delete("job_postings_all_serialized")
-        cache.delete("job_postings_search_*")
-        serializer.save(employer=self.request.user)
+        job_posting = serializer.save(employer=self.request.user)
+        bump_generations(posting_scopes(job_posting))
 
     def perform_update(self, serializer):
         """
-        Override the perform_update method to clear cached data when a job posting is updated.
+        Override the perform_update method to invalidate cached lists when a job
+        posting is updated. Lists matching either the old or the new state of the
+        posting are invalidated.
 
         Arguments:
         - **serializer**: The validated data for the job posting.
         """
-        cache.delete("job_postings_all_serialized")
-        cache.delete("job_postings_search_*")
-        serializer.save()
+        previous_scopes = posting_scopes(serializer.instance)
+        job_posting = serializer.save()
+        bump_generations(previous_scopes + posting_scopes(job_posting))
 
-    def delete(self, request, *args, **kwargs):
+    def destroy(self, request, *args, **kwargs):
         """
         Soft delete a job posting by calling the `delete_job` method on the instance.
 
@@ -414,11 +1125,8 @@ class JobPostingViewSet(viewsets.ModelViewSet):
         - **args**: Additional arguments.
         - **kwargs**: Additional keyword arguments.
         """
-        cache.delete("job_postings_all_serialized")
-        cache.delete("job_postings_search_*")
-
         instance = self.get_object()
         instance.delete_job()
-        instance.save()
+        bump_generations(posting_scopes(instance))
 
         return Response(status=status.HTTP_204_NO_CONTENT)
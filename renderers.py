@@ -0,0 +1,64 @@
+import orjson
+import msgpack
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+# Encodes the values orjson and MessagePack do not handle natively (e.g.
+# `Decimal`, lazy strings) exactly like the stock DRF encoder
+encode_default = JSONEncoder().default
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Renderer which serializes to JSON with orjson.
+
+    Produces the same output as DRF's `JSONRenderer` (compact separators,
+    UTF-8, `Z` suffixed UTC datetimes, escaped U+2028/U+2029), several times
+    faster. UUIDs and datetimes are encoded natively; other types fall back
+    to the DRF encoder. Indented output (`Accept: application/json; indent=4`)
+    is rendered by `JSONRenderer`.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render `data` into JSON, returning a bytestring.
+        """
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=encode_default, option=ORJSON_OPTIONS)
+        # Keep the output a strict JavaScript subset, as `JSONRenderer` does
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renderer which serializes to MessagePack, for clients that send
+    `Accept: application/msgpack`.
+
+    Values are encoded like JSON: UUIDs, decimals and datetimes become the
+    same strings and numbers as in the JSON response.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render `data` into MessagePack, returning a bytestring.
+        """
+        if data is None:
+            return b""
+        return msgpack.packb(
+            data, default=encode_default, use_bin_type=True, datetime=False
+        )
@@ -0,0 +1,125 @@
+"""Test the JSON and MessagePack renderers and parsers of the REST API."""
+
+import io
+import json
+import uuid
+import msgpack
+import pytest
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+from parsers import MessagePackParser, ORJSONParser
+from renderers import MessagePackRenderer, ORJSONRenderer
+from job_listings.models import JobPosting
+from job_listings.tests.factories import JobListingFactory
+
+
+@pytest.fixture
+def data():
+    return ReturnDict(
+        {
+            "job_id": uuid.UUID("a72b236e-04fa-4d25-9284-d48528068449"),
+            "salary_min": Decimal("80000.50"),
+            "posted_at": datetime(2025, 3, 6, 10, 46, 31, 892128, dt_timezone.utc),
+            "local": datetime(
+                2025, 3, 6, 12, 0, tzinfo=dt_timezone(timedelta(hours=2))
+            ),
+            "expires_on": date(2025, 12, 31),
+            "title": "Ingénieur \u2028 logiciel",
+            "message": gettext_lazy("Not found."),
+            "counts": {1: 2},
+            "results": [{"is_active": True, "salary_max": None}],
+        },
+        serializer=None,
+    )
+
+
+class TestORJSONRenderer:
+    def test_same_output_as_json_renderer(self, data):
+        """Test that the output is byte for byte that of `JSONRenderer`."""
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_indent_requested(self, data):
+        """Test that indented output is still available."""
+        accepted = "application/json; indent=4"
+        assert ORJSONRenderer().render(data, accepted) == JSONRenderer().render(
+            data, accepted
+        )
+
+
+class TestParsers:
+    def test_orjson_parser(self):
+        """Test that JSON bodies are parsed, in UTF-8 or another charset."""
+        parser = ORJSONParser()
+        assert parser.parse(io.BytesIO('{"city": "Zürich"}'.encode())) == {
+            "city": "Zürich"
+        }
+        assert parser.parse(
+            io.BytesIO('{"city": "Zürich"}'.encode("latin-1")),
+            parser_context={"encoding": "latin-1"},
+        ) == {"city": "Zürich"}
+
+    @pytest.mark.parametrize("body", [b"{not json", b'{"salary": NaN}'])
+    def test_orjson_parser_rejects_invalid_json(self, body):
+        """Test that invalid JSON is a parse error, as with `JSONParser`."""
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(io.BytesIO(body))
+
+    def test_messagepack_matches_json(self, data):
+        """Test that MessagePack carries the same values as JSON."""
+        del data["counts"]  # JSON turns keys into strings, MessagePack does not
+        content = MessagePackRenderer().render(data)
+
+        parsed = MessagePackParser().parse(io.BytesIO(content))
+
+        assert parsed == json.loads(JSONRenderer().render(data))
+
+    def test_messagepack_parser_rejects_invalid_body(self):
+        """Test that a truncated MessagePack body is a parse error."""
+        content = MessagePackRenderer().render({"title": "Engineer"})
+        with pytest.raises(ParseError):
+            MessagePackParser().parse(io.BytesIO(content[:-3]))
+
+
+@pytest.mark.django_db
+class TestContentNegotiation:
+    def test_list_as_messagepack(self, api_client, employer_user):
+        """Test that job lists are served as MessagePack when accepted."""
+        JobListingFactory.create_batch(
+            2,
+            employer=employer_user,
+            expiration_date=timezone.now() + timedelta(days=30),
+        )
+
+        as_json = api_client.get(reverse("job-list"))
+        as_msgpack = api_client.get(
+            reverse("job-list"), HTTP_ACCEPT="application/msgpack"
+        )
+
+        assert as_msgpack.status_code == status.HTTP_200_OK
+        assert as_msgpack["Content-Type"] == "application/msgpack"
+        assert msgpack.unpackb(as_msgpack.content) == as_json.json()
+
+    def test_create_from_messagepack(self, api_client, employer_user):
+        """Test that request bodies can be sent as MessagePack."""
+        api_client.force_authenticate(user=employer_user)
+        body = {
+            "title": "Packed Engineer",
+            "description": "Sent as MessagePack.",
+            "job_type": "full-time",
+            "location": {"city": "Gotham", "country": "Freedonia"},
+            "industry": {"name": "Technology"},
+            "skills_required": [{"name": "Kotlin"}],
+            "expiration_date": "2099-12-31T23:59:59Z",
+        }
+
+        response = api_client.post(reverse("job-list"), body, format="msgpack")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert JobPosting.objects.filter(title="Packed Engineer").exists()